@@ -0,0 +1,104 @@
+"""
+DOCX spacing-cleanup benchmark: the single-pass lxml _cleanup_docx_spacing
+against the previous python-docx implementation on 100+ page documents.
+
+    python benchmarks/bench_docx_cleanup.py --pages 100 400
+    python benchmarks/bench_docx_cleanup.py --docx converted.docx
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from convertly.pdf_word import _cleanup_docx_spacing  # noqa: E402
+from bench_suite import make_spaced_docx  # noqa: E402
+
+
+def legacy_cleanup(docx_path):
+    """The python-docx implementation this benchmark compares against."""
+    from docx import Document
+    from docx.shared import Pt
+    from docx.oxml.ns import qn
+    doc = Document(docx_path)
+
+    blank_run = 0
+    to_remove = []
+    for para in doc.paragraphs:
+        if not para.text.strip():
+            blank_run += 1
+            if blank_run > 2:
+                to_remove.append(para)
+        else:
+            blank_run = 0
+    for para in to_remove:
+        p = para._element
+        parent = p.getparent()
+        if parent is not None:
+            parent.remove(p)
+
+    for para in doc.paragraphs:
+        pf = para.paragraph_format
+        if pf.space_before and pf.space_before.pt > 72:
+            pf.space_before = Pt(18)
+        if pf.space_after and pf.space_after.pt > 72:
+            pf.space_after = Pt(8)
+
+    for para in list(doc.paragraphs)[:10]:
+        if para.text.strip():
+            continue
+        for run in para.runs:
+            for br in run._element.findall(f'.//{qn("w:br")}'):
+                if br.get(qn('w:type')) == 'page':
+                    br.getparent().remove(br)
+
+    doc.save(docx_path)
+
+
+def timed(fn, path):
+    start = time.perf_counter()
+    fn(path)
+    return time.perf_counter() - start
+
+
+def document_xml(path):
+    with zipfile.ZipFile(path) as z:
+        return z.read("word/document.xml")
+
+
+def compare(src, tmp, label):
+    legacy = os.path.join(tmp, "legacy.docx")
+    single = os.path.join(tmp, "single.docx")
+    shutil.copy(src, legacy)
+    shutil.copy(src, single)
+    t_legacy = timed(legacy_cleanup, legacy)
+    t_single = timed(_cleanup_docx_spacing, single)
+    same = "yes" if document_xml(legacy) == document_xml(single) else "NO"
+    print(f"{label:>12}{t_legacy:>12.2f}{t_single:>12.2f}"
+          f"{t_legacy / t_single:>9.1f}x{same:>11}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 400])
+    parser.add_argument("--docx", nargs="*", default=[],
+                        help="time existing DOCX files instead of generated ones")
+    args = parser.parse_args()
+
+    print(f"{'input':>12}{'legacy s':>12}{'single s':>12}{'speedup':>10}{'same xml':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.docx:
+            for path in args.docx:
+                compare(path, tmp, os.path.basename(path)[:12])
+            return
+        for pages in args.pages:
+            src = os.path.join(tmp, f"{pages}.docx")
+            make_spaced_docx(src, pages)
+            compare(src, tmp, f"{pages} pages")
+
+
+if __name__ == "__main__":
+    main()
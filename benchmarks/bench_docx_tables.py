@@ -0,0 +1,73 @@
+"""
+Word → PDF table-reading benchmark: python-docx's rows / cells / text
+walk, as word_to_pdf used to read tables, versus the one-pass
+_read_docx_table, on long generated tables with shading and merged
+cells; then the whole word_to_pdf conversion of each document.
+
+    python benchmarks/bench_docx_tables.py --sizes 1000 5000 --cols 6
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import convertly  # noqa: E402
+from convertly import word_pdf  # noqa: E402
+from bench_suite import make_table_docx  # noqa: E402
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def python_docx_read(tbl, doc):
+    """The former reader: Table.rows / row.cells / cell.text and a tcPr lookup per cell."""
+    from docx.table import Table
+
+    data, fills = [], {}
+    for r, row in enumerate(Table(tbl, doc).rows):
+        row_data = []
+        for c, cell in enumerate(row.cells):
+            row_data.append(cell.text)
+            tc_pr = cell._tc.find(W + "tcPr")
+            shd = tc_pr.find(W + "shd") if tc_pr is not None else None
+            fill = shd.get(W + "fill") if shd is not None else None
+            if fill and fill != "auto" and len(fill) == 6:
+                fills[(r, c)] = fill
+        data.append(row_data)
+    return data, fills
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--cols", type=int, default=6)
+    args = parser.parse_args()
+
+    import docx
+    print(f"{'rows':>8}{'python-docx s':>15}{'one-pass s':>12}{'speed-up':>10}"
+          f"{'spans':>7}{'word_to_pdf s':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "out.pdf")
+        for rows in args.sizes:
+            src = os.path.join(tmp, f"{rows}.docx")
+            make_table_docx(src, rows, args.cols, merged=True)
+            doc = docx.Document(src)
+            tbl = doc.element.body.find(W + "tbl")
+            slow = timed(python_docx_read, tbl, doc)
+            start = time.perf_counter()
+            _, _, spans = word_pdf._read_docx_table(tbl)
+            fast = time.perf_counter() - start
+            total = timed(convertly.word_to_pdf, src, out)
+            print(f"{rows:>8}{slow:>15.2f}{fast:>12.3f}{slow / fast:>9.1f}x"
+                  f"{len(spans):>7}{total:>15.2f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Excel → PDF style benchmark: TableStyle command count and doc.build time
+with and without coalescing of per-cell style commands.
+
+    python benchmarks/bench_excel_styles.py --rows 2000 --cols 25
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from convertly import excel_pdf, layout  # noqa: E402
+from bench_suite import make_xlsx  # noqa: E402
+
+
+def run(src, out, coalesce):
+    from reportlab.platypus import SimpleDocTemplate
+    stats = {"commands": 0, "build": 0.0}
+
+    real_coalesce = excel_pdf._coalesce_cell_commands
+    real_build    = SimpleDocTemplate.build
+
+    def per_cell(cmds):
+        return [(op, (c1, r), (c2, r), *args) for op, c1, c2, r, *args in cmds]
+
+    def counted(cmds):
+        out_cmds = (real_coalesce if coalesce else per_cell)(cmds)
+        stats["commands"] += len(out_cmds)
+        return out_cmds
+
+    def timed_build(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return real_build(self, *args, **kwargs)
+        finally:
+            stats["build"] += time.perf_counter() - start
+
+    # short sheets are one Table built in excel_pdf, long ones LongTables from layout
+    excel_pdf._coalesce_cell_commands = layout._coalesce_cell_commands = counted
+    SimpleDocTemplate.build = timed_build
+    try:
+        start = time.perf_counter()
+        excel_pdf.excel_to_pdf(src, out, streaming=False)
+        stats["total"] = time.perf_counter() - start
+    finally:
+        excel_pdf._coalesce_cell_commands = layout._coalesce_cell_commands = real_coalesce
+        SimpleDocTemplate.build = real_build
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--cols", type=int, default=25)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "styled.xlsx")
+        make_xlsx(src, args.rows, args.cols)
+        print(f"{args.rows} x {args.cols} styled cells")
+        print(f"{'':12}{'commands':>10}{'build s':>10}{'total s':>10}")
+        for label, coalesce in (("per-cell", False), ("coalesced", True)):
+            s = run(src, os.path.join(tmp, f"{label}.pdf"), coalesce)
+            print(f"{label:12}{s['commands']:>10}{s['build']:>10.2f}{s['total']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
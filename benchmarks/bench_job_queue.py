@@ -0,0 +1,92 @@
+"""
+Job queue throughput: a batch of mixed files converted one after another
+on a single warm worker (the window's single-file flow) versus a JobQueue
+running several at a time.
+
+    python benchmarks/bench_job_queue.py --files 24 --workers 4
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import convertly  # noqa: E402
+from convertly.jobs import JobQueue  # noqa: E402
+from bench_suite import make_docx, make_pdf, make_xlsx  # noqa: E402
+
+
+def make_fixtures(tmp):
+    make_pdf(os.path.join(tmp, "in.pdf"), 4, ruled=False)
+    make_docx(os.path.join(tmp, "in.docx"), 30)
+    make_xlsx(os.path.join(tmp, "in.xlsx"), 1000)
+
+
+def batch(tmp, n):
+    """`n` inputs cycling through the three types, each under its own name."""
+    srcs = []
+    for i in range(n):
+        ext = ("pdf", "docx", "xlsx")[i % 3]
+        src = os.path.join(tmp, f"file{i:03d}.{ext}")
+        shutil.copy(os.path.join(tmp, f"in.{ext}"), src)
+        srcs.append(src)
+    return srcs
+
+
+def single(srcs):
+    pool = convertly.WarmPool(1, log_level=logging.ERROR)
+    pool.wait_ready()
+    start = time.perf_counter()
+    for src in srcs:
+        key = convertly.jobs.EXT_MODES[os.path.splitext(src)[1]]
+        out = os.path.splitext(src)[0] + convertly.modes._mode_by_key(key)["ext"]
+        res = pool.submit(key, src, out, use_cache=False).result()
+        assert res["ok"], res["error"]
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+    return elapsed
+
+
+def queued(srcs, workers):
+    queue = JobQueue(workers, use_cache=False, log_level=logging.ERROR)
+    queue.warm_up(wait=True)  # as single() waits for its worker
+    start = time.perf_counter()
+    for src in srcs:
+        queue.add(src)
+    while queue.waiting() or queue.active():
+        queue.poll()
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - start
+    failed = [job.error for job in queue.jobs.values() if job.state != "done"]
+    assert not failed, failed
+    queue.shutdown()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=24)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with ProcessPoolExecutor(max_workers=1) as pool:  # keep this process cold
+            pool.submit(make_fixtures, tmp).result()
+        srcs = batch(tmp, args.files)
+
+        t_single = single(srcs)
+        t_queue  = queued(srcs, args.workers)
+        print(f"{args.files} files on {os.cpu_count()} CPU(s)")
+        print(f"  one at a time          {t_single:7.2f}s  {args.files / t_single:6.2f} files/s")
+        print(f"  queue, {args.workers} workers{'':<7}{t_queue:7.2f}s  "
+              f"{args.files / t_queue:6.2f} files/s  ({t_single / t_queue:.1f}x)")
+
+
+if __name__ == "__main__":
+    multiprocessing.set_start_method("spawn", force=True)
+    main()
@@ -0,0 +1,56 @@
+"""
+Long-table layout benchmark: excel_to_pdf and word_to_pdf time per row
+count, laying tables out a page at a time versus as one reportlab Table.
+
+    python benchmarks/bench_long_tables.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import convertly  # noqa: E402
+from convertly import layout  # noqa: E402
+from bench_suite import make_table_docx, make_xlsx  # noqa: E402
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--single-max", type=int, default=10000,
+                        help="skip the single-Table run above this many rows")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'converter':<12}{'paged s':>10}{'single s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "out.pdf")
+        for rows in args.sizes:
+            xlsx = os.path.join(tmp, f"{rows}.xlsx")
+            docx = os.path.join(tmp, f"{rows}.docx")
+            make_xlsx(xlsx, rows, cols=6, styled=False)
+            make_table_docx(docx, rows, cols=4)
+            for label, fn, src, kw in (
+                    ("excel_to_pdf", convertly.excel_to_pdf, xlsx, {"streaming": False}),
+                    ("word_to_pdf",  convertly.word_to_pdf,  docx, {})):
+                paged = timed(fn, src, out, **kw)
+                single = "-"
+                if rows <= args.single_max:
+                    limit = layout.LONG_TABLE_ROWS
+                    layout.LONG_TABLE_ROWS = float("inf")
+                    try:
+                        single = f"{timed(fn, src, out, **kw):.2f}"
+                    finally:
+                        layout.LONG_TABLE_ROWS = limit
+                print(f"{rows:>8}  {label:<12}{paged:>10.2f}{single:>10}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
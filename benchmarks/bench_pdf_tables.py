@@ -0,0 +1,118 @@
+"""
+PDF → Excel backend benchmark: every table-extraction backend on the same
+pages, reporting the rows each extracts, its time per page and how many
+of pdfplumber's rows it reproduces exactly. The generated workloads are
+text pages, ruled statement tables, dense text, a dense ruled grid and
+an Excel → PDF export; --pdf adds your own files.
+
+    python benchmarks/bench_pdf_tables.py --pages 8
+    python benchmarks/bench_pdf_tables.py --pdf statements/*.pdf
+"""
+import argparse
+import difflib
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from convertly import pdf_excel  # noqa: E402
+from bench_suite import make_pdf, make_xlsx  # noqa: E402
+
+
+def make_dense(path, pages, ruled):
+    """Pages of 110 lines of small numbers, or of a 90 x 14 ruled grid."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    rnd = random.Random(pages)
+    c = canvas.Canvas(path, pagesize=A4, invariant=1)
+    for pg in range(pages):
+        if ruled:
+            c.setFont("Helvetica", 5)
+            cols, rows, x0, y0, w, h = 14, 90, 20, 810, 555 / 14, 8.8
+            for r in range(rows + 1):
+                c.line(x0, y0 - r * h, x0 + cols * w, y0 - r * h)
+            for k in range(cols + 1):
+                c.line(x0 + k * w, y0, x0 + k * w, y0 - rows * h)
+            for r in range(rows):
+                for k in range(cols):
+                    c.drawString(x0 + k * w + 2, y0 - r * h - 6.5,
+                                 f"{pg}.{r}.{k}-{rnd.randint(0, 999)}")
+        else:
+            c.setFont("Helvetica", 6)
+            for i in range(110):
+                c.drawString(20, 820 - i * 7.3,
+                             " ".join(f"{rnd.randint(0, 99999):05d}" for _ in range(28)))
+        c.showPage()
+    c.save()
+
+
+def make_export(path, pages):
+    """An Excel → PDF export of a styled workbook, about `pages` pages long."""
+    import convertly
+    xlsx = path + ".xlsx"
+    make_xlsx(xlsx, pages * 25)
+    convertly.excel_to_pdf(xlsx, path, streaming=False)
+
+
+def workloads(tmp, pages):
+    for name, make in (("text",        lambda p: make_pdf(p, pages, ruled=False)),
+                       ("ruled",       lambda p: make_pdf(p, pages, ruled=True)),
+                       ("dense-text",  lambda p: make_dense(p, pages, ruled=False)),
+                       ("dense-ruled", lambda p: make_dense(p, pages, ruled=True)),
+                       ("xlsx-export", lambda p: make_export(p, pages))):
+        path = os.path.join(tmp, f"{name}.pdf")
+        make(path)
+        yield name, path
+
+
+def extract(backend, path):
+    """(rows, seconds, pages) for every page of `path`."""
+    rows  = []
+    start = time.perf_counter()
+    with backend.open(path) as doc:
+        n = backend.page_count(doc)
+        for i in range(n):
+            rows.extend(backend.page_rows(doc, i))
+    return rows, time.perf_counter() - start, n
+
+
+def agreement(reference, rows):
+    """Share of the reference rows that `rows` reproduces, in order."""
+    if not reference:
+        return 1.0 if not rows else 0.0
+    matcher = difflib.SequenceMatcher(None, [tuple(r) for r in reference],
+                                      [tuple(r) for r in rows], autojunk=False)
+    return sum(block.size for block in matcher.get_matching_blocks()) / len(reference)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=8,
+                        help="pages per generated workload")
+    parser.add_argument("--pdf", nargs="*", default=[],
+                        help="also benchmark these PDF files")
+    args = parser.parse_args()
+
+    backends = list(pdf_excel.TABLE_BACKENDS.values())
+    print(f"{'workload':<24}{'backend':<12}{'pages':>6}{'rows':>8}{'ms/page':>10}"
+          f"{'vs pdfplumber':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = list(workloads(tmp, args.pages))
+        cases += [(os.path.basename(path), path) for path in args.pdf]
+        for name, path in cases:
+            reference = None
+            for backend in backends:
+                rows, seconds, n = extract(backend, path)
+                if reference is None:
+                    reference = rows  # pdfplumber comes first
+                print(f"{name[:23]:<24}{backend.name:<12}{n:>6}{len(rows):>8}"
+                      f"{seconds / max(n, 1) * 1000:>10.1f}"
+                      f"{agreement(reference, rows):>14.1%}", flush=True)
+            auto = pdf_excel._choose_backend(path).name
+            print(f"{'':<24}auto → {auto}")
+
+
+if __name__ == "__main__":
+    main()
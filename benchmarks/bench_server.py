@@ -0,0 +1,187 @@
+"""
+Load test for the HTTP service: starts `python -m convertly serve` on a
+free port and drives it with concurrent clients, each uploading a file,
+long-polling its job and downloading the result. It reports throughput
+and latency percentiles, then checks backpressure with a burst that must
+get 429s and a request timeout that must fail the job.
+
+    python benchmarks/bench_server.py --clients 8 --requests 48 --workers 3
+    python benchmarks/bench_server.py --max-p99 20 --min-throughput 0.5
+
+Exits with 1 when a conversion fails, a check fails or a --max-p99 /
+--min-throughput limit is missed.
+"""
+import argparse
+import http.client
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from bench_suite import make_docx, make_pdf, make_xlsx  # noqa: E402
+
+
+def make_fixtures(tmp):
+    make_pdf(os.path.join(tmp, "in.pdf"), 4, ruled=True)
+    make_docx(os.path.join(tmp, "in.docx"), 20)
+    make_xlsx(os.path.join(tmp, "in.xlsx"), 500)
+    make_xlsx(os.path.join(tmp, "slow.xlsx"), 20000)
+
+
+def start_server(workers, max_queued, extra=()):
+    cmd = [sys.executable, "-m", "convertly", "serve", "--port", "0", "--no-cache",
+           "--jobs", str(workers), "--max-queued", str(max_queued), *extra]
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, env=env)
+    match = re.search(r":(\d+) ", proc.stdout.readline())
+    if not match:
+        proc.kill()
+        sys.exit("The service did not start")
+    return proc, int(match.group(1))
+
+
+def request(port, method, path, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    try:
+        conn.request(method, path, body=body)
+        resp = conn.getresponse()
+        return resp.status, resp.read()
+    finally:
+        conn.close()
+
+
+def convert(port, path, **query):
+    """One client round trip; returns (seconds, 429s seen, final job)."""
+    with open(path, "rb") as fh:
+        data = fh.read()
+    params = "&".join(f"{k}={v}" for k, v in dict(query, name=os.path.basename(path)).items())
+    start, rejected = time.perf_counter(), 0
+    while True:
+        status, body = request(port, "POST", f"/jobs?{params}", data)
+        if status != 429:
+            break
+        rejected += 1
+        time.sleep(0.2)
+    if status != 202:
+        return time.perf_counter() - start, rejected, {"state": "failed", "error": body.decode()}
+    job = json.loads(body)
+    while job["state"] in ("queued", "running"):
+        job = json.loads(request(port, "GET", f"/jobs/{job['id']}?wait=30")[1])
+    if job["state"] == "done":
+        status, body = request(port, "GET", f"/jobs/{job['id']}/result")
+        if status != 200 or not body:
+            job = dict(job, state="failed", error=f"result: HTTP {status}")
+    elapsed = time.perf_counter() - start
+    request(port, "DELETE", f"/jobs/{job['id']}")
+    return elapsed, rejected, job
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))]
+
+
+def load(port, cases, clients, requests):
+    """Runs `requests` round trips from `clients` threads; returns their results."""
+    order = [cases[i % len(cases)] for i in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        results = list(pool.map(lambda case: convert(port, case[0], mode=case[1]), order))
+    return time.perf_counter() - start, results
+
+
+def burst(port, src, n):
+    """Uploads `n` files at once without retrying; returns the responses."""
+    with open(src, "rb") as fh:
+        data = fh.read()
+    barrier = threading.Barrier(n)
+
+    def post(_):
+        barrier.wait()
+        return request(port, "POST", "/jobs?name=slow.xlsx", data)
+
+    with ThreadPoolExecutor(n) as pool:
+        return list(pool.map(post, range(n)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=48,
+                        help="round trips, cycling through the four conversions")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument("--max-queued", type=int, default=16)
+    parser.add_argument("--max-p99", type=float, metavar="SECONDS",
+                        help="fail when the p99 latency is above this")
+    parser.add_argument("--min-throughput", type=float, metavar="PER_SECOND",
+                        help="fail when fewer conversions per second complete")
+    args = parser.parse_args()
+
+    problems = []
+    with tempfile.TemporaryDirectory() as tmp:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            pool.submit(make_fixtures, tmp).result()
+        cases = [(os.path.join(tmp, name), key) for name, key in (
+            ("in.pdf", "pdf-word"), ("in.pdf", "pdf-excel"),
+            ("in.docx", "word-pdf"), ("in.xlsx", "excel-pdf"))]
+
+        proc, port = start_server(args.workers, args.max_queued)
+        try:
+            for src, key in cases:  # let the workers import and warm up first
+                convert(port, src, mode=key)
+            elapsed, results = load(port, cases, args.clients, args.requests)
+            latencies = [sec for sec, _, job in results if job["state"] == "done"]
+            failed    = [job for _, _, job in results if job["state"] != "done"]
+            rejected  = sum(r for _, r, _ in results)
+            throughput = len(latencies) / elapsed
+            print(f"{args.requests} conversions, {args.clients} clients, "
+                  f"{args.workers} worker(s), {os.cpu_count()} CPU(s)")
+            print(f"  throughput  {throughput:6.2f} conversions/s over {elapsed:.1f}s")
+            if latencies:
+                print("  latency     " + "  ".join(
+                    f"p{p} {percentile(latencies, p):.2f}s" for p in (50, 90, 99))
+                    + f"  max {max(latencies):.2f}s")
+            print(f"  429s        {rejected} (retried)")
+            if failed:
+                problems.append(f"{len(failed)} conversion(s) failed, e.g. {failed[0]['error']}")
+            if args.max_p99 and latencies and percentile(latencies, 99) > args.max_p99:
+                problems.append(f"p99 latency above {args.max_p99:g} s")
+            if args.min_throughput and throughput < args.min_throughput:
+                problems.append(f"throughput below {args.min_throughput:g}/s")
+        finally:
+            proc.terminate()
+            proc.wait()
+
+        # backpressure: a single worker and queue slot, and more uploads than fit
+        proc, port = start_server(1, 1, ["--timeout", "60"])
+        try:
+            responses = burst(port, os.path.join(tmp, "slow.xlsx"), 6)
+            codes     = [status for status, _ in responses]
+            print(f"  burst       {codes.count(202)} accepted, {codes.count(429)} got 429")
+            if codes.count(429) == 0 or codes.count(202) + codes.count(429) != len(codes):
+                problems.append(f"burst statuses {codes}: expected 202s and 429s only")
+            for status, body in responses:  # free the worker for the next check
+                if status == 202:
+                    request(port, "DELETE", f"/jobs/{json.loads(body)['id']}")
+            _, _, job = convert(port, cases[3][0], timeout=0.01)
+            print(f"  timeout     {job['state']}: {job['error']}")
+            if not (job["error"] or "").startswith("TimeoutError"):
+                problems.append("a request with timeout=0.01 did not time out")
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
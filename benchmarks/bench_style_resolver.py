@@ -0,0 +1,68 @@
+"""
+Excel → PDF cell-style microbenchmark: working out every cell's
+background, bold and alignment through the cell.fill / cell.font /
+cell.alignment proxies versus the per-workbook _ExcelStyleResolver.
+
+    python benchmarks/bench_style_resolver.py --rows 5000 --cols 25
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from convertly import excel_pdf  # noqa: E402
+from bench_excel_styles import make_sheet  # noqa: E402
+
+
+def per_cell(wb, rows):
+    for row in rows:
+        for cell in row:
+            excel_pdf._excel_styles(cell.fill, cell.font, cell.alignment)
+
+
+def resolved(wb, rows):
+    resolve = excel_pdf._ExcelStyleResolver(wb)
+    for row in rows:
+        for cell in row:
+            resolve(cell)
+
+
+def best_of(fn, wb, rows, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(wb, rows)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--cols", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    import openpyxl
+    cells = args.rows * args.cols
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "styled.xlsx")
+        make_sheet(src, args.rows, args.cols)
+        print(f"{args.rows} x {args.cols} = {cells} styled cells, best of {args.repeat}")
+        print(f"{'':24}{'per cell s':>11}{'resolver s':>11}{'µs/cell':>16}{'speed-up':>10}")
+        for read_only in (False, True):
+            wb   = openpyxl.load_workbook(src, data_only=True, read_only=read_only)
+            rows = [list(row) for row in wb.active.iter_rows()]
+            slow = best_of(per_cell, wb, rows, args.repeat)
+            fast = best_of(resolved, wb, rows, args.repeat)
+            label = "read-only workbook" if read_only else "regular workbook"
+            print(f"{label:<24}{slow:>11.3f}{fast:>11.3f}"
+                  f"{slow / cells * 1e6:>8.2f} → {fast / cells * 1e6:<5.2f}"
+                  f"{slow / fast:>9.1f}x")
+            wb.close()
+
+
+if __name__ == "__main__":
+    main()
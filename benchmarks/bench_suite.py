@@ -0,0 +1,351 @@
+"""
+Benchmark suite: all four converters on deterministic synthetic fixtures
+across size tiers, recording wall time, peak RSS and output size.
+
+    python benchmarks/bench_suite.py --out results.json
+    python benchmarks/bench_suite.py --tiers small medium --compare baseline.json
+
+Every run happens in a fresh process, so peak RSS belongs to that run
+alone. The timed section excludes interpreter start-up. Fixtures are
+generated once into --fixtures and reused, and their content depends
+only on the tier. With --compare, the exit code is 1 if any case got
+slower or bigger than the baseline by more than the tolerances.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TIERS = {
+    #         PDF pages  XLSX rows  DOCX sections
+    "small":  (4,        500,       20),
+    "medium": (24,       5000,      200),
+    "large":  (96,       20000,     800),
+}
+
+
+# ── Fixtures ──────────────────────────────────────────────────────────────────
+
+def make_pdf(path, pages, ruled):
+    """Text pages, or pages holding one ruled (gridded) table each."""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import (SimpleDocTemplate, Paragraph, Table,
+                                    TableStyle, PageBreak)
+    styles = getSampleStyleSheet()
+    story  = []
+    for pg in range(pages):
+        story.append(Paragraph(f"Statement page {pg + 1}", styles["Heading2"]))
+        if ruled:
+            data = [["Date", "Reference", "Description", "Debit", "Credit"]]
+            data += [[f"2024-01-{r % 28 + 1:02d}", f"REF{pg:03d}{r:03d}",
+                      f"Item {r} on page {pg + 1}", f"{(r * 37) % 997}.{r % 100:02d}",
+                      f"{(r * 53) % 991}.{r % 100:02d}"] for r in range(30)]
+            tbl = Table(data)
+            tbl.setStyle(TableStyle([
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("BACKGROUND", (0, 0), (-1, 0), colors.lightblue),
+                ("FONTSIZE", (0, 0), (-1, -1), 8),
+            ]))
+            story.append(tbl)
+        else:
+            for i in range(40):
+                story.append(Paragraph(
+                    f"Line {i + 1} of page {pg + 1}: the quick brown fox jumps "
+                    f"over the lazy dog {i * pg}.", styles["Normal"]))
+        story.append(PageBreak())
+    SimpleDocTemplate(path, pagesize=A4, invariant=1).build(story)
+
+
+def make_xlsx(path, rows, cols=12, styled=True):
+    """
+    Banded fills, bold rows, per-column alignment, number formats, merges;
+    with styled=False, unstyled "R<r>C<c>" cells written in write-only mode.
+    """
+    import datetime
+    import openpyxl
+    if not styled:
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet("Data")
+        for r in range(rows):
+            ws.append([f"R{r}C{c}" for c in range(cols)])
+        wb.save(path)
+        return
+    from openpyxl.styles import Alignment, Font, PatternFill
+    fills = [PatternFill("solid", fgColor=c) for c in ("FFDDEEFF", "FFFFEEDD", "FFEEFFEE")]
+    bold  = Font(bold=True)
+    align = [Alignment(horizontal=h) for h in ("left", "center", "right")]
+    wb = openpyxl.Workbook()
+    wb.properties.created = wb.properties.modified = datetime.datetime(2024, 1, 1)
+    ws = wb.active
+    ws.title = "Ledger"
+    for r in range(1, rows + 1):
+        for c in range(1, cols + 1):
+            cell = ws.cell(r, c, f"H{c}" if r == 1 else (r * c) % 10007 / 100)
+            cell.fill = fills[(r // 5) % 3]
+            cell.alignment = align[c % 3]
+            cell.number_format = "0.00"
+            if r == 1 or r % 10 == 0:
+                cell.font = bold
+    for r in range(2, rows, 50):
+        ws.merge_cells(start_row=r, start_column=1, end_row=r + 1, end_column=1)
+    wb.save(path)
+
+
+def make_docx(path, sections):
+    """Headings, styled paragraphs, lists, a table and an image per section."""
+    import datetime
+    import io
+    import docx
+    from docx.shared import Inches, RGBColor
+    from PIL import Image
+    buf = io.BytesIO()
+    Image.new("RGB", (320, 200), (67, 97, 238)).save(buf, "PNG")
+    png = buf.getvalue()
+    d = docx.Document()
+    d.core_properties.created = d.core_properties.modified = datetime.datetime(2024, 1, 1)
+    for s in range(sections):
+        d.add_heading(f"Section {s + 1}", 1)
+        for i in range(6):
+            p = d.add_paragraph(f"Paragraph {i + 1} of section {s + 1}. ")
+            run = p.add_run("Bold coloured text.")
+            run.bold = True
+            run.font.color.rgb = RGBColor(0xEF, 0x44, 0x44)
+        for i in range(3):
+            d.add_paragraph(f"Bullet {i + 1}", style="List Bullet")
+        tbl = d.add_table(rows=5, cols=4)
+        for r in range(5):
+            for c in range(4):
+                tbl.cell(r, c).text = f"{s}.{r}.{c}"
+        if s % 4 == 0:
+            d.add_picture(io.BytesIO(png), width=Inches(2))
+    d.save(path)
+
+
+def make_table_docx(path, rows, cols, merged=False):
+    """
+    One table of `rows` rows under a header row. With `merged`: a shaded
+    header, zebra fills, a gridSpan across the first two columns every
+    10th row and a three-row vMerge down the last column every 25th row.
+    """
+    import copy
+    import docx
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+    W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+    def prop(tc, tag, **attrs):
+        el = OxmlElement(tag)
+        for name, value in attrs.items():
+            el.set(qn(f"w:{name}"), value)
+        tc.get_or_add_tcPr().append(el)
+
+    d = docx.Document()
+    tbl = d.add_table(rows=1, cols=cols)
+    for c in range(cols):
+        tbl.cell(0, c).text = f"H{c}"
+    template = copy.deepcopy(tbl.rows[0]._tr)
+    if merged:
+        for c in range(cols):
+            prop(tbl.cell(0, c)._tc, "w:shd", val="clear", fill="4472C4")
+    for r in range(1, rows):
+        tr = copy.deepcopy(template)
+        tcs = list(tr.iterchildren(W + "tc"))
+        for c, tc in enumerate(tcs):
+            tc.find(f".//{W}t").text = f"R{r}C{c}"
+            if merged and r % 2:
+                prop(tc, "w:shd", val="clear", fill="F2F2F2")
+        if merged and r % 10 == 0:
+            prop(tcs[0], "w:gridSpan", val="2")
+            tr.remove(tcs[1])
+        if merged and r % 25 in (1, 2, 3):
+            prop(tcs[-1], "w:vMerge", **({"val": "restart"} if r % 25 == 1 else {}))
+        tbl._tbl.append(tr)
+    d.save(path)
+
+
+def make_spaced_docx(path, pages):
+    """
+    Roughly what pdf2docx writes: per page a block of text paragraphs with
+    oversized spacing, runs of empty paragraphs, a small table and a page
+    break, with a few empty page-break paragraphs at the very top.
+    """
+    import docx
+    from docx.enum.text import WD_BREAK
+    from docx.shared import Pt
+    d = docx.Document()
+    for _ in range(3):
+        d.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+    for pg in range(pages):
+        for i in range(24):
+            para = d.add_paragraph(f"Page {pg + 1}, line {i + 1}: lorem ipsum dolor sit amet.")
+            if i % 6 == 0:
+                para.paragraph_format.space_before = Pt(96)
+                para.paragraph_format.space_after  = Pt(80)
+        for _ in range(5):
+            d.add_paragraph("  ")
+        tbl = d.add_table(rows=4, cols=3)
+        for r in range(4):
+            for c in range(3):
+                tbl.cell(r, c).text = f"{r}.{c}"
+        d.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+    d.save(path)
+
+
+def fixtures_for(tier, directory):
+    """Generates the tier's inputs once; returns (case, mode key, path) per run."""
+    pages, rows, sections = TIERS[tier]
+    specs = {
+        f"pdf-text-{tier}":  ("pdf",  lambda p: make_pdf(p, pages, ruled=False)),
+        f"pdf-ruled-{tier}": ("pdf",  lambda p: make_pdf(p, pages, ruled=True)),
+        f"xlsx-{tier}":      ("xlsx", lambda p: make_xlsx(p, rows)),
+        f"docx-{tier}":      ("docx", lambda p: make_docx(p, sections)),
+    }
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for name, (ext, make) in specs.items():
+        path = os.path.join(directory, f"{name}.{ext}")
+        if not os.path.exists(path):
+            make(path + ".tmp")
+            os.replace(path + ".tmp", path)
+        paths[name] = path
+    modes = {"pdf": ("pdf-word", "pdf-excel"), "docx": ("word-pdf",), "xlsx": ("excel-pdf",)}
+    return [(f"{mode}/{name}", mode, path)
+            for name, path in paths.items()
+            for mode in modes[os.path.splitext(path)[1][1:]]]
+
+
+# ── Running ───────────────────────────────────────────────────────────────────
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case(mode_key, src, out):
+    """Child-process side: one conversion, timed, with this process's peak RSS."""
+    import logging
+    logging.basicConfig(level=logging.ERROR)
+    import convertly
+    fn = next(m["fn"] for m in convertly.MODES if m["key"] == mode_key)
+    start = time.perf_counter()
+    fn(src, out)
+    return time.perf_counter() - start, peak_rss_mb(), os.path.getsize(out)
+
+
+def environment():
+    from importlib import metadata
+    libs = {}
+    for name in ("pdf2docx", "PyMuPDF", "pdfplumber", "openpyxl", "python-docx",
+                 "reportlab", "lxml"):
+        try:
+            libs[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            libs[name] = None
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "cpus": os.cpu_count(), "commit": commit, "libraries": libs}
+
+
+def compare(results, baseline, time_tol, rss_tol):
+    """Prints per-case deltas against `baseline`; returns the regressed case names."""
+    base = {c["case"]: c for c in baseline["cases"]}
+    regressed = []
+    print(f"\n{'case':<34}{'time Δ':>9}{'rss Δ':>9}{'size Δ':>9}")
+    for case in results["cases"]:
+        old = base.get(case["case"])
+        if old is None:
+            print(f"{case['case']:<34}{'(new)':>9}")
+            continue
+
+        def delta(key):
+            if not old.get(key) or case.get(key) is None:
+                return None
+            return case[key] / old[key] - 1
+
+        dt, dr, ds = delta("seconds"), delta("peak_rss_mb"), delta("output_bytes")
+        bad = (dt is not None and dt > time_tol) or (dr is not None and dr > rss_tol)
+        fmt = lambda d: "-" if d is None else f"{d:+.0%}"  # noqa: E731
+        print(f"{case['case']:<34}{fmt(dt):>9}{fmt(dr):>9}{fmt(ds):>9}"
+              f"{'  REGRESSION' if bad else ''}")
+        if bad:
+            regressed.append(case["case"])
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tiers", nargs="+", choices=list(TIERS), default=["small", "medium"])
+    parser.add_argument("--modes", nargs="+",
+                        choices=["pdf-word", "pdf-excel", "word-pdf", "excel-pdf"])
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per case; the median time is recorded")
+    parser.add_argument("--fixtures", default=os.path.join(ROOT, "benchmarks", ".fixtures"),
+                        help="where generated inputs are kept between runs")
+    parser.add_argument("--out", metavar="JSON", help="write the results here")
+    parser.add_argument("--compare", metavar="JSON", help="baseline results to gate against")
+    parser.add_argument("--time-tolerance", type=float, default=0.10,
+                        help="allowed slow-down before flagging (default 0.10 = 10%%)")
+    parser.add_argument("--rss-tolerance", type=float, default=0.15,
+                        help="allowed peak RSS growth before flagging (default 0.15)")
+    args = parser.parse_args()
+
+    ctx     = multiprocessing.get_context("spawn")  # no inherited imports or heap
+    results = {"environment": environment(), "repeat": args.repeat, "cases": []}
+    outdir  = os.path.join(args.fixtures, "out")
+    os.makedirs(outdir, exist_ok=True)
+
+    print(f"{'case':<34}{'seconds':>9}{'rss MB':>9}{'out KB':>9}")
+    for tier in args.tiers:
+        for case, mode_key, src in fixtures_for(tier, args.fixtures):
+            if args.modes and mode_key not in args.modes:
+                continue
+            out  = os.path.join(outdir, case.replace("/", "_") + {
+                "pdf-word": ".docx", "pdf-excel": ".xlsx"}.get(mode_key, ".pdf"))
+            runs = []
+            for _ in range(args.repeat):
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    runs.append(pool.submit(run_case, mode_key, src, out).result())
+            rss = [r for _, r, _ in runs if r is not None]
+            row = {"case": case, "mode": mode_key, "tier": tier,
+                   "seconds": round(statistics.median(s for s, _, _ in runs), 4),
+                   "peak_rss_mb": max(rss) if rss else None,
+                   "output_bytes": runs[-1][2]}
+            results["cases"].append(row)
+            rss_txt = "-" if row["peak_rss_mb"] is None else f"{row['peak_rss_mb']:.0f}"
+            print(f"{case:<34}{row['seconds']:>9.2f}{rss_txt:>9}"
+                  f"{row['output_bytes'] / 1024:>9.0f}", flush=True)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            regressed = compare(results, json.load(fh),
+                                args.time_tolerance, args.rss_tolerance)
+        if regressed:
+            print(f"\n{len(regressed)} regression(s).")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Warm worker pool benchmark: job latency in a fresh process per job versus
+a WarmPool whose workers imported the conversion libraries at start-up.
+Overhead is wall time minus the pure conversion time of a warm worker.
+
+    python benchmarks/bench_warm_pool.py --runs 5
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import convertly  # noqa: E402
+from convertly import pool as pool_mod  # noqa: E402
+
+
+def make_fixtures(tmp):
+    """One small input per mode; run in a child so this process stays cold."""
+    import docx
+    import openpyxl
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    pdf = os.path.join(tmp, "in.pdf")
+    c = canvas.Canvas(pdf, pagesize=A4)
+    for pg in range(2):
+        for i in range(20):
+            c.drawString(72, 770 - i * 18, f"Page {pg + 1} line {i + 1}  {i * 3.5:.2f}")
+        c.showPage()
+    c.save()
+    d = docx.Document()
+    d.add_heading("Warm pool", 1)
+    for i in range(30):
+        d.add_paragraph(f"Paragraph {i}")
+    d.save(os.path.join(tmp, "in.docx"))
+    wb = openpyxl.Workbook()
+    for r in range(50):
+        wb.active.append([f"R{r}C{c}" for c in range(6)])
+    wb.save(os.path.join(tmp, "in.xlsx"))
+
+
+def inputs_for(tmp):
+    ext = {"pdf-word": "pdf", "pdf-excel": "pdf", "word-pdf": "docx", "excel-pdf": "xlsx"}
+    return {key: os.path.join(tmp, f"in.{e}") for key, e in ext.items()}
+
+
+def cold_job(key, src, out):
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1, initializer=pool_mod._init_cli_worker,
+                             initargs=(logging.ERROR,)) as pool:
+        res = pool.submit(pool_mod._convert_job, key, src, out, None, False).result()
+    return time.perf_counter() - start, res
+
+
+def warm_job(pool, key, src, out):
+    start = time.perf_counter()
+    res = pool.submit(key, src, out, use_cache=False).result()
+    return time.perf_counter() - start, res
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    # spawn, as on Windows and macOS: a forked child would inherit imports
+    multiprocessing.set_start_method("spawn", force=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            pool.submit(make_fixtures, tmp).result()
+        srcs = inputs_for(tmp)
+
+        start = time.perf_counter()
+        pool  = convertly.WarmPool(1, log_level=logging.ERROR)
+        pool.wait_ready()
+        print(f"warm pool start-up (imports included): {time.perf_counter() - start:.2f}s\n")
+
+        print(f"{'mode':<11}{'cold s':>9}{'cold ovh':>10}{'warm 1st':>10}"
+              f"{'warm s':>9}{'warm ovh':>10}")
+        for key, src in srcs.items():
+            out = os.path.join(tmp, f"out-{key}" + convertly.modes._mode_by_key(key)["ext"])
+            cold = [cold_job(key, src, out) for _ in range(args.runs)]
+            first, _ = warm_job(pool, key, src, out)
+            warm = [warm_job(pool, key, src, out) for _ in range(args.runs)]
+            for _, res in cold + warm:
+                assert res["ok"], res["error"]
+
+            pure   = sum(r["seconds"] for _, r in warm) / len(warm)
+            t_cold = sum(w for w, _ in cold) / len(cold)
+            t_warm = sum(w for w, _ in warm) / len(warm)
+            print(f"{key:<11}{t_cold:>9.3f}{t_cold - pure:>10.3f}{first:>10.3f}"
+                  f"{t_warm:>9.3f}{t_warm - pure:>10.3f}", flush=True)
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
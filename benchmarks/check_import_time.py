@@ -0,0 +1,69 @@
+"""
+Import-time budget check: cold `import convertly` and the GUI module
+(converter.py, without opening a window) under `python -X importtime`.
+Exits 1 when the median time exceeds its budget or a conversion library
+is imported eagerly, so it can gate CI.
+
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --runs 9 --core-ms 80 --gui-ms 120
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ("pdf2docx", "fitz", "pymupdf", "pdfplumber", "pdfminer", "openpyxl",
+         "docx", "reportlab", "lxml", "PIL")
+
+CHECKS = (
+    # module, budget flag, modules it must not pull in
+    ("convertly", "core_ms", HEAVY + ("tkinter",)),
+    ("converter", "gui_ms",  HEAVY + ("convertly",)),
+)
+
+
+def import_profile(module):
+    """(cumulative µs of `module`, set of every module imported) for one cold run."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    total, names = None, set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        names.add(name)
+        if name == module:
+            total = int(cumulative)
+    return total, names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--core-ms", type=float, default=100.0,
+                        help="budget for `import convertly`")
+    parser.add_argument("--gui-ms", type=float, default=150.0,
+                        help="budget for `import converter` (the GUI module)")
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget_flag, forbidden in CHECKS:
+        budget  = getattr(args, budget_flag)
+        runs    = [import_profile(module) for _ in range(args.runs)]
+        median  = statistics.median(total for total, _ in runs) / 1000
+        eager   = sorted({n for _, names in runs for n in names
+                          if n.split(".")[0] in forbidden})
+        ok      = median <= budget and not eager
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'}  import {module:<10} {median:7.1f} ms "
+              f"(budget {budget:.0f} ms)")
+        if eager:
+            print(f"      eagerly imports: {', '.join(eager)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Word → PDF memory check: converts a short and a long generated document
+(bench_suite's docx fixture, about 30 and 1000 pages) in fresh processes
+and compares their peak RSS. word_to_pdf streams the document, so the
+long one may only need a little more memory than the short one. Exits 1
+when the growth is above its budget, so it can gate CI.
+
+    python benchmarks/check_word_memory.py
+    python benchmarks/check_word_memory.py --sections 50 2000 --max-growth-mb 24
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_suite import make_docx, peak_rss_mb  # noqa: E402
+
+
+def convert(src, out):
+    """Child-process side: one word_to_pdf run; (seconds, pages, peak RSS MB)."""
+    import convertly
+    start = time.perf_counter()
+    convertly.word_to_pdf(src, out)
+    seconds = time.perf_counter() - start
+    with open(out, "rb") as fh:
+        pages = max(int(n) for n in re.findall(rb"/Count (\d+)", fh.read()))
+    return seconds, pages, peak_rss_mb()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sections", type=int, nargs=2, default=[50, 2000],
+                        metavar=("SHORT", "LONG"),
+                        help="bench_suite docx sections of the two documents")
+    parser.add_argument("--max-growth-mb", type=float, default=32.0,
+                        help="budget for the long document's extra peak RSS")
+    args = parser.parse_args()
+
+    if peak_rss_mb() is None:
+        print("Peak RSS is not available on this platform")
+        return 0
+    peaks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for sections in args.sections:
+            src = os.path.join(tmp, f"{sections}.docx")
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                pool.submit(make_docx, src, sections).result()
+            with ProcessPoolExecutor(max_workers=1) as pool:  # fresh process per run
+                seconds, pages, peak = pool.submit(
+                    convert, src, os.path.join(tmp, "out.pdf")).result()
+            peaks.append(peak)
+            print(f"{sections:>6} sections {pages:>6} pages {seconds:>8.2f} s "
+                  f"{peak:>8.1f} MB peak")
+
+    growth = peaks[1] - peaks[0]
+    ok     = growth <= args.max_growth_mb
+    print(f"{'ok  ' if ok else 'FAIL'}  peak RSS grew {growth:.1f} MB "
+          f"(budget {args.max_growth_mb:.0f} MB)")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
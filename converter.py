@@ -1,13 +1,19 @@
 """
 Convertly — File Converter  v2.0
 Developer: Ibrahim Ezzeldin Mirghani
+
+The window only. Conversions live in the `convertly` package, which is
+imported when the user first picks a file, so the window opens without
+loading any conversion library.
 """
 import tkinter as tk
 from tkinter import filedialog, ttk
 import threading
 import os
+import sys
 import subprocess
 import platform
+import multiprocessing
 from datetime import datetime
 
 
@@ -19,543 +25,22 @@ def _open_path(path):
     else:
         subprocess.run(["xdg-open", path], check=False)
 
-# ── Conversion Functions ─────────────────────────────────────────────────────
-
-def _cleanup_docx_spacing(docx_path):
-    """
-    Post-process a converted DOCX to remove excessive blank space:
-    - Collapses runs of more than 2 consecutive empty paragraphs into 1
-    - Caps paragraph spaceBefore/spaceAfter values above 72 pt
-    - Removes isolated page-break elements near the top of the document
-    """
-    from docx import Document
-    from docx.shared import Pt
-    from docx.oxml.ns import qn
-    try:
-        doc = Document(docx_path)
-
-        # ── 1. Remove excessive consecutive blank paragraphs ──
-        blank_run = 0
-        to_remove = []
-        for para in doc.paragraphs:
-            if not para.text.strip():
-                blank_run += 1
-                if blank_run > 2:
-                    to_remove.append(para)
-            else:
-                blank_run = 0
-        for para in to_remove:
-            p = para._element
-            parent = p.getparent()
-            if parent is not None:
-                parent.remove(p)
-
-        # ── 2. Cap runaway spaceBefore / spaceAfter ──
-        for para in doc.paragraphs:
-            pf = para.paragraph_format
-            try:
-                if pf.space_before and pf.space_before.pt > 72:
-                    pf.space_before = Pt(18)
-            except Exception:
-                pass
-            try:
-                if pf.space_after and pf.space_after.pt > 72:
-                    pf.space_after = Pt(8)
-            except Exception:
-                pass
-
-        # ── 3. Remove stray page-break runs near the top ──
-        for para in list(doc.paragraphs)[:10]:
-            if para.text.strip():
-                continue
-            for run in para.runs:
-                for br in run._element.findall(f'.//{qn("w:br")}'):
-                    if br.get(qn('w:type')) == 'page':
-                        br.getparent().remove(br)
-
-        doc.save(docx_path)
-    except Exception:
-        pass  # never let cleanup crash the whole conversion
-
 
-def pdf_to_word(pdf_path, out_path, stop_event=None):
-    """
-    Converts PDF → DOCX using the best available engine:
-      1. Microsoft Word via COM (Windows, highest fidelity)
-      2. LibreOffice via subprocess (if installed)
-      3. pdf2docx (pure-Python fallback)
-    Then post-processes to collapse excessive blank space.
-    """
-    import shutil
-    abs_pdf = os.path.abspath(pdf_path)
-    abs_out = os.path.abspath(out_path)
-    converted = False
+def _format_eta(seconds):
+    if seconds < 60:
+        return f"about {max(int(seconds), 1)} s left"
+    if seconds < 3600:
+        return f"about {round(seconds / 60)} min left"
+    return f"about {seconds / 3600:.1f} h left"
 
-    # ── 1. Microsoft Word (COM) ───────────────────────────────────────────────
-    if not converted:
-        try:
-            import pythoncom, win32com.client
-            pythoncom.CoInitialize()
-            word = None
-            try:
-                word = win32com.client.Dispatch("Word.Application")
-                word.Visible = False
-                word.DisplayAlerts = False
-                doc = word.Documents.Open(abs_pdf)
-                doc.SaveAs2(abs_out, FileFormat=16)
-                doc.Close(False)
-                converted = True
-            finally:
-                try:
-                    if word: word.Quit()
-                except Exception:
-                    pass
-                pythoncom.CoUninitialize()
-        except Exception:
-            pass
-
-    # ── 2. LibreOffice ────────────────────────────────────────────────────────
-    if not converted:
-        lo_paths = [
-            r"C:\Program Files\LibreOffice\program\soffice.exe",
-            r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
-        ]
-        for lo in lo_paths:
-            if os.path.exists(lo):
-                try:
-                    out_dir = os.path.dirname(abs_out)
-                    subprocess.run(
-                        [lo, "--headless", "--convert-to", "docx",
-                         "--outdir", out_dir, abs_pdf],
-                        timeout=120, check=True,
-                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-                    )
-                    lo_out = os.path.join(
-                        out_dir,
-                        os.path.splitext(os.path.basename(pdf_path))[0] + ".docx"
-                    )
-                    if os.path.exists(lo_out) and os.path.abspath(lo_out) != abs_out:
-                        shutil.move(lo_out, abs_out)
-                    converted = True
-                except Exception:
-                    pass
-                break
-
-    # ── 3. pdf2docx (fallback) ────────────────────────────────────────────────
-    if not converted:
-        from pdf2docx import Converter
-        cv = Converter(abs_pdf)
-        cv.convert(abs_out)
-        cv.close()
-
-    # ── Post-process: collapse excessive blank space ───────────────────────────
-    _cleanup_docx_spacing(abs_out)
-
-def pdf_to_excel(pdf_path, out_path, stop_event=None):
-    import pdfplumber, openpyxl
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            if stop_event and stop_event.is_set():
-                raise InterruptedError("Cancelled by user.")
-            tables = page.extract_tables()
-            if tables:
-                for table in tables:
-                    for row in table:
-                        ws.append([c if c else "" for c in row])
-            else:
-                text = page.extract_text()
-                if text:
-                    for line in text.split("\n"):
-                        ws.append([line])
-    wb.save(out_path)
-
-def word_to_pdf(docx_path, out_path, stop_event=None):
-    """
-    Converts DOCX to PDF using python-docx + reportlab.
-    Preserves: document element order, inline images, text alignment,
-    text colors, font sizes, bold/italic/underline, list bullets,
-    and table cell background colors from the original DOCX.
-    """
-    import tempfile
-    from docx import Document
-    from docx.oxml.ns import qn
-    from docx.text.paragraph import Paragraph as DocxParagraph
-    from docx.table import Table as DocxTable
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import cm
-    from reportlab.lib import colors
-    from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
-    from reportlab.platypus import (SimpleDocTemplate, Paragraph, Spacer,
-                                    Table, TableStyle,
-                                    Image as RLImage)
-
-    A_NS  = "http://schemas.openxmlformats.org/drawingml/2006/main"
-    R_NS  = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
-    WP_NS = "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
-
-    doc = Document(docx_path)
-    pdf = SimpleDocTemplate(
-        out_path, pagesize=A4,
-        leftMargin=2.5*cm, rightMargin=2.5*cm,
-        topMargin=2.5*cm,  bottomMargin=2.5*cm,
-    )
-
-    base_styles = getSampleStyleSheet()
-    story      = []
-    tmp_images = []
-    max_w      = A4[0] - 5 * cm
-    _sc        = [0]  # style name counter for uniqueness
 
-    try:
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-        ALIGN_MAP = {
-            WD_ALIGN_PARAGRAPH.LEFT:    TA_LEFT,
-            WD_ALIGN_PARAGRAPH.CENTER:  TA_CENTER,
-            WD_ALIGN_PARAGRAPH.RIGHT:   TA_RIGHT,
-            WD_ALIGN_PARAGRAPH.JUSTIFY: TA_JUSTIFY,
-        }
-    except Exception:
-        ALIGN_MAP = {}
-
-    def esc(t):
-        return t.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-
-    def run_markup(run):
-        rt = esc(run.text)
-        if not rt:
-            return ""
-        # Font color
-        try:
-            if run.font.color and run.font.color.type is not None:
-                rgb = str(run.font.color.rgb)
-                rt = f'<font color="#{rgb}">{rt}</font>'
-        except Exception:
-            pass
-        # Font size
-        try:
-            if run.font.size:
-                rt = f'<font size="{run.font.size.pt:.1f}">{rt}</font>'
-        except Exception:
-            pass
-        # Bold / italic / underline
-        if getattr(run, 'bold', False) and getattr(run, 'italic', False):
-            rt = f"<b><i>{rt}</i></b>"
-        elif getattr(run, 'bold', False):
-            rt = f"<b>{rt}</b>"
-        elif getattr(run, 'italic', False):
-            rt = f"<i>{rt}</i>"
-        if getattr(run, 'underline', False):
-            rt = f"<u>{rt}</u>"
-        return rt
-
-    def make_style(style_name, alignment, base_size=11):
-        _sc[0] += 1
-        sn = f"_S{_sc[0]}"
-        al = ALIGN_MAP.get(alignment, TA_LEFT)
-        leading = max(base_size * 1.45, 14)
-        if "Heading 1" in style_name:
-            return ParagraphStyle(sn, parent=base_styles["Heading1"],
-                fontSize=18, leading=22, spaceBefore=12, spaceAfter=6, alignment=al)
-        elif "Heading 2" in style_name:
-            return ParagraphStyle(sn, parent=base_styles["Heading2"],
-                fontSize=14, leading=18, spaceBefore=10, spaceAfter=4, alignment=al)
-        elif "Heading 3" in style_name:
-            return ParagraphStyle(sn, parent=base_styles["Heading3"],
-                fontSize=12, leading=16, spaceBefore=8, spaceAfter=3, alignment=al)
-        else:
-            return ParagraphStyle(sn, parent=base_styles["Normal"],
-                fontSize=base_size, leading=leading, spaceAfter=4,
-                leftIndent=(18 if "List" in style_name else 0),
-                alignment=al)
-
-    def extract_images(para_elem):
-        imgs = []
-        blips = para_elem.findall(f'.//{{{A_NS}}}blip')
-        for blip in blips:
-            r_embed = blip.get(f'{{{R_NS}}}embed')
-            if not r_embed or r_embed not in doc.part.rels:
-                continue
-            try:
-                img_part = doc.part.rels[r_embed].target_part
-                img_data = img_part.blob
-                ext = img_part.content_type.split('/')[-1]
-                if ext == 'jpeg':
-                    ext = 'jpg'
-                tmp = tempfile.NamedTemporaryFile(suffix=f'.{ext}', delete=False)
-                tmp.write(img_data)
-                tmp.close()
-                tmp_images.append(tmp.name)
-                # Get dimensions from EMU → pt
-                extents = para_elem.findall(f'.//{{{WP_NS}}}extent')
-                if extents:
-                    cx = int(extents[0].get('cx', 0))
-                    cy = int(extents[0].get('cy', 0))
-                    w = cx / 914400 * 72
-                    h = cy / 914400 * 72
-                    if w > max_w:
-                        h = h * max_w / w
-                        w = max_w
-                    img = RLImage(tmp.name, width=w, height=h)
-                else:
-                    img = RLImage(tmp.name, width=min(300, max_w))
-                imgs.append(img)
-            except Exception:
-                pass
-        return imgs
-
-    def get_cell_bg(cell):
-        tc_pr = cell._tc.find(qn('w:tcPr'))
-        if tc_pr is not None:
-            shd = tc_pr.find(qn('w:shd'))
-            if shd is not None:
-                fill = shd.get(qn('w:fill'))
-                if fill and fill not in ('auto',) and len(fill) == 6:
-                    try:
-                        return colors.HexColor(f"#{fill}")
-                    except Exception:
-                        pass
-        return None
-
-    # Iterate body elements in document order
-    for elem in doc.element.body:
-        if stop_event and stop_event.is_set():
-            raise InterruptedError("Cancelled by user.")
-
-        tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
-
-        if tag == 'p':
-            para = DocxParagraph(elem, doc)
-
-            # Embed any inline images first
-            for img in extract_images(elem):
-                story.append(img)
-                story.append(Spacer(1, 4))
-
-            text = para.text.strip()
-            if not text:
-                story.append(Spacer(1, 6))
-                continue
-
-            style_name = para.style.name if para.style else "Normal"
-
-            # Detect base font size from first sized run
-            base_size = 11
-            for run in para.runs:
-                try:
-                    if run.font.size:
-                        base_size = run.font.size.pt
-                        break
-                except Exception:
-                    pass
-
-            p_style = make_style(style_name, para.alignment, base_size)
-
-            parts = [run_markup(run) for run in para.runs]
-            rich_text = "".join(parts) or esc(text)
-
-            if "List Bullet" in style_name:
-                rich_text = "• " + rich_text
-
-            story.append(Paragraph(rich_text, p_style))
-
-        elif tag == 'tbl':
-            tbl = DocxTable(elem, doc)
-            data   = []
-            bg_map = {}  # (row_idx, col_idx) → HexColor
-
-            for r_idx, row in enumerate(tbl.rows):
-                row_data = []
-                for c_idx, cell in enumerate(row.cells):
-                    row_data.append(cell.text)
-                    bg = get_cell_bg(cell)
-                    if bg:
-                        bg_map[(r_idx, c_idx)] = bg
-                data.append(row_data)
-
-            if not data:
-                continue
-
-            num_cols = max(len(r) for r in data)
-            col_w    = max_w / max(num_cols, 1)
-            data     = [r + [""] * (num_cols - len(r)) for r in data]
-
-            ts = [
-                ("FONTSIZE",       (0, 0), (-1, -1), 9),
-                ("GRID",           (0, 0), (-1, -1), 0.4, colors.HexColor("#CCCCCC")),
-                ("TOPPADDING",     (0, 0), (-1, -1), 4),
-                ("BOTTOMPADDING",  (0, 0), (-1, -1), 4),
-                ("LEFTPADDING",    (0, 0), (-1, -1), 6),
-                ("VALIGN",         (0, 0), (-1, -1), "MIDDLE"),
-            ]
-            for (r, c), bg in bg_map.items():
-                ts.append(("BACKGROUND", (c, r), (c, r), bg))
-
-            # Default header row only when the first cell has no custom color
-            if (0, 0) not in bg_map:
-                ts += [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#4361EE")),
-                    ("TEXTCOLOR",  (0, 0), (-1, 0), colors.white),
-                    ("FONTNAME",   (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("ROWBACKGROUNDS", (0, 1), (-1, -1),
-                     [colors.white, colors.HexColor("#F5F7FF")]),
-                ]
-
-            rl_tbl = Table(data, colWidths=[col_w] * num_cols)
-            rl_tbl.setStyle(TableStyle(ts))
-            story.append(Spacer(1, 6))
-            story.append(rl_tbl)
-            story.append(Spacer(1, 6))
-
-    if not story:
-        story.append(Paragraph("(Empty document)",
-            ParagraphStyle("_empty", parent=base_styles["Normal"], fontSize=11)))
-
-    try:
-        pdf.build(story)
-    finally:
-        for tmp in tmp_images:
-            try:
-                os.remove(tmp)
-            except Exception:
-                pass
-
-def excel_to_pdf(xlsx_path, out_path, stop_event=None):
-    """
-    Uses openpyxl + reportlab to convert Excel → PDF.
-    Preserves: cell background colors, font bold, cell alignment,
-    and merged cell spans from the original spreadsheet.
-    """
-    import openpyxl
-    from reportlab.lib.pagesizes import A4, landscape
-    from reportlab.lib import colors
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-    from reportlab.lib.styles import getSampleStyleSheet
-    from reportlab.lib.units import cm
-
-    wb    = openpyxl.load_workbook(xlsx_path, data_only=True)
-    story = []
-    styles = getSampleStyleSheet()
-
-    for sheet_name in wb.sheetnames:
-        if stop_event and stop_event.is_set():
-            raise InterruptedError("Cancelled by user.")
-
-        ws = wb[sheet_name]
-
-        story.append(Paragraph(f"<b>{sheet_name}</b>", styles["Heading2"]))
-        story.append(Spacer(1, 0.3 * cm))
-
-        rows = list(ws.iter_rows())
-        if not rows:
-            continue
-
-        num_cols = ws.max_column or 1
-        num_rows = ws.max_row    or 1
-
-        # Base table commands
-        ts = [
-            ("FONTSIZE",       (0, 0), (-1, -1), 8),
-            ("ALIGN",          (0, 0), (-1, -1), "LEFT"),
-            ("VALIGN",         (0, 0), (-1, -1), "MIDDLE"),
-            ("TOPPADDING",     (0, 0), (-1, -1), 3),
-            ("BOTTOMPADDING",  (0, 0), (-1, -1), 3),
-            ("LEFTPADDING",    (0, 0), (-1, -1), 4),
-            ("GRID",           (0, 0), (-1, -1), 0.3, colors.HexColor("#CCCCCC")),
-        ]
-
-        data        = []
-        has_any_bg  = False
-
-        for r_idx, row in enumerate(rows):
-            row_data = []
-            for c_idx, cell in enumerate(row):
-                val = str(cell.value) if cell.value is not None else ""
-                row_data.append(val)
-
-                # Cell background color
-                try:
-                    fill = cell.fill
-                    if fill and fill.fill_type not in (None, 'none'):
-                        fg = fill.fgColor
-                        if fg and fg.type == 'rgb' and fg.rgb:
-                            rgb = fg.rgb[-6:]  # strip alpha channel
-                            if rgb.upper() not in ('FFFFFF', '000000', '000000'):
-                                ts.append(("BACKGROUND",
-                                           (c_idx, r_idx), (c_idx, r_idx),
-                                           colors.HexColor(f"#{rgb}")))
-                                has_any_bg = True
-                except Exception:
-                    pass
-
-                # Font bold
-                try:
-                    if cell.font and cell.font.bold:
-                        ts.append(("FONTNAME",
-                                   (c_idx, r_idx), (c_idx, r_idx),
-                                   "Helvetica-Bold"))
-                except Exception:
-                    pass
-
-                # Cell text alignment
-                try:
-                    if cell.alignment and cell.alignment.horizontal:
-                        al_map = {
-                            'center':  'CENTER',
-                            'right':   'RIGHT',
-                            'left':    'LEFT',
-                            'general': 'LEFT',
-                        }
-                        al = al_map.get(cell.alignment.horizontal)
-                        if al:
-                            ts.append(("ALIGN",
-                                       (c_idx, r_idx), (c_idx, r_idx), al))
-                except Exception:
-                    pass
-
-            data.append(row_data)
-
-        if not any(any(c for c in r) for r in data):
-            continue
-
-        # Merged cell spans
-        for merge in ws.merged_cells.ranges:
-            r1 = merge.min_row - 1
-            c1 = merge.min_col - 1
-            r2 = merge.max_row - 1
-            c2 = merge.max_col - 1
-            ts.append(("SPAN", (c1, r1), (c2, r2)))
-
-        # Fall back to default header styling only when no cell has a custom color
-        if not has_any_bg:
-            ts += [
-                ("BACKGROUND",     (0, 0), (-1, 0), colors.HexColor("#4361EE")),
-                ("TEXTCOLOR",      (0, 0), (-1, 0), colors.white),
-                ("FONTNAME",       (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("ROWBACKGROUNDS", (0, 1), (-1, -1),
-                 [colors.white, colors.HexColor("#F5F7FF")]),
-            ]
-
-        # Pad rows and build table
-        data = [r + [""] * (num_cols - len(r)) for r in data]
-
-        page_w  = landscape(A4)[0] - 2 * cm
-        col_w   = page_w / max(num_cols, 1)
-
-        tbl = Table(data, colWidths=[col_w] * num_cols, repeatRows=1)
-        tbl.setStyle(TableStyle(ts))
-        story.append(tbl)
-        story.append(Spacer(1, 0.5 * cm))
-
-    doc = SimpleDocTemplate(
-        out_path,
-        pagesize=landscape(A4),
-        leftMargin=1*cm, rightMargin=1*cm,
-        topMargin=1*cm,  bottomMargin=1*cm,
-    )
-    doc.build(story)
+def __getattr__(name):
+    # converter.pdf_to_word & co. keep working for scripts written against
+    # the single-module version
+    import convertly
+    if name in convertly.__all__:
+        return getattr(convertly, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ── Design Tokens ─────────────────────────────────────────────────────────────
@@ -570,46 +55,46 @@ ACCENT      = "#4361EE"
 ACCENT_DARK = "#3451D1"
 ACCENT_SOFT = "#EEF1FF"
 
+PROGRESS_POLL_MS = 100  # how often the window redraws conversion progress
+QUEUE_WORKERS    = max(1, min((os.cpu_count() or 2) - 1, 6))  # one core left for the UI
+EXTRACTORS       = {"Automatic": None, "pdfplumber": "pdfplumber", "PyMuPDF": "pymupdf"}
+
 MODES = [
     {
+        "key":   "pdf-word",
         "label": "PDF → Word",
         "desc":  "Editable Word document",
         "icon":  "📄",
         "color": "#4361EE",
         "light": "#EEF1FF",
         "ft":    [("PDF Files", "*.pdf")],
-        "ext":   "_converted.docx",
-        "fn":    pdf_to_word,
     },
     {
+        "key":   "pdf-excel",
         "label": "PDF → Excel",
         "desc":  "Extract tables & data",
         "icon":  "📊",
         "color": "#10B981",
         "light": "#ECFDF5",
         "ft":    [("PDF Files", "*.pdf")],
-        "ext":   "_converted.xlsx",
-        "fn":    pdf_to_excel,
     },
     {
+        "key":   "word-pdf",
         "label": "Word → PDF",
         "desc":  "Professional PDF output",
         "icon":  "📝",
         "color": "#EF4444",
         "light": "#FFF1F2",
         "ft":    [("Word Files", "*.docx")],
-        "ext":   "_converted.pdf",
-        "fn":    word_to_pdf,
     },
     {
+        "key":   "excel-pdf",
         "label": "Excel → PDF",
         "desc":  "Spreadsheet to PDF",
         "icon":  "📈",
         "color": "#F59E0B",
         "light": "#FFFBEB",
         "ft":    [("Excel Files", "*.xlsx")],
-        "ext":   "_converted.pdf",
-        "fn":    excel_to_pdf,
     },
 ]
 
@@ -633,8 +118,13 @@ class ConverterApp:
         self.active_mode = MODES[0]
         self.card_refs   = []
         self.status_var  = tk.StringVar(value="Choose a format, then select your file.")
+        self.pages_var   = tk.StringVar()
+        self.extractor   = tk.StringVar(value="Automatic")
         self._stop_event = threading.Event()
         self._converting = False
+        self.pool        = None  # WarmPool, started by _ensure_pool
+        self.queue_win   = None  # QueueWindow, opened by open_queue
+        self._latest     = None  # (done, total), written by the pool's relay thread
 
         self._build()
 
@@ -731,9 +221,42 @@ class ConverterApp:
         self.browse_btn.pack(side="right")
         self._btn_hover(self.browse_btn, ACCENT, ACCENT_DARK)
 
+        tk.Button(body, text="Convert several files at once  →",
+                  command=self.open_queue,
+                  bg=BG, fg=ACCENT, font=("Segoe UI", 9, "bold"),
+                  relief="flat", bd=0, cursor="hand2",
+                  activebackground=BG, activeforeground=ACCENT_DARK
+                  ).pack(anchor="e", pady=(6, 0))
+
+        # ── Page selection (PDF → Word only) ──
+        self.pages_row = tk.Frame(body, bg=BG)
+        tk.Label(self.pages_row, text="Pages",
+                 font=("Segoe UI", 9, "bold"),
+                 bg=BG, fg=TEXT_SEC).pack(side="left")
+        tk.Entry(self.pages_row, textvariable=self.pages_var, width=16,
+                 font=("Segoe UI", 9), relief="flat",
+                 highlightthickness=1, highlightbackground=BORDER,
+                 highlightcolor=ACCENT).pack(side="left", padx=(10, 10), ipady=4)
+        tk.Label(self.pages_row, text="e.g. 10-20 or 1,3,5 — leave empty for all",
+                 font=("Segoe UI", 8),
+                 bg=BG, fg=TEXT_MUTED).pack(side="left")  # packed by _activate_card
+
+        # ── Table extractor (PDF → Excel only) ──
+        self.extractor_row = tk.Frame(body, bg=BG)
+        tk.Label(self.extractor_row, text="Extractor",
+                 font=("Segoe UI", 9, "bold"),
+                 bg=BG, fg=TEXT_SEC).pack(side="left")
+        ttk.Combobox(self.extractor_row, textvariable=self.extractor,
+                     values=tuple(EXTRACTORS), state="readonly",
+                     width=12).pack(side="left", padx=(10, 10))
+        tk.Label(self.extractor_row, text="Automatic picks the faster one for the file",
+                 font=("Segoe UI", 8),
+                 bg=BG, fg=TEXT_MUTED).pack(side="left")  # packed by _activate_card
+
         # ── Convert + Stop buttons row ──
         btn_row = tk.Frame(body, bg=BG)
         btn_row.pack(fill="x", pady=(20, 0))
+        self.btn_row = btn_row
         btn_row.columnconfigure(0, weight=1)
 
         self.convert_btn = tk.Button(btn_row, text="  Convert Now  →",
@@ -908,6 +431,15 @@ class ConverterApp:
 
         self.active_mode = mode
 
+        if mode["key"] == "pdf-word":
+            self.pages_row.pack(fill="x", pady=(10, 0), before=self.btn_row)
+        else:
+            self.pages_row.pack_forget()
+        if mode["key"] == "pdf-excel":
+            self.extractor_row.pack(fill="x", pady=(10, 0), before=self.btn_row)
+        else:
+            self.extractor_row.pack_forget()
+
         for btn in [self.convert_btn, self.browse_btn]:
             if btn:
                 btn.configure(bg=mode["color"], activebackground=mode["color"])
@@ -924,6 +456,13 @@ class ConverterApp:
             int(r * factor), int(g * factor), int(b * factor))
 
     # ── File & Conversion ────────────────────────────────────────────────────
+    def _ensure_pool(self):
+        """Starts the warm worker, importing the conversion core on first use."""
+        if self.pool is None:
+            from convertly import WarmPool
+            self.pool = WarmPool(1)
+        return self.pool
+
     def browse(self):
         path = filedialog.askopenfilename(filetypes=self.active_mode["ft"])
         if path:
@@ -937,6 +476,7 @@ class ConverterApp:
                 fg=TEXT_MUTED)
             self.file_icon_lbl.config(text="📄")
             self.status_var.set("File ready — click Convert Now to proceed.")
+            self._ensure_pool()  # warm up while the user reaches for Convert
 
     def start_conversion(self):
         if not self.file_path.get():
@@ -944,44 +484,108 @@ class ConverterApp:
             return
 
         self._stop_event.clear()
+        self._ensure_pool().stop.clear()
         self._converting = True
 
         # Show stop button
         self.convert_btn.config(state="disabled", text="  Converting…  ⏳")
         self.stop_btn.pack(side="left", padx=(8, 0))
 
-        threading.Thread(target=self._do_convert, daemon=True).start()
+        self._do_convert()
 
     def stop_conversion(self):
         self._stop_event.set()
+        if self.pool:
+            # End the job now rather than at its next page boundary: one
+            # page (or the final layout) can take minutes on its own.
+            self.pool.kill()
+            self.pool = None
         self.status_var.set("⚠  Stopping — please wait…")
         self.stop_btn.config(state="disabled", text="Stopping…")
 
+    def open_queue(self):
+        if self.queue_win is None:
+            self.queue_win = QueueWindow(self)
+        else:
+            self.queue_win.top.lift()
+
     def _do_convert(self):
+        self.progress.config(mode="indeterminate", value=0)
         self.progress.start(8)
         self.status_var.set("Converting — please wait…")
         try:
+            import convertly
+            from convertly.progress import Eta
             src  = self.file_path.get()
-            base = os.path.splitext(src)[0]
-            out  = base + self.active_mode["ext"]
-            self.active_mode["fn"](src, out, self._stop_event)
-
-            if self._stop_event.is_set():
-                # Clean up partial output
-                if os.path.exists(out):
-                    try: os.remove(out)
+            key  = self.active_mode["key"]
+            mode = next(m for m in convertly.MODES if m["key"] == key)
+            out  = os.path.splitext(src)[0] + mode["ext"]
+            options = {}
+            if key == "pdf-word":
+                options["pages"]   = self.pages_var.get().strip() or None
+                options["workers"] = os.cpu_count()
+            elif key == "pdf-excel" and EXTRACTORS[self.extractor.get()]:
+                options["backend"] = EXTRACTORS[self.extractor.get()]
+            self._latest = None
+            job = self.pool.submit(key, src, out, options,
+                                   incremental=(key == "pdf-excel"),
+                                   progress=self._on_progress)
+        except Exception as e:  # e.g. the worker process died
+            self.pool = None
+            self._finish_ui("An error occurred during conversion.", error=str(e))
+            return
+        self.root.after(PROGRESS_POLL_MS, self._poll_job, job, out, mode["unit"], Eta())
+
+    def _on_progress(self, done, total):
+        # Runs on the pool's relay thread: only hand the values over;
+        # _poll_job draws them on the Tk main loop.
+        self._latest = (done, total)
+
+    def _poll_job(self, job, out, unit, eta):
+        latest = self._latest
+        if latest and latest[1] and not self._stop_event.is_set():
+            done, total = latest
+            if str(self.progress["mode"]) != "determinate":
+                self.progress.stop()
+                self.progress.config(mode="determinate")
+            self.progress.config(maximum=total, value=done)
+            left = eta.update(done, total)
+            self.status_var.set(f"Converting — {done:,} of {total:,} {unit}"
+                                + (f" · {_format_eta(left)}" if left is not None else ""))
+
+        if not job.done():
+            self.root.after(PROGRESS_POLL_MS, self._poll_job, job, out, unit, eta)
+            return
+
+        if self._stop_event.is_set():
+            # Clean up partial output
+            for path in (out, out + ".tmp"):
+                if os.path.exists(path):
+                    try: os.remove(path)
                     except: pass
-                self._finish_ui("⚠  Conversion stopped.")
-            else:
-                self._finish_ui(f"✓  Done!  Saved as {os.path.basename(out)}", out)
+            self._finish_ui("⚠  Conversion stopped.")
+            self._ensure_pool()  # replace the killed worker while the user looks
+            return
 
-        except InterruptedError:
-            self._finish_ui("⚠  Conversion cancelled.")
-        except Exception as e:
+        try:
+            res = job.result()
+        except Exception as e:  # e.g. the worker process died
+            self.pool = None
             self._finish_ui("An error occurred during conversion.", error=str(e))
+            return
+
+        if not res["ok"]:
+            self._finish_ui("An error occurred during conversion.", error=res["error"])
+        else:
+            note  = " (from cache)" if res["cached"] else ""
+            pages = res["pages"]
+            if pages and pages["reused"]:
+                note = f" ({pages['reused']} of {pages['reused'] + pages['computed']} pages reused)"
+            self._finish_ui(f"✓  Done!  Saved as {os.path.basename(out)}{note}", out)
 
     def _finish_ui(self, status_msg, out_path=None, error=None):
         self.progress.stop()
+        self.progress.config(mode="indeterminate", value=0)
         self._converting = False
         self._stop_event.clear()
 
@@ -1114,8 +718,178 @@ class ConverterApp:
                   cursor="hand2", bd=0).pack(anchor="w")
 
 
+# ── Job queue window ──────────────────────────────────────────────────────────
+class QueueWindow:
+    """
+    Converts many files, of any of the supported types, a few at a time.
+    The jobs run in a convertly JobQueue of QUEUE_WORKERS warm workers,
+    which this window polls from the Tk main loop.
+    """
+
+    STATES = {"queued": "Waiting", "running": "Converting", "done": "Done",
+              "failed": "Failed", "cancelled": "Cancelled"}
+
+    def __init__(self, app):
+        from convertly.jobs import JobQueue
+        self.app   = app
+        self.queue = JobQueue(QUEUE_WORKERS)
+        self.queue.warm_up()  # while the user picks files
+        self.top   = tk.Toplevel(app.root)
+        self.top.title("Convertly — Job Queue")
+        self.top.geometry("760x460")
+        self.top.minsize(600, 320)
+        self.top.configure(bg=BG)
+        self.top.protocol("WM_DELETE_WINDOW", self.close)
+        self.pdf_target = tk.StringVar(
+            value="Excel" if app.active_mode["key"] == "pdf-excel" else "Word")
+        self.info_var   = tk.StringVar(value="Add files to start converting.")
+        self._build()
+        self._poll()
+
+    def _build(self):
+        bar = tk.Frame(self.top, bg=BG)
+        bar.pack(fill="x", padx=20, pady=(16, 10))
+        add_btn = tk.Button(bar, text="＋  Add files",
+                            command=self.add_files,
+                            bg=ACCENT, fg=WHITE,
+                            font=("Segoe UI", 9, "bold"),
+                            relief="flat", padx=16, pady=7,
+                            cursor="hand2", bd=0,
+                            activebackground=ACCENT_DARK,
+                            activeforeground=WHITE)
+        add_btn.pack(side="left")
+        self.app._btn_hover(add_btn, ACCENT, ACCENT_DARK)
+        tk.Label(bar, text="PDF files to",
+                 font=("Segoe UI", 9), bg=BG, fg=TEXT_SEC).pack(side="left", padx=(16, 6))
+        ttk.Combobox(bar, textvariable=self.pdf_target, values=("Word", "Excel"),
+                     state="readonly", width=7).pack(side="left")
+        tk.Label(bar, text=f"{QUEUE_WORKERS} at a time",
+                 font=("Segoe UI", 8), bg=BG, fg=TEXT_MUTED).pack(side="right")
+
+        table = tk.Frame(self.top, bg=BG)
+        table.pack(fill="both", expand=True, padx=20)
+        columns = (("file", "File", 260), ("mode", "Conversion", 110),
+                   ("state", "Status", 90), ("progress", "Progress", 110),
+                   ("time", "Time", 70))
+        self.tree = ttk.Treeview(table, columns=[c for c, _, _ in columns],
+                                 show="headings", selectmode="extended")
+        for col, heading, width in columns:
+            self.tree.heading(col, text=heading, anchor="w")
+            self.tree.column(col, width=width, anchor="w", stretch=(col == "file"))
+        scroll = ttk.Scrollbar(table, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="right", fill="y")
+        self.tree.bind("<<TreeviewSelect>>", lambda e: self._refresh())
+        self.tree.bind("<Double-1>", lambda e: self.open_selected())
+
+        actions = tk.Frame(self.top, bg=BG)
+        actions.pack(fill="x", padx=20, pady=(10, 4))
+        for text, command in (("Cancel", self.cancel_selected),
+                              ("Retry", self.retry_selected),
+                              ("Clear finished", self.clear_finished),
+                              ("Open", self.open_selected)):
+            tk.Button(actions, text=text, command=command,
+                      bg=WHITE, fg=TEXT, font=("Segoe UI", 9),
+                      relief="flat", padx=12, pady=5, cursor="hand2",
+                      highlightthickness=1, highlightbackground=BORDER,
+                      activebackground=BORDER_SOFT).pack(side="left", padx=(0, 8))
+        tk.Label(self.top, textvariable=self.info_var,
+                 font=("Segoe UI", 9), bg=BG, fg=TEXT_MUTED,
+                 anchor="w").pack(fill="x", padx=20, pady=(4, 12))
+
+    # ── Actions ──────────────────────────────────────────────────────────────
+    def add_files(self):
+        paths = filedialog.askopenfilenames(
+            parent=self.top,
+            filetypes=[("Documents", "*.pdf *.docx *.xlsx"), ("PDF Files", "*.pdf"),
+                       ("Word Files", "*.docx"), ("Excel Files", "*.xlsx")])
+        for path in paths:
+            key = None
+            if path.lower().endswith(".pdf"):
+                key = "pdf-excel" if self.pdf_target.get() == "Excel" else "pdf-word"
+            try:
+                job = self.queue.add(path, key)
+            except ValueError as e:
+                self.info_var.set(str(e))
+                continue
+            self.tree.insert("", "end", iid=str(job.id), values=self._row(job))
+        self._refresh()
+
+    def _selected(self):
+        return [self.queue.jobs[int(iid)] for iid in self.tree.selection()
+                if int(iid) in self.queue.jobs]
+
+    def cancel_selected(self):
+        for job in self._selected():
+            self.queue.cancel(job.id)
+        self._refresh()
+
+    def retry_selected(self):
+        for job in self._selected():
+            if job.state in ("failed", "cancelled"):
+                self.queue.retry(job.id)
+                self.tree.move(str(job.id), "", "end")
+        self._refresh()
+
+    def clear_finished(self):
+        for job in list(self.queue.jobs.values()):
+            if job.state in ("done", "failed", "cancelled"):
+                self.queue.remove(job.id)
+                self.tree.delete(str(job.id))
+        self._refresh()
+
+    def open_selected(self):
+        for job in self._selected():
+            if job.state == "done":
+                _open_path(job.out)
+
+    # ── Polling ──────────────────────────────────────────────────────────────
+    def _row(self, job):
+        mode  = next(m for m in MODES if m["key"] == job.key)
+        state = self.STATES[job.state]
+        if job.state == "done" and job.result and job.result["cached"]:
+            state = "Done (cache)"
+        progress = ""
+        if job.state == "running":
+            progress = f"{job.done * 100 // job.total}%" if job.total else "Starting…"
+        elif job.state == "done":
+            progress = "100%"
+        return (os.path.basename(job.src), mode["label"], state, progress,
+                f"{job.seconds:.1f}s" if job.started else "")
+
+    def _refresh(self):
+        for job in self.queue.jobs.values():
+            self.tree.item(str(job.id), values=self._row(job))
+        failed = [job for job in self._selected() if job.error]
+        if failed:  # a selected failure shows its error instead of the counts
+            self.info_var.set(f"{os.path.basename(failed[0].src)}: {failed[0].error}")
+            return
+        states = [job.state for job in self.queue.jobs.values()]
+        if states:
+            self.info_var.set(" · ".join(f"{states.count(state)} {label.lower()}"
+                                         for state, label in self.STATES.items()
+                                         if state in states))
+
+    def _poll(self):
+        self.queue.poll()
+        self._refresh()
+        self._after = self.top.after(PROGRESS_POLL_MS * 2, self._poll)
+
+    def close(self):
+        self.top.after_cancel(self._after)
+        self.queue.shutdown()
+        self.app.queue_win = None
+        self.top.destroy()
+
+
 # ── Run ───────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1:
+        from convertly.cli import run_cli
+        sys.exit(run_cli(sys.argv[1:]))
+
     try:
         from ctypes import windll
         windll.shcore.SetProcessDpiAwareness(1)
@@ -1124,4 +898,8 @@ if __name__ == "__main__":
 
     root = tk.Tk()
     app  = ConverterApp(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    if app.queue_win:
+        app.queue_win.queue.shutdown()
+    if app.pool:
+        app.pool.shutdown(cancel=True)
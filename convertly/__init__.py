@@ -0,0 +1,22 @@
+"""
+Convertly conversion core: PDF ↔ Word / Excel without Office.
+
+Importing the package is cheap. The PDF, Word, Excel and reportlab
+libraries are only imported when a conversion runs, and nothing here
+imports tkinter.
+"""
+from .cache import PageStore, ResultCache
+from .cli import run_cli
+from .excel_pdf import excel_to_pdf
+from .modes import MODES
+from .pdf_excel import pdf_to_excel
+from .pdf_word import pdf_to_word
+from .pool import WarmPool
+from .word_pdf import word_to_pdf
+
+__version__ = "2.0"
+
+__all__ = [
+    "pdf_to_word", "pdf_to_excel", "word_to_pdf", "excel_to_pdf",
+    "MODES", "ResultCache", "PageStore", "WarmPool", "run_cli",
+]
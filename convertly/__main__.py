@@ -0,0 +1,8 @@
+import multiprocessing
+import sys
+
+from .cli import run_cli
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(run_cli(prog="python -m convertly"))
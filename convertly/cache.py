@@ -0,0 +1,265 @@
+"""
+On-disk result cache and per-page store.
+"""
+import functools
+import json
+import logging
+import os
+import platform
+import sys
+
+from .modes import _mode_by_key
+
+log = logging.getLogger(__name__)
+
+
+CACHE_MAX_BYTES = 1024 * 1024 * 1024  # least recently used results go first
+CACHE_OPTIONS_IGNORED = {"workers", "page_store"}  # never change the output
+CACHE_SIZE_INDEX = "size"  # running total of the cache's bytes, in its root folder
+
+
+def _default_cache_dir():
+    if os.environ.get("CONVERTLY_CACHE_DIR"):
+        return os.environ["CONVERTLY_CACHE_DIR"]
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "Convertly", "cache")
+    if platform.system() == "Darwin":
+        return os.path.expanduser("~/Library/Caches/Convertly")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "convertly")
+
+
+@functools.lru_cache(maxsize=None)
+def _cache_salt(mode_key):
+    """
+    Everything besides the input that decides a mode's output: the code of
+    this package and its version, the versions of the libraries the mode
+    uses, the platform, and the engines the mode finds installed (Word and
+    LibreOffice for PDF → Word). A frozen build has neither sources nor library
+    metadata, so the executable's path, size and mtime stand in for them
+    and an upgraded Convertly.exe starts with fresh results.
+    """
+    import glob
+    import hashlib
+    from importlib import metadata
+    from . import __version__
+    h = hashlib.sha256(__version__.encode())
+    sources = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py")))
+    if not sources or getattr(sys, "frozen", False):
+        st = os.stat(sys.executable)
+        h.update(f"{sys.executable}|{st.st_size}|{st.st_mtime_ns}".encode())
+    for path in sources:
+        with open(path, "rb") as fh:
+            h.update(fh.read())
+    mode     = _mode_by_key(mode_key)
+    engines  = mode["engines"]() if "engines" in mode else None
+    versions = {}
+    for name in mode["libs"]:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    h.update(json.dumps([mode_key, platform.system(), engines, versions],
+                        sort_keys=True).encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of conversion results, addressed by a SHA-256 of the
+    input bytes, the mode, its output-affecting options and _cache_salt.
+    A repeat conversion becomes a file copy. Entries are evicted least
+    recently used first once the cache exceeds `max_bytes`; hits refresh
+    an entry's mtime. `hits` and `misses` count lookups in this process.
+
+    The cache's size is kept as a running total in CACHE_SIZE_INDEX, so a
+    store only walks the folder when the total passes `max_bytes`. The
+    total is an estimate: overwritten entries count twice and concurrent
+    writers may drop an update, and every walk sets it to the exact size.
+    """
+
+    def __init__(self, directory=None, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory or _default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits      = 0
+        self.misses    = 0
+
+    def key(self, mode_key, src, options=None):
+        import hashlib
+        h = hashlib.sha256(_cache_salt(mode_key).encode())
+        opts = {k: v for k, v in (options or {}).items()
+                if k not in CACHE_OPTIONS_IGNORED}
+        h.update(json.dumps(opts, sort_keys=True, default=str).encode())
+        with open(src, "rb") as fh:
+            for block in iter(functools.partial(fh.read, 1024 * 1024), b""):
+                h.update(block)
+        return h.hexdigest()
+
+    def _entry(self, key, out):
+        return os.path.join(self.directory, key + os.path.splitext(out)[1])
+
+    def fetch(self, key, out):
+        """Copies a cached result to `out`; returns False on a miss."""
+        import shutil
+        entry = self._entry(key, out)
+        try:
+            shutil.copyfile(entry, out)
+            os.utime(entry)
+        except OSError:
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def store(self, key, out):
+        import shutil
+        entry = self._entry(key, out)
+        tmp   = f"{entry}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            shutil.copyfile(out, tmp)
+            size = os.path.getsize(tmp)
+            os.replace(tmp, entry)
+        except OSError as e:
+            log.debug("Result cache store failed: %s", e)
+            try: os.remove(tmp)
+            except OSError: pass
+            return
+        self.grow(size)
+
+    def _size_index(self):
+        return os.path.join(self.directory, CACHE_SIZE_INDEX)
+
+    def _write_size(self, total):
+        tmp = f"{self._size_index()}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w") as fh:
+                fh.write(str(total))
+            os.replace(tmp, self._size_index())
+        except OSError as e:
+            log.debug("Result cache size index write failed: %s", e)
+
+    def grow(self, nbytes):
+        """
+        Adds `nbytes` of new entries (a result, or the pages a PageStore
+        wrote) to the running total, and evicts once it passes `max_bytes`
+        or there is no total yet.
+        """
+        try:
+            with open(self._size_index()) as fh:
+                total = int(fh.read()) + nbytes
+        except (OSError, ValueError):
+            total = None
+        if total is None or total > self.max_bytes:
+            self.evict()
+        else:
+            self._write_size(total)
+
+    def evict(self):
+        """Trims the cache, PageStore entries included, to `max_bytes`."""
+        entries = []
+        index   = self._size_index()
+        for folder, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(folder, name)
+                if path == index:
+                    continue
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._write_size(total)
+
+
+class PageStore:
+    """
+    Per-page results of the PDF modes, keyed by a hash of each page's
+    content stream and of the fonts, images and forms it draws. A PDF that
+    grew or was partly edited then only has its new or changed pages
+    converted again. Entries live under the result cache directory and
+    count towards its size cap. `reused` and `computed` count pages, and
+    `written` the bytes put() added that ResultCache.grow() has not yet
+    been told about.
+    """
+
+    def __init__(self, mode_key, directory=None):
+        self.mode_key  = mode_key
+        self.directory = os.path.join(directory or _default_cache_dir(),
+                                      "pages", mode_key)
+        self.reused    = 0
+        self.computed  = 0
+        self.written   = 0
+
+    def page_keys(self, pdf_path, indexes=None):
+        """Content keys for the pages at `indexes` (default: every page)."""
+        import hashlib, re
+        import fitz
+        salt = _cache_salt(self.mode_key).encode()
+        keys = []
+        with fitz.open(pdf_path) as doc:
+            for i in (range(len(doc)) if indexes is None else indexes):
+                page     = doc[i]
+                contents = page.read_contents()
+                # resource dictionaries are often shared by every page, so
+                # only count what this page's content stream names
+                used = set(re.findall(rb"/([^\s/\[\]()<>{}%]+)", contents))
+                h = hashlib.sha256(salt)
+                h.update(contents)
+                h.update(repr((tuple(page.mediabox), tuple(page.cropbox),
+                               page.rotation)).encode())
+                for font in page.get_fonts(full=True):
+                    if font[4].encode() in used:
+                        h.update(repr(font[1:6]).encode())  # not the xref numbers
+                forms = {x[0] for x in page.get_xobjects() if x[1].encode() in used}
+                xrefs = set(forms)
+                for img in page.get_images(full=True):
+                    if img[9] in forms or (img[9] == 0 and img[7].encode() in used):
+                        xrefs.add(img[0])
+                for xref in sorted(xrefs):
+                    h.update(doc.xref_stream_raw(xref) or b"")
+                keys.append(h.hexdigest())
+        return keys
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                value = json.load(fh)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp  = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(value, fh, separators=(",", ":"))
+                size = fh.tell()
+            os.replace(tmp, path)
+            self.written += size
+        except (OSError, TypeError, ValueError) as e:
+            log.debug("Page store write failed: %s", e)
+            try: os.remove(tmp)
+            except OSError: pass
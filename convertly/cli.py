@@ -0,0 +1,346 @@
+"""
+Batch conversion from the command line.
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+
+from .modes import MODES, _mode_by_key
+from .pdf_word import _parse_page_spec
+from .pool import WarmPool, _convert_job, _init_cli_worker, run_isolated
+
+
+def _collect_inputs(targets, mode, recursive=False):
+    """
+    Expands the CLI targets (files, glob patterns and directories) into an
+    ordered, de-duplicated list of source files accepted by `mode`.
+    """
+    exts = tuple(pat.lstrip("*").lower()
+                 for _, pat in mode["ft"])
+    found = []
+    for target in targets:
+        if os.path.isdir(target):
+            if recursive:
+                for dirpath, dirnames, filenames in os.walk(target):
+                    dirnames.sort()
+                    found += [os.path.join(dirpath, f) for f in sorted(filenames)
+                              if f.lower().endswith(exts)]
+            else:
+                found += [os.path.join(target, f) for f in sorted(os.listdir(target))
+                          if f.lower().endswith(exts)]
+        elif glob.has_magic(target):
+            found += [p for p in sorted(glob.glob(target, recursive=recursive))
+                      if os.path.isfile(p) and p.lower().endswith(exts)]
+        else:
+            found.append(target)
+
+    seen, result = set(), []
+    for path in found:
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            result.append(path)
+    return result
+
+
+def _output_path(src, mode, out_dir=None):
+    base = os.path.splitext(src)[0]
+    if out_dir:
+        base = os.path.join(out_dir, os.path.basename(base))
+    return base + mode["ext"]
+
+
+def _print_status(res):
+    name = os.path.basename(res["src"])
+    if res["ok"]:
+        status = "cache" if res["cached"] else "ok"
+        pages  = res.get("pages")
+        note   = (f"  ({pages['reused']} page(s) reused, {pages['computed']} converted)"
+                  if pages and not res["cached"] else "")
+        print(f"  {status:<5} {res['seconds']:7.2f}s  {name} → "
+              f"{os.path.basename(res['out'])}{note}", flush=True)
+    else:
+        print(f"  FAIL  {res['seconds']:7.2f}s  {name}: {res['error']}", flush=True)
+
+
+def _print_timings(results):
+    """Per-phase totals over every converted file, in the order phases ran."""
+    totals, files, engines = {}, {}, {}
+    for res in results:
+        timings = res.get("timings") or {}
+        for name, sec in timings.get("phases", {}).items():
+            totals[name] = totals.get(name, 0.0) + sec
+            files[name]  = files.get(name, 0) + 1
+        if timings.get("engine"):
+            engines[timings["engine"]] = engines.get(timings["engine"], 0) + 1
+    if not totals:
+        return
+    job_total = sum(r["seconds"] for r in results) or 1.0
+    print(f"\n{'phase':<24}{'files':>6}{'total s':>10}{'mean s':>9}{'share':>7}")
+    for name, sec in totals.items():
+        depth = name.count(".")
+        label = "  " * depth + name.rsplit(".", 1)[-1]
+        print(f"{label:<24}{files[name]:>6}{sec:>10.2f}{sec / files[name]:>9.3f}"
+              f"{sec / job_total:>7.0%}")
+    other = job_total - sum(sec for name, sec in totals.items() if "." not in name)
+    print(f"{'(imports, other)':<24}{'':>6}{max(other, 0.0):>10.2f}{'':>9}"
+          f"{max(other, 0.0) / job_total:>7.0%}")
+    if engines:
+        print("Engine: " + ", ".join(f"{name} ×{n}" for name, n in engines.items()))
+
+
+def _write_timings(path, mode_key, results):
+    """One JSON line per file: its status, total seconds and phase timings."""
+    with open(path, "a", encoding="utf-8") as fh:
+        for res in results:
+            fh.write(json.dumps({
+                "mode": mode_key, "src": res["src"], "ok": res["ok"],
+                "cached": res["cached"], "seconds": round(res["seconds"], 6),
+                **(res.get("timings") or {"phases": {}}),
+            }) + "\n")
+
+
+def _serve(parser, args):
+    from .server import run_server
+    for name in ("jobs", "max_queued", "timeout", "max_upload", "keep"):
+        if getattr(args, name) <= 0:
+            parser.error(f"--{name.replace('_', '-')} must be positive")
+    if args.memory_limit is not None and args.memory_limit <= 0:
+        parser.error("--memory-limit must be positive")
+    log_level = logging.DEBUG if args.verbose else logging.WARNING
+    _init_cli_worker(log_level)
+    return run_server(args.host, args.port, workers=args.jobs,
+                      max_queued=args.max_queued, timeout=args.timeout,
+                      memory_mb=args.memory_limit, max_upload_mb=args.max_upload,
+                      use_cache=not args.no_cache, work_dir=args.work_dir,
+                      keep=args.keep, log_level=log_level)
+
+
+def run_cli(argv=None, prog="converter.py"):
+    """
+    Headless entry point:
+
+        python converter.py convert --mode pdf-excel --jobs 8 reports/ *.pdf
+        python -m convertly convert --mode pdf-excel --jobs 8 reports/ *.pdf
+        python -m convertly serve --port 8750
+
+    Each file is converted in its own worker process so throughput scales
+    with the number of cores. Exit codes: 0 all files converted, 1 one or
+    more files failed, 2 no usable input, 130 interrupted.
+    """
+    from concurrent.futures import as_completed
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Convertly — convert files without opening the window.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    conv = sub.add_parser("convert", help="convert files in batch")
+    conv.add_argument("--mode", required=True,
+                      choices=[m["key"] for m in MODES],
+                      help="conversion to run")
+    conv.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                      help="worker processes (default: number of CPUs)")
+    conv.add_argument("-o", "--out-dir",
+                      help="write outputs here instead of next to each input")
+    conv.add_argument("-r", "--recursive", action="store_true",
+                      help="descend into sub-directories and ** globs")
+    conv.add_argument("--page-workers", type=int, metavar="N",
+                      help="pdf-excel/pdf-word: process the pages of each "
+                           "large PDF in N processes")
+    conv.add_argument("--pages", metavar="SPEC",
+                      help='pdf-word: convert only these pages, e.g. "10-20" '
+                           'or "1,3,5-7"')
+    conv.add_argument("--backend", choices=("auto", "pdfplumber", "pymupdf"),
+                      default="auto",
+                      help="pdf-excel: table extractor; auto picks PyMuPDF "
+                           "unless the pages hold dense ruled tables")
+    conv.add_argument("--no-cache", action="store_true",
+                      help="always convert, neither reading nor filling the "
+                           "result cache")
+    conv.add_argument("--incremental", action="store_true",
+                      help="pdf-excel/pdf-word: keep per-page results and only "
+                           "convert pages that changed since the last run")
+    conv.add_argument("-v", "--verbose", action="store_true",
+                      help="print converter debug statistics")
+    conv.add_argument("--report", metavar="JSON",
+                      help="also write the per-file results to a JSON file")
+    conv.add_argument("--timings", action="store_true",
+                      help="print how long each conversion phase took")
+    conv.add_argument("--timings-file", metavar="JSONL",
+                      help="also append one JSON line of phase timings per "
+                           "file to JSONL (implies --timings)")
+    conv.add_argument("--timeout", type=float, metavar="SECONDS",
+                      help="give up on a file after this long; it runs in its own "
+                           "process, which is killed")
+    conv.add_argument("--memory-limit", type=int, metavar="MB",
+                      help="cap each conversion's address space (POSIX); a file "
+                           "that needs more fails instead of exhausting memory")
+    conv.add_argument("--profile", metavar="DIR",
+                      help="run each conversion under cProfile and write its "
+                           "stats to DIR/<output name>.prof")
+    conv.add_argument("paths", nargs="+",
+                      help="input files, directories or glob patterns")
+
+    srv = sub.add_parser("serve", help="run a local HTTP conversion service")
+    srv.add_argument("--host", default="127.0.0.1",
+                     help="address to listen on (default: 127.0.0.1)")
+    srv.add_argument("--port", type=int, default=8750,
+                     help="port to listen on, 0 for any free one (default: 8750)")
+    srv.add_argument("-j", "--jobs", type=int,
+                     default=max(1, (os.cpu_count() or 2) - 1),
+                     help="conversions run at once (default: CPUs minus one)")
+    srv.add_argument("--max-queued", type=int, default=32, metavar="N",
+                     help="jobs allowed to wait for a worker; more get 429 (default: 32)")
+    srv.add_argument("--timeout", type=float, default=300.0, metavar="SECONDS",
+                     help="longest a conversion may run, and the most a request "
+                          "may ask for (default: 300)")
+    srv.add_argument("--memory-limit", type=int, metavar="MB",
+                     help="cap each conversion's address space (POSIX)")
+    srv.add_argument("--max-upload", type=int, default=200, metavar="MB",
+                     help="largest accepted upload (default: 200)")
+    srv.add_argument("--keep", type=float, default=3600.0, metavar="SECONDS",
+                     help="drop finished jobs and their files after this long "
+                          "(default: 3600)")
+    srv.add_argument("--work-dir",
+                     help="keep uploads and results here (default: a temporary folder)")
+    srv.add_argument("--no-cache", action="store_true",
+                     help="neither read nor fill the result cache")
+    srv.add_argument("-v", "--verbose", action="store_true",
+                     help="print converter debug statistics")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        return _serve(parser, args)
+
+    log_level = logging.DEBUG if args.verbose else logging.WARNING
+    _init_cli_worker(log_level)
+
+    mode    = _mode_by_key(args.mode)
+    options = {}
+    if args.page_workers:
+        if mode["key"] not in ("pdf-excel", "pdf-word"):
+            parser.error("--page-workers only applies to --mode pdf-excel and pdf-word")
+        options["workers"] = args.page_workers
+    if args.pages:
+        if mode["key"] != "pdf-word":
+            parser.error("--pages only applies to --mode pdf-word")
+        try:
+            _parse_page_spec(args.pages)
+        except ValueError as e:
+            parser.error(f"--pages: {e}")
+        options["pages"] = args.pages
+    if args.backend != "auto":
+        if mode["key"] != "pdf-excel":
+            parser.error("--backend only applies to --mode pdf-excel")
+        options["backend"] = args.backend
+
+    if args.incremental:
+        if mode["key"] not in ("pdf-excel", "pdf-word"):
+            parser.error("--incremental only applies to --mode pdf-excel and pdf-word")
+        if args.no_cache:
+            parser.error("--incremental keeps its pages in the cache; drop --no-cache")
+
+    if args.timings_file:
+        input_exts = {pat.lstrip("*").lower() for m in MODES for _, pat in m["ft"]}
+        if os.path.splitext(args.timings_file)[1].lower() in input_exts:
+            parser.error(f"--timings-file {args.timings_file} looks like an input "
+                         "file; give it a .jsonl name")
+        args.timings = True
+
+    if args.timeout is not None and args.timeout <= 0:
+        parser.error("--timeout must be positive")
+    if args.memory_limit is not None and args.memory_limit <= 0:
+        parser.error("--memory-limit must be positive")
+    limits = {"timeout": args.timeout, "memory_mb": args.memory_limit}
+
+    inputs = _collect_inputs(args.paths, mode, args.recursive)
+    if not inputs:
+        print("No matching input files.", file=sys.stderr)
+        return 2
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    jobs = max(1, min(args.jobs, len(inputs)))
+    print(f"Converting {len(inputs)} file(s) — {mode['label']}, {jobs} job(s)",
+          flush=True)
+
+    results = []
+    started = time.perf_counter()
+    try:
+        if jobs == 1:
+            for src in inputs:
+                out = _output_path(src, mode, args.out_dir)
+                if args.timeout or args.memory_limit:
+                    res = run_isolated(mode["key"], src, out, options, not args.no_cache,
+                                       args.incremental, profile_dir=args.profile,
+                                       **limits)
+                else:
+                    res = _convert_job(mode["key"], src, out, options, not args.no_cache,
+                                       args.incremental, profile_dir=args.profile)
+                _print_status(res)
+                results.append(res)
+        else:
+            pool = WarmPool(jobs, [mode["key"]], log_level)
+            try:
+                futures = {
+                    pool.submit(mode["key"], src,
+                                _output_path(src, mode, args.out_dir), options,
+                                not args.no_cache, args.incremental,
+                                profile_dir=args.profile, **limits): src
+                    for src in inputs
+                }
+                for fut in as_completed(futures):
+                    try:
+                        res = fut.result()
+                    except Exception as e:  # worker died (e.g. out of memory)
+                        src = futures[fut]
+                        res = {"src": src, "out": _output_path(src, mode, args.out_dir),
+                               "ok": False, "cached": False, "pages": None,
+                               "error": f"{type(e).__name__}: {e}",
+                               "seconds": 0.0, "timings": None, "profile": None}
+                    _print_status(res)
+                    results.append(res)
+            except KeyboardInterrupt:
+                pool.shutdown(cancel=True)
+                raise
+            pool.shutdown()
+    except KeyboardInterrupt:
+        print("Interrupted.", file=sys.stderr)
+        return 130
+
+    elapsed = time.perf_counter() - started
+    failed  = [r for r in results if not r["ok"]]
+    hits    = sum(r["cached"] for r in results)
+    misses  = 0 if args.no_cache else len(results) - len(failed) - hits
+    print(f"\n{len(results) - len(failed)} converted, {len(failed)} failed "
+          f"in {elapsed:.1f}s")
+    if not args.no_cache:
+        print(f"Result cache: {hits} hit(s), {misses} miss(es)")
+    if args.incremental:
+        reused   = sum(r["pages"]["reused"] for r in results if r["pages"])
+        computed = sum(r["pages"]["computed"] for r in results if r["pages"])
+        print(f"Pages: {reused} reused, {computed} converted")
+    if args.timings:
+        _print_timings(results)
+        if args.timings_file:
+            _write_timings(args.timings_file, mode["key"], results)
+    if args.profile:
+        print(f"Profiles written to {args.profile} "
+              f"(inspect with: python -m pstats <file>.prof)")
+
+    if args.report:
+        order = {os.path.abspath(p): i for i, p in enumerate(inputs)}
+        results.sort(key=lambda r: order[os.path.abspath(r["src"])])
+        with open(args.report, "w", encoding="utf-8") as fh:
+            json.dump({"mode": mode["key"], "jobs": jobs,
+                       "seconds": round(elapsed, 3),
+                       "converted": len(results) - len(failed),
+                       "failed": len(failed),
+                       "cache": {"hits": hits, "misses": misses},
+                       "files": results}, fh, indent=2)
+
+    return 1 if failed else 0
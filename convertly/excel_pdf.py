@@ -0,0 +1,508 @@
+"""
+Excel → PDF: one landscape table per worksheet via reportlab.
+"""
+import itertools
+import logging
+import os
+
+from . import layout
+from .layout import _coalesce_cell_commands, _long_table_type, _sample_styles
+from .progress import Progress
+from .timing import span
+
+log = logging.getLogger(__name__)
+
+EXCEL_STREAMING_BYTES = 5 * 1024 * 1024  # auto-switch to the read-only reader
+EXCEL_PEEK_ROWS       = 500  # rows read ahead to pick default header styling
+
+
+EXCEL_ALIGN = {
+    'center':  'CENTER',
+    'right':   'RIGHT',
+    'left':    'LEFT',
+    'general': 'LEFT',
+}
+
+
+def _excel_styles(fill, font, alignment):
+    """(command, value) pairs for a background colour, bold font and alignment."""
+    from reportlab.lib import colors
+    styles = []
+
+    # Cell background color
+    try:
+        if fill and fill.fill_type not in (None, 'none'):
+            fg = fill.fgColor
+            if fg and fg.type == 'rgb' and fg.rgb:
+                rgb = fg.rgb[-6:]  # strip alpha channel
+                if rgb.upper() not in ('FFFFFF', '000000', '000000'):
+                    styles.append(("BACKGROUND", colors.HexColor(f"#{rgb}")))
+    except Exception:
+        pass
+
+    # Font bold
+    try:
+        if font and font.bold:
+            styles.append(("FONTNAME", "Helvetica-Bold"))
+    except Exception:
+        pass
+
+    # Cell text alignment
+    try:
+        if alignment and alignment.horizontal:
+            al = EXCEL_ALIGN.get(alignment.horizontal)
+            if al:
+                styles.append(("ALIGN", al))
+    except Exception:
+        pass
+
+    return tuple(styles)
+
+
+class _ExcelStyleResolver:
+    """
+    Maps cells to their _excel_styles pairs, working each out once per
+    workbook. A cell's pairs depend only on its font, fill and alignment,
+    which openpyxl stores as indexes into the workbook's style tables, and
+    a sheet uses a few dozen combinations at most; going through the
+    cell.fill / cell.font / cell.alignment proxies for every cell is what
+    made styling dominate the extract phase of large sheets.
+
+    Regular cells are keyed by their (fontId, fillId, alignmentId); cells
+    from a read-only workbook by their index into wb._cell_styles.
+    """
+
+    def __init__(self, wb):
+        self._wb        = wb
+        self._read_only = wb.read_only
+        self._resolved  = {}
+
+    def __call__(self, cell):
+        if self._read_only:
+            key = getattr(cell, "_style_id", None)  # None: an EmptyCell, unstyled
+        else:
+            style = cell._style  # None until a style is set: the default, all zero
+            key   = (style[0], style[1], style[5]) if style is not None else (0, 0, 0)
+        styles = self._resolved.get(key)
+        if styles is None:
+            styles = self._resolved[key] = self._resolve(key)
+        return styles
+
+    def _resolve(self, key):
+        wb = self._wb
+        if key is None:
+            return ()
+        if self._read_only:
+            style = wb._cell_styles[key]
+            key   = (style.fontId, style.fillId, style.alignmentId)
+        font_id, fill_id, alignment_id = key
+        return _excel_styles(wb._fills[fill_id], wb._fonts[font_id],
+                             wb._alignments[alignment_id])
+
+
+def _excel_base_commands():
+    from reportlab.lib import colors
+    return [
+        ("FONTSIZE",       (0, 0), (-1, -1), 8),
+        ("ALIGN",          (0, 0), (-1, -1), "LEFT"),
+        ("VALIGN",         (0, 0), (-1, -1), "MIDDLE"),
+        ("TOPPADDING",     (0, 0), (-1, -1), 3),
+        ("BOTTOMPADDING",  (0, 0), (-1, -1), 3),
+        ("LEFTPADDING",    (0, 0), (-1, -1), 4),
+        ("GRID",           (0, 0), (-1, -1), 0.3, colors.HexColor("#CCCCCC")),
+    ]
+
+
+def _print_area(ws):
+    """Bounds (min_col, min_row, max_col, max_row) around the sheet's print area, or None."""
+    area   = getattr(ws, "_print_area", None)  # set for read-only sheets too
+    ranges = list(area.ranges) if area else []
+    if not ranges:
+        return None
+    return (min(r.min_col for r in ranges), min(r.min_row for r in ranges),
+            max(r.max_col for r in ranges), max(r.max_row for r in ranges))
+
+
+def _sheet_layout(ws, used, merges, hidden_rows, hidden_cols, declared):
+    """
+    Works out which part of a sheet excel_to_pdf lays out, given `used`,
+    the (max_row, max_col) of the cells holding a value, or None when
+    there are none. The range runs from A1 to there, grown to cover the
+    merges anchored inside it and cut to the print area if there is one;
+    hidden rows and columns are left out. Formatting alone does not count
+    as use: one styled cell at XFD1048576 would otherwise make a few
+    lines of data into a grid of 17 billion cells.
+
+    Returns None when nothing is left to show, otherwise a dict of the
+    "bounds" (1-based min_col, min_row, max_col, max_row), the
+    "hidden_rows" and "hidden_cols" inside them, the visible "rows" and
+    "cols" counts, and the `merges` clipped and renumbered to the visible
+    grid. Anything dropped is logged as a warning, measured against
+    `declared`, the (max_row, max_col) openpyxl reports for the sheet.
+    """
+    from bisect import bisect_left, bisect_right
+    from openpyxl.utils import get_column_letter
+
+    if used is None:
+        return None
+    max_row, max_col = used
+    grown = True
+    while grown:
+        grown = False
+        for c1, r1, c2, r2 in merges:
+            if r1 <= max_row and c1 <= max_col and (r2 > max_row or c2 > max_col):
+                max_row, max_col, grown = max(max_row, r2), max(max_col, c2), True
+    bounds = (1, 1, max_col, max_row)
+    area   = _print_area(ws)
+    if area:
+        bounds = (max(1, area[0]), max(1, area[1]),
+                  min(max_col, area[2]), min(max_row, area[3]))
+        if bounds[0] > bounds[2] or bounds[1] > bounds[3]:
+            log.warning("Sheet %r: its print area holds no data; skipped", ws.title)
+            return None
+    min_col, min_row, max_col, max_row = bounds
+
+    hidden_rows = {r for r in hidden_rows if min_row <= r <= max_row}
+    hidden_cols = {c for c in hidden_cols if min_col <= c <= max_col}
+    rows = [r for r in range(min_row, max_row + 1) if r not in hidden_rows]
+    cols = [c for c in range(min_col, max_col + 1) if c not in hidden_cols]
+    if not rows or not cols:
+        log.warning("Sheet %r: every row or column with data is hidden; skipped", ws.title)
+        return None
+
+    visible = []
+    for c1, r1, c2, r2 in merges:
+        # first and last visible row/column of the merge, as 1-based positions
+        rc1, rc2 = bisect_left(rows, r1), bisect_right(rows, r2) - 1
+        cc1, cc2 = bisect_left(cols, c1), bisect_right(cols, c2) - 1
+        if rc1 <= rc2 and cc1 <= cc2 and (rc1, cc1) != (rc2, cc2):
+            visible.append((cc1 + 1, rc1 + 1, cc2 + 1, rc2 + 1))
+
+    dropped = []
+    declared_rows, declared_cols = declared
+    if area:
+        dropped.append(f"everything outside the print area "
+                       f"{get_column_letter(min_col)}{min_row}:"
+                       f"{get_column_letter(max_col)}{max_row}")
+    elif (declared_rows or 0) > max_row or (declared_cols or 0) > max_col:
+        dropped.append(f"{(declared_rows or 0) - max_row} empty row(s) and "
+                       f"{(declared_cols or 0) - max_col} empty column(s) at the end")
+    if hidden_rows or hidden_cols:
+        dropped.append(f"{len(hidden_rows)} hidden row(s) and "
+                       f"{len(hidden_cols)} hidden column(s)")
+    if dropped:
+        log.warning("Sheet %r: converting %d row(s) x %d column(s); left out %s",
+                    ws.title, len(rows), len(cols), " and ".join(dropped))
+
+    return {"bounds": bounds, "hidden_rows": hidden_rows, "hidden_cols": hidden_cols,
+            "rows": len(rows), "cols": len(cols), "merges": visible}
+
+
+def _worksheet_layout(ws):
+    """_sheet_layout of a regular (not read-only) worksheet."""
+    used = None
+    for (r, c), cell in ws._cells.items():
+        if cell.value is not None and cell.value != "":
+            used = (max(r, used[0]), max(c, used[1])) if used else (r, c)
+    merges = [(m.min_col, m.min_row, m.max_col, m.max_row)
+              for m in ws.merged_cells.ranges]
+    hidden_rows = {r for r, dim in ws.row_dimensions.items() if dim.hidden}
+    hidden_cols = set()
+    for dim in ws.column_dimensions.values():
+        if dim.hidden and dim.min:
+            hidden_cols.update(range(dim.min, (dim.max or dim.min) + 1))
+    return _sheet_layout(ws, used, merges, hidden_rows, hidden_cols,
+                         (ws.max_row, ws.max_column))
+
+
+def _xml_cell_has_value(cell):
+    """Whether a sheet XML <c> element holds a value (a cached formula result counts)."""
+    for child in cell:
+        if child.tag.rsplit('}', 1)[-1] in ("v", "is") and "".join(child.itertext()):
+            return True
+    return False
+
+
+def _read_only_layout(wb, ws):
+    """
+    _sheet_layout of a read-only worksheet. openpyxl does not expose merged
+    ranges, hidden rows and columns or the extent of the values in that
+    mode, so they are read straight from the sheet XML in one pass, with
+    each row discarded as soon as it has been looked at.
+    """
+    import xml.etree.ElementTree as ET
+    from openpyxl.utils.cell import column_index_from_string, range_boundaries
+    used, merges, hidden_rows, hidden_cols = None, [], set(), set()
+    row = 0
+    with wb._archive.open(ws._worksheet_path) as fh:
+        for _, elem in ET.iterparse(fh):
+            tag = elem.tag.rsplit('}', 1)[-1]
+            if tag == "row":
+                row = int(elem.get("r") or row + 1)
+                if elem.get("hidden") in ("1", "true"):
+                    hidden_rows.add(row)
+                cells = list(elem)
+                # cells come in column order: only the last one with a value matters
+                for pos in range(len(cells) - 1, -1, -1):
+                    if _xml_cell_has_value(cells[pos]):
+                        ref = cells[pos].get("r")
+                        col = (column_index_from_string(ref.rstrip("0123456789"))
+                               if ref else pos + 1)
+                        used = (row, max(col, used[1])) if used else (row, col)
+                        break
+                elem.clear()
+            elif tag == "col" and elem.get("hidden") in ("1", "true"):
+                hidden_cols.update(range(int(elem.get("min")), int(elem.get("max")) + 1))
+            elif tag == "mergeCell" and elem.get("ref"):
+                try:
+                    merges.append(range_boundaries(elem.get("ref")))
+                except ValueError:
+                    pass
+    return _sheet_layout(ws, used, merges, hidden_rows, hidden_cols,
+                         (ws.max_row, ws.max_column))
+
+
+def _visible_rows(rows, sheet):
+    """
+    The rows of iter_rows() over a _sheet_layout's bounds, with its hidden
+    rows skipped and its hidden columns' cells taken out.
+    """
+    min_col, min_row, max_col, _ = sheet["bounds"]
+    keep = None
+    if sheet["hidden_cols"]:
+        keep = [i for i in range(max_col - min_col + 1)
+                if min_col + i not in sheet["hidden_cols"]]
+    for r, row in enumerate(rows, min_row):
+        if r in sheet["hidden_rows"]:
+            continue
+        yield row if keep is None else [row[i] for i in keep]
+
+
+def _excel_stream_table(ws, sheet, page_w, stop_event=None, tracker=None, resolve=None):
+    """
+    Read-only counterpart of the per-sheet table in excel_to_pdf: returns a
+    long-table flowable that pulls the rows of `sheet` (ws's _sheet_layout)
+    lazily. Whether any cell carries its own background (and so whether
+    the default header colours apply) is decided from the first
+    EXCEL_PEEK_ROWS rows. Rows are counted on `tracker` (a Progress) as
+    they are read, which in this mode is while the PDF is built.
+    """
+    resolve  = resolve or _ExcelStyleResolver(ws.parent)
+    num_cols = sheet["cols"]
+    min_col, min_row, max_col, max_row = sheet["bounds"]
+
+    def sheet_rows():
+        rows = ws.iter_rows(min_row=min_row, max_row=max_row,
+                            min_col=min_col, max_col=max_col)
+        for row in _visible_rows(rows, sheet):
+            if stop_event and stop_event.is_set():
+                raise InterruptedError("Cancelled by user.")
+            cells, cmds = [], []
+            for c_idx, cell in enumerate(row):
+                cells.append(str(cell.value) if cell.value is not None else "")
+                for op, val in resolve(cell):
+                    cmds.append((op, c_idx, c_idx, val))
+            cells += [""] * (num_cols - len(cells))
+            if tracker:
+                tracker.advance()
+            yield cells, cmds
+
+    rows = sheet_rows()
+    peeked, has_data, has_any_bg = [], False, False
+    for row in rows:
+        peeked.append(row)
+        has_data   = has_data or any(row[0])
+        has_any_bg = has_any_bg or any(cmd[0] == "BACKGROUND" for cmd in row[1])
+        if has_data and len(peeked) >= EXCEL_PEEK_ROWS:
+            break
+    if not has_data:
+        return None
+
+    return _excel_long_table(itertools.chain(peeked, rows), sheet["merges"],
+                             num_cols, page_w, has_any_bg)
+
+
+def _counted(rows, tracker):
+    """Passes `rows` through, advancing `tracker` as each one is laid out."""
+    for row in rows:
+        tracker.advance()
+        yield row
+
+
+def _excel_long_table(rows, merges, num_cols, page_w, has_any_bg):
+    """
+    Wraps a sheet's rows — (cells, commands) pairs starting with the header
+    row — in a long-table flowable. `merges` are openpyxl's 1-based
+    (min_col, min_row, max_col, max_row) bounds; the default header colours
+    apply when no cell has its own background, as in excel_to_pdf.
+    """
+    from reportlab.lib import colors
+
+    rows = iter(rows)
+    header_cells, header_cmds = next(rows)
+    header_cmds = list(header_cmds)
+    spans = []
+    for min_col, min_row, max_col, max_row in merges:
+        c1, r1, c2, r2 = min_col - 1, min_row - 1, max_col - 1, max_row - 1
+        if r1 == 0:
+            header_cmds.append(("SPAN", c1, c2))
+            r1 = 1
+        if r2 >= r1:
+            spans.append((c1, r1 - 1, c2, r2 - 1))
+
+    zebra = None
+    if not has_any_bg:
+        header_cmds += [
+            ("BACKGROUND", 0, -1, colors.HexColor("#4361EE")),
+            ("TEXTCOLOR",  0, -1, colors.white),
+            ("FONTNAME",   0, -1, "Helvetica-Bold"),
+        ]
+        zebra = [colors.white, colors.HexColor("#F5F7FF")]
+
+    return _long_table_type()(
+        rows,
+        [page_w / max(num_cols, 1)] * num_cols,
+        style=_excel_base_commands(),
+        header=(header_cells, header_cmds),
+        spans=spans, zebra=zebra)
+
+
+def excel_to_pdf(xlsx_path, out_path, stop_event=None, streaming=None, progress=None):
+    """
+    Uses openpyxl + reportlab to convert Excel → PDF.
+    Preserves: cell background colors, font bold, cell alignment,
+    and merged cell spans from the original spreadsheet.
+
+    `streaming` opens the workbook in openpyxl's read-only mode and lays
+    each sheet out a page of rows at a time, so memory stays proportional
+    to one page rather than the whole sheet. None enables it for files of
+    EXCEL_STREAMING_BYTES or more.
+
+    Each sheet is cut to the range that holds data (see _sheet_layout):
+    trailing empty rows and columns, however formatted, and hidden rows
+    and columns are left out, and a print area is honoured.
+
+    `progress` is called as progress(rows_done, total_rows), counting the
+    rows laid out across every sheet.
+    """
+    import openpyxl
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.units import cm
+
+    if streaming is None:
+        streaming = os.path.getsize(xlsx_path) >= EXCEL_STREAMING_BYTES
+
+    with span("load"):
+        wb = openpyxl.load_workbook(xlsx_path, data_only=True, read_only=streaming)
+    story = []
+    styles = _sample_styles()
+    page_w = landscape(A4)[0] - 2 * cm
+
+    with span("range"):
+        sheets = {name: _read_only_layout(wb, wb[name]) if streaming
+                  else _worksheet_layout(wb[name]) for name in wb.sheetnames}
+    tracker = Progress(progress, sum(sheet["rows"] for sheet in sheets.values() if sheet))
+    resolve = _ExcelStyleResolver(wb)
+
+    for sheet_name in wb.sheetnames:
+        if stop_event and stop_event.is_set():
+            raise InterruptedError("Cancelled by user.")
+
+        ws    = wb[sheet_name]
+        sheet = sheets[sheet_name]
+
+        story.append(Paragraph(f"<b>{sheet_name}</b>", styles["Heading2"]))
+        story.append(Spacer(1, 0.3 * cm))
+
+        if sheet is None:
+            continue
+        if streaming:
+            with span("extract"):
+                tbl = _excel_stream_table(ws, sheet, page_w, stop_event, tracker, resolve)
+            if tbl is not None:
+                story.append(tbl)
+                story.append(Spacer(1, 0.5 * cm))
+            continue
+
+        with span("extract"):
+            min_col, min_row, max_col, max_row = sheet["bounds"]
+            rows = _visible_rows(ws.iter_rows(min_row=min_row, max_row=max_row,
+                                              min_col=min_col, max_col=max_col), sheet)
+            num_cols = sheet["cols"]
+
+            # Base table commands
+            ts = _excel_base_commands()
+
+            data        = []
+            cell_cmds   = []
+            has_any_bg  = False
+
+            for r_idx, row in enumerate(rows):
+                row_data = []
+                for c_idx, cell in enumerate(row):
+                    val = str(cell.value) if cell.value is not None else ""
+                    row_data.append(val)
+
+                    for op, arg in resolve(cell):
+                        cell_cmds.append((op, c_idx, c_idx, r_idx, arg))
+                        has_any_bg = has_any_bg or op == "BACKGROUND"
+
+                data.append(row_data)
+
+        if not any(any(c for c in r) for r in data):
+            continue
+
+        # Pad rows
+        data = [r + [""] * (num_cols - len(r)) for r in data]
+
+        # Long sheets are laid out a page at a time: reportlab re-splits one
+        # giant Table on every page, which gets superlinearly slower.
+        if len(data) > layout.LONG_TABLE_ROWS:
+            with span("styles"):
+                row_cmds = [[] for _ in data]
+                for op, c1, c2, r_idx, arg in cell_cmds:
+                    row_cmds[r_idx].append((op, c1, c2, arg))
+            story.append(_excel_long_table(_counted(zip(data, row_cmds), tracker),
+                                           sheet["merges"], num_cols, page_w, has_any_bg))
+            story.append(Spacer(1, 0.5 * cm))
+            continue
+
+        with span("styles"):
+            ts += _coalesce_cell_commands(cell_cmds)
+
+            # Merged cell spans
+            for c1, r1, c2, r2 in sheet["merges"]:
+                ts.append(("SPAN", (c1 - 1, r1 - 1), (c2 - 1, r2 - 1)))
+
+            # Fall back to default header styling only when no cell has a custom color
+            if not has_any_bg:
+                ts += [
+                    ("BACKGROUND",     (0, 0), (-1, 0), colors.HexColor("#4361EE")),
+                    ("TEXTCOLOR",      (0, 0), (-1, 0), colors.white),
+                    ("FONTNAME",       (0, 0), (-1, 0), "Helvetica-Bold"),
+                    ("ROWBACKGROUNDS", (0, 1), (-1, -1),
+                     [colors.white, colors.HexColor("#F5F7FF")]),
+                ]
+
+            # Build table
+            col_w   = page_w / max(num_cols, 1)
+
+            tbl = Table(data, colWidths=[col_w] * num_cols, repeatRows=1)
+            tbl.setStyle(TableStyle(ts))
+        story.append(tbl)
+        tracker.advance(len(data))
+        story.append(Spacer(1, 0.5 * cm))
+
+    doc = SimpleDocTemplate(
+        out_path,
+        pagesize=landscape(A4),
+        leftMargin=1*cm, rightMargin=1*cm,
+        topMargin=1*cm,  bottomMargin=1*cm,
+    )
+    with span("build"):
+        doc.build(story)
+    tracker.finish()
+    if streaming:
+        wb.close()
@@ -0,0 +1,242 @@
+"""
+A queue of conversion jobs run a bounded number at a time, with
+per-job progress, cancel and retry.
+"""
+import itertools
+import logging
+import os
+import time
+
+from .modes import _mode_by_key
+from .pool import WarmPool
+
+# Source extension → conversion; PDFs can go either way, see JobQueue.add
+EXT_MODES = {".pdf": "pdf-word", ".docx": "word-pdf", ".xlsx": "excel-pdf"}
+
+
+class QueueFull(Exception):
+    """Raised by JobQueue.add when `max_queued` jobs are already waiting."""
+
+
+class Job:
+    """
+    One conversion in a JobQueue. `state` is "queued", "running", "done",
+    "failed" or "cancelled"; `done`/`total` is the latest progress and
+    `result` the _convert_job status dict once the job has finished.
+    """
+
+    def __init__(self, job_id, key, src, out, options, timeout=None):
+        self.id       = job_id
+        self.key      = key
+        self.src      = src
+        self.out      = out
+        self.options  = options
+        self.timeout  = timeout
+        self.state    = "queued"
+        self.done     = 0
+        self.total    = None
+        self.result   = None
+        self.error    = None
+        self.attempts = 0
+        self.queued   = time.monotonic()
+        self.started  = None
+        self.finished = None
+
+    @property
+    def seconds(self):
+        """Run time so far (or in total, once finished)."""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    def as_dict(self):
+        return {"id": self.id, "mode": self.key, "src": self.src, "out": self.out,
+                "state": self.state, "done": self.done, "total": self.total,
+                "error": self.error, "seconds": round(self.seconds, 3),
+                "attempts": self.attempts}
+
+
+class JobQueue:
+    """
+    Runs queued conversions on `workers` single-worker WarmPools ("slots").
+    A running job is cancelled by killing its slot, which ends it at once
+    without touching the jobs in the other slots; the slot is then replaced.
+
+    The queue has no thread of its own: call poll() regularly (from the
+    GUI's event loop, say) to collect finished jobs and start queued ones.
+
+    With `incremental`, PDF → Excel jobs keep per-page results in the
+    PageStore. The store lives in the result cache, so it is off whenever
+    `use_cache` is.
+    """
+
+    def __init__(self, workers=None, max_queued=None, use_cache=True,
+                 log_level=logging.WARNING, job_options=None, incremental=True):
+        self.workers     = max(1, workers or os.cpu_count() or 1)
+        self.max_queued  = max_queued
+        self.use_cache   = use_cache
+        self.incremental = incremental and use_cache
+        self.log_level   = log_level
+        self.job_options = job_options or {}  # extra WarmPool.submit arguments
+        self.jobs        = {}                 # id → Job, in the order added
+        self._ids        = itertools.count(1)
+        self._slots      = [None] * self.workers  # WarmPool per slot, started on demand
+        self._running    = [None] * self.workers  # (Job, Future) per slot
+
+    # ── Queue operations ─────────────────────────────────────────────────────
+    def add(self, src, key=None, out=None, options=None, timeout=None):
+        """
+        Queues `src` and returns its Job. `key` defaults to the mode for the
+        file's extension (EXT_MODES) and `out` to the mode's usual output
+        name next to the source. A job still running `timeout` seconds after
+        it started is killed and fails with a TimeoutError.
+        """
+        if key is None:
+            key = EXT_MODES.get(os.path.splitext(src)[1].lower())
+            if key is None:
+                raise ValueError(f"No conversion for {os.path.basename(src)}")
+        mode = _mode_by_key(key)
+        if self.max_queued is not None and self.waiting() >= self.max_queued:
+            raise QueueFull(f"{self.max_queued} job(s) are already waiting")
+        out = out or os.path.splitext(src)[0] + mode["ext"]
+        job = Job(next(self._ids), key, src, out, dict(options or {}), timeout)
+        self.jobs[job.id] = job
+        self._warm()
+        return job
+
+    def cancel(self, job_id):
+        """Cancels a queued or running job; finished jobs are left alone."""
+        job = self.jobs[job_id]
+        if job.state == "queued":
+            self._finish(job, "cancelled")
+        elif job.state == "running":
+            slot = next(i for i, run in enumerate(self._running) if run and run[0] is job)
+            self._kill(slot)
+            self._finish(job, "cancelled")
+            self._warm()
+        return job
+
+    def retry(self, job_id):
+        """Puts a failed or cancelled job back at the end of the queue."""
+        job = self.jobs[job_id]
+        if job.state in ("failed", "cancelled"):
+            job.state, job.done, job.total = "queued", 0, None
+            job.result = job.error = job.started = job.finished = None
+            job.queued = time.monotonic()
+            # re-insert so FIFO order puts it last
+            del self.jobs[job.id]
+            self.jobs[job.id] = job
+        return job
+
+    def remove(self, job_id):
+        """Forgets a job that is not queued or running."""
+        if self.jobs[job_id].state not in ("queued", "running"):
+            del self.jobs[job_id]
+
+    def waiting(self):
+        return sum(job.state == "queued" for job in self.jobs.values())
+
+    def active(self):
+        return sum(run is not None for run in self._running)
+
+    # ── Scheduling ───────────────────────────────────────────────────────────
+    def poll(self):
+        """
+        Collects finished jobs, kills the ones past their timeout and starts
+        queued ones on free slots.
+        """
+        for slot, run in enumerate(self._running):
+            if run is None:
+                continue
+            job, fut = run
+            if not fut.done() and job.timeout and job.seconds > job.timeout:
+                self._kill(slot)
+                job.error = f"TimeoutError: no result after {job.timeout:g} s"
+                self._finish(job, "failed")
+                continue
+            if not fut.done():
+                continue
+            self._running[slot] = None
+            try:
+                res = fut.result()
+            except Exception as e:  # the worker died (e.g. out of memory)
+                self._slots[slot] = None
+                job.error = f"{type(e).__name__}: {e}"
+                self._finish(job, "failed")
+                continue
+            job.result = res
+            job.error  = res["error"]
+            self._finish(job, "done" if res["ok"] else "failed")
+
+        queued = (job for job in self.jobs.values() if job.state == "queued")
+        for slot in range(self.workers):
+            if self._running[slot] is not None:
+                continue
+            job = next(queued, None)
+            if job is None:
+                break
+            self._start(slot, job)
+
+    def _start(self, slot, job):
+        if self._slots[slot] is None:
+            self._slots[slot] = WarmPool(1, log_level=self.log_level)
+
+        def progress(done, total, job=job):  # runs on the slot's relay thread
+            job.done, job.total = done, total
+
+        job.state    = "running"
+        job.attempts += 1
+        job.started  = time.monotonic()
+        fut = self._slots[slot].submit(job.key, job.src, job.out, job.options,
+                                       use_cache=self.use_cache,
+                                       incremental=self.incremental and job.key == "pdf-excel",
+                                       progress=progress, **self.job_options)
+        self._running[slot] = (job, fut)
+
+    def _kill(self, slot):
+        """Ends the slot's job by killing its worker and removes its partial output."""
+        job = self._running[slot][0]
+        self._slots[slot].kill()
+        self._slots[slot]   = None
+        self._running[slot] = None
+        for path in (job.out, job.out + ".tmp"):
+            if os.path.exists(path):
+                try: os.remove(path)
+                except OSError: pass
+
+    def _finish(self, job, state):
+        job.state    = state
+        job.finished = time.monotonic()
+        if state == "done" and job.total is not None:
+            job.done = job.total
+
+    def _warm(self):
+        """Starts the slots that queued jobs will need, so they warm up together."""
+        missing = (min(self.workers, self.waiting() + self.active())
+                   - sum(slot is not None for slot in self._slots))
+        for slot in range(self.workers):
+            if missing <= 0:
+                break
+            if self._slots[slot] is None:
+                self._slots[slot] = WarmPool(1, log_level=self.log_level)
+                missing -= 1
+
+    def warm_up(self, wait=False):
+        """Starts every slot now, so the first jobs do not wait for imports."""
+        for slot in range(self.workers):
+            if self._slots[slot] is None:
+                self._slots[slot] = WarmPool(1, log_level=self.log_level)
+        if wait:
+            for slot in self._slots:
+                slot.wait_ready()
+
+    def shutdown(self):
+        """Cancels everything still queued or running and stops the slots."""
+        for state in ("queued", "running"):  # queued first, or slots get re-warmed
+            for job in list(self.jobs.values()):
+                if job.state == state:
+                    self.cancel(job.id)
+        for slot in self._slots:
+            if slot is not None:
+                slot.shutdown(cancel=True)
+        self._slots = [None] * self.workers
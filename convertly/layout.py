@@ -0,0 +1,204 @@
+"""
+reportlab layout helpers shared by word_to_pdf and excel_to_pdf.
+"""
+import copy
+import functools
+
+
+TABLE_WINDOW_ROWS = 64   # rows laid out per step by the long-table flowable
+LONG_TABLE_ROWS   = 100  # longer tables are laid out a page at a time
+STORY_LOOKAHEAD   = 32   # flowables a _LazyStory keeps ahead of layout
+
+
+@functools.lru_cache(maxsize=None)
+def _sample_styles():
+    """reportlab's sample stylesheet, built once per process; treat as read-only."""
+    from reportlab.lib.styles import getSampleStyleSheet
+    return getSampleStyleSheet()
+
+
+class _LazyStory(list):
+    """
+    A story for doc.build() that pulls its flowables from an iterator as
+    layout consumes them. reportlab only takes from the front of the list,
+    asks its length and looks a few flowables ahead (keepWithNext), so
+    keeping `lookahead` of them queued is enough and the whole document
+    never has to exist at once.
+    """
+
+    def __init__(self, flowables, lookahead=STORY_LOOKAHEAD):
+        list.__init__(self)
+        self._source    = iter(flowables)
+        self._lookahead = lookahead
+
+    def _top_up(self, n=None):
+        """Queues flowables until there are `n` (None: all of them)."""
+        while self._source is not None and (n is None or list.__len__(self) < n):
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._top_up(self._lookahead)
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            stop = index.stop
+            self._top_up(stop if stop is not None and stop >= 0 else None)
+        else:
+            self._top_up(index + 1 if index >= 0 else None)
+        return list.__getitem__(self, index)
+
+    def __iter__(self):
+        self._top_up()
+        return list.__iter__(self)
+
+
+@functools.lru_cache(maxsize=None)
+def _long_table_type():
+    """
+    Builds the long-table flowable class on first use so that reportlab is
+    still only imported once a conversion actually needs it.
+    """
+    from reportlab.platypus import Flowable, Table, TableStyle
+
+    class LongTable(Flowable):
+        """
+        A table of any length that hands reportlab about one page of rows
+        at a time. Rows are pulled lazily from `rows`, an iterable of
+        (cells, commands) pairs whose commands address columns of that row
+        only, e.g. ("BACKGROUND", c1, c2, colour). `header` is a row of the
+        same shape repeated at the top of every page, `spans` are
+        (c1, r1, c2, r2) merges in body-row coordinates and `zebra` gives
+        ROWBACKGROUNDS colours for the body rows.
+        """
+
+        def __init__(self, rows, col_widths, style=(), header=None,
+                     spans=(), zebra=None, window=TABLE_WINDOW_ROWS):
+            Flowable.__init__(self)
+            self.hAlign  = "CENTER"   # same default as Table
+            self._rows   = iter(rows)
+            self._widths = list(col_widths)
+            self._style  = list(style)
+            self._header = header
+            self._spans  = list(spans)
+            self._zebra  = list(zebra) if zebra else None
+            self._window = window
+            self._start  = 0      # body-row index of self._buffer[0]
+            self._buffer = []
+            self._done   = False
+            self._table  = None
+
+        def _fill(self, n):
+            while len(self._buffer) < n and not self._done:
+                try:
+                    self._buffer.append(next(self._rows))
+                except StopIteration:
+                    self._done = True
+
+        def _build(self):
+            head = [self._header] if self._header else []
+            h    = len(head)
+            ts   = list(self._style)
+            cell_cmds, row_cmds = [], []
+            for l_idx, (_, cmds) in enumerate(head + self._buffer):
+                for op, c1, c2, *args in cmds:
+                    cmd = (op, c1, c2, l_idx, *args)
+                    (row_cmds if op == "SPAN" or c2 < 0 else cell_cmds).append(cmd)
+            ts += _coalesce_cell_commands(cell_cmds)
+            ts += [(op, (c1, r), (c2, r), *args) for op, c1, c2, r, *args in row_cmds]
+
+            end = self._start + len(self._buffer)
+            for c1, r1, c2, r2 in self._spans:
+                if r1 < end and r2 >= self._start:
+                    ts.append(("SPAN",
+                               (c1, max(r1, self._start) - self._start + h),
+                               (c2, min(r2, end - 1) - self._start + h)))
+            if self._zebra:
+                k = self._start % len(self._zebra)
+                ts.append(("ROWBACKGROUNDS", (0, h), (-1, -1),
+                           self._zebra[k:] + self._zebra[:k]))
+
+            tbl = Table([cells for cells, _ in head + self._buffer],
+                        colWidths=self._widths, repeatRows=h)
+            tbl.setStyle(TableStyle(ts))
+            return tbl
+
+        def wrap(self, availWidth, availHeight):
+            self._fill(self._window)
+            while True:
+                if not (self._header or self._buffer):
+                    self._table = None
+                    self.width = self.height = 0
+                    return 0, 0
+                self._table = self._build()
+                w, h = self._table.wrap(availWidth, availHeight)
+                if h > availHeight or self._done:
+                    break
+                # The whole window fits: take more rows so the page is filled.
+                self._window *= 2
+                self._fill(self._window)
+            self.width, self.height = w, h
+            return w, h
+
+        def split(self, availWidth, availHeight):
+            if self._table is None:
+                self.wrap(availWidth, availHeight)
+            if self._table is None:
+                return []
+            parts = self._table.split(availWidth, availHeight)
+            used  = len(parts[0]._cellvalues) - (1 if self._header else 0) if parts else 0
+            if used <= 0:
+                return []
+            rest = copy.copy(self)
+            rest.__dict__.pop("_postponed", None)
+            rest._buffer = self._buffer[used:]
+            rest._start  = self._start + used
+            rest._spans  = [s for s in self._spans if s[3] >= rest._start]
+            rest._table  = None
+            rest._window = used + used // 4 + 1   # about one page plus slack
+            return [parts[0], rest]
+
+        def draw(self):
+            if self._table is not None:
+                self._table.drawOn(self.canv, 0, 0)
+
+    return LongTable
+
+
+def _coalesce_cell_commands(cmds):
+    """
+    Merges per-cell TableStyle commands given as (op, c1, c2, row, *args)
+    into as few rectangles as possible: touching cells of a row with the
+    same op and arguments become one run, and identical runs on
+    consecutive rows become one block. A styled sheet then hands reportlab
+    a handful of commands per band instead of one per cell. Commands must
+    not overlap for the same op, as their relative order is not kept.
+    """
+    groups = {}
+    for op, c1, c2, r, *args in cmds:
+        groups.setdefault((op, tuple(args)), []).append((r, c1, c2))
+
+    out = []
+    for (op, args), cells in groups.items():
+        cells.sort()
+        runs = []
+        for r, c1, c2 in cells:
+            if runs and runs[-1][0] == r and runs[-1][2] + 1 >= c1:
+                runs[-1][2] = max(runs[-1][2], c2)
+            else:
+                runs.append([r, c1, c2])
+
+        open_blocks = {}   # (c1, c2) → [r1, r2] of the block still growing
+        for r, c1, c2 in runs:
+            block = open_blocks.get((c1, c2))
+            if block and block[1] == r - 1:
+                block[1] = r
+            else:
+                block = open_blocks[(c1, c2)] = [r, r]
+                out.append((op, c1, c2, block, args))
+
+    return [(op, (c1, block[0]), (c2, block[1]), *args)
+            for op, c1, c2, block, args in out]
@@ -0,0 +1,59 @@
+"""
+The conversions Convertly offers, shared by the CLI, the worker pool and the GUI.
+"""
+from .excel_pdf import excel_to_pdf
+from .pdf_excel import pdf_to_excel
+from .pdf_word import _available_engines, pdf_to_word
+from .word_pdf import word_to_pdf
+
+
+MODES = [
+    {
+        "key":   "pdf-word",
+        "label": "PDF → Word",
+        "ft":    [("PDF Files", "*.pdf")],
+        "ext":   "_converted.docx",
+        "fn":    pdf_to_word,
+        "unit":  "pages",  # what progress(done, total) counts
+        "libs":  ("pdf2docx", "PyMuPDF", "python-docx", "lxml"),
+        "preload": ("pdf2docx", "docx", "lxml.etree"),
+        "engines": _available_engines,  # installed engines change the output
+    },
+    {
+        "key":   "pdf-excel",
+        "label": "PDF → Excel",
+        "ft":    [("PDF Files", "*.pdf")],
+        "ext":   "_converted.xlsx",
+        "fn":    pdf_to_excel,
+        "unit":  "pages",
+        "libs":  ("pdfplumber", "pdfminer.six", "PyMuPDF", "openpyxl"),
+        "preload": ("pdfplumber", "openpyxl", "fitz"),
+    },
+    {
+        "key":   "word-pdf",
+        "label": "Word → PDF",
+        "ft":    [("Word Files", "*.docx")],
+        "ext":   "_converted.pdf",
+        "fn":    word_to_pdf,
+        "unit":  "KB",
+        "libs":  ("reportlab", "lxml"),
+        "preload": ("lxml.etree", "reportlab.platypus", "PIL.Image"),
+    },
+    {
+        "key":   "excel-pdf",
+        "label": "Excel → PDF",
+        "ft":    [("Excel Files", "*.xlsx")],
+        "ext":   "_converted.pdf",
+        "fn":    excel_to_pdf,
+        "unit":  "rows",
+        "libs":  ("openpyxl", "reportlab"),
+        "preload": ("openpyxl", "reportlab.platypus"),
+    },
+]
+
+
+def _mode_by_key(key):
+    for mode in MODES:
+        if mode["key"] == key:
+            return mode
+    raise KeyError(f"Unknown conversion mode: {key}")
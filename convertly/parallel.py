@@ -0,0 +1,67 @@
+"""
+Process-pool plumbing shared by the page-parallel converters.
+"""
+import os
+
+_chunk_stop = None  # multiprocessing.Event shared with page and pool workers
+
+
+def _exit_with_parent():
+    """
+    Ends this worker process as soon as its parent dies. A parent killed
+    by a timeout or a hard Stop gets no chance to shut its pool down, and
+    the orphaned workers would otherwise wait for work forever.
+    """
+    import multiprocessing
+    import threading
+    from multiprocessing.connection import wait
+    parent = multiprocessing.parent_process()
+    if parent is None:
+        return
+
+    def watch():
+        wait([parent.sentinel])
+        os._exit(1)
+
+    threading.Thread(target=watch, daemon=True).start()
+
+
+def _init_page_worker(stop):
+    global _chunk_stop
+    _chunk_stop = stop
+    _exit_with_parent()
+
+
+def _run_page_chunks(fn, chunks, workers, stop_event=None):
+    """
+    Calls fn(*args) for every args tuple in `chunks` in a process pool and
+    yields the results in submission order. Setting `stop_event` stops
+    every worker at its next page boundary; a worker signals that it
+    stopped by returning None.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, wait
+
+    def stopped():
+        return stop_event is not None and stop_event.is_set()
+
+    if stopped():
+        raise InterruptedError("Cancelled by user.")
+    ctx  = multiprocessing.get_context()
+    stop = ctx.Event()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_page_worker,
+                             initargs=(stop,)) as pool:
+        futures = [pool.submit(fn, *args) for args in chunks]
+        for fut in futures:
+            done = fut.done()
+            while not (done or stopped()):
+                done = wait([fut], timeout=0.2).done
+            if stopped():  # also when chunks finish faster than the poll
+                stop.set()
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise InterruptedError("Cancelled by user.")
+            result = fut.result()
+            if result is None:
+                raise InterruptedError("Cancelled by user.")
+            yield result
@@ -0,0 +1,308 @@
+"""
+PDF → Excel: page tables (or text lines) into one worksheet, read by a
+pluggable table-extraction backend (pdfplumber or PyMuPDF).
+"""
+import bisect
+import logging
+
+from . import parallel
+from .parallel import _run_page_chunks
+from .progress import Progress
+from .timing import note, span
+
+log = logging.getLogger(__name__)
+
+PARALLEL_MIN_PAGES  = 40   # below this, pool start-up costs more than it saves
+PAGES_PER_CHUNK     = 16
+STREAMING_MIN_PAGES = 200  # auto-switch to the constant-memory writer
+AUTO_SAMPLE_PAGES   = 8    # pages the automatic backend choice looks at
+AUTO_DENSE_WORDS    = 800  # words per ruled page where pdfplumber gets quicker
+LINE_TOLERANCE      = 3    # points; words this close vertically share a line
+
+
+# ── Table-extraction backends ─────────────────────────────────────────────────
+
+class TableBackend:
+    """
+    How pdf_to_excel reads a PDF. open() returns the document as a context
+    manager, page_count() its number of pages and page_rows() the rows
+    written for one 0-based page: the cells of its tables, or its text
+    lines when it has none. Backends hold no state of their own, so one
+    instance serves every document and process.
+    """
+    name = None
+
+    def open(self, pdf_path):
+        raise NotImplementedError
+
+    def page_count(self, doc):
+        raise NotImplementedError
+
+    def page_rows(self, doc, index):
+        raise NotImplementedError
+
+
+def _page_rows(page):
+    """
+    Rows written for one page: its table rows, or its text lines if it has
+    no tables. The page's layout cache is released afterwards, otherwise
+    pdfplumber keeps every char/line/rect object of the document alive.
+    """
+    rows = []
+    try:
+        tables = page.extract_tables()
+        if tables:
+            for table in tables:
+                for row in table:
+                    rows.append([c if c else "" for c in row])
+        else:
+            text = page.extract_text()
+            if text:
+                for line in text.split("\n"):
+                    rows.append([line])
+    finally:
+        page.close()
+    return rows
+
+
+class PdfplumberBackend(TableBackend):
+    """
+    pdfplumber: pure Python, slow on dense pages, and the reference for
+    what rows a page gives.
+    """
+    name = "pdfplumber"
+
+    def open(self, pdf_path):
+        import pdfplumber
+        return pdfplumber.open(pdf_path)
+
+    def page_count(self, doc):
+        return len(doc.pages)
+
+    def page_rows(self, doc, index):
+        return _page_rows(doc.pages[index])
+
+
+def _lines_text(words):
+    """
+    Joins PyMuPDF words (get_text("words") tuples) the way pdfplumber's
+    extract_text() does: words whose tops are within LINE_TOLERANCE of the
+    previous one form a line, read left to right and joined by spaces.
+    """
+    lines, line, last_top = [], [], None
+    for w in sorted(words, key=lambda w: w[1]):
+        if last_top is not None and w[1] - last_top > LINE_TOLERANCE:
+            lines.append(line)
+            line = []
+        line.append(w)
+        last_top = w[1]
+    if line:
+        lines.append(line)
+    return "\n".join(" ".join(w[4] for w in sorted(line, key=lambda w: w[0]))
+                     for line in lines)
+
+
+def _table_cells(table, words):
+    """
+    The cell texts of a PyMuPDF table, row by row. Every word goes to the
+    cell holding its centre, found by bisecting the table's grid lines;
+    Table.extract() tests each character against each cell in Python
+    instead, which takes seconds on a dense page. Cells covered by a
+    merge (None in the table) stay empty, as with pdfplumber.
+    """
+    cells = [[c for c in row.cells] for row in table.rows]
+    xs = sorted({v for row in cells for c in row if c for v in (c[0], c[2])})
+    ys = sorted({v for row in cells for c in row if c for v in (c[1], c[3])})
+    owner = {}  # (grid column, grid row) → (row, column) of the cell over it
+    for r, row in enumerate(cells):
+        for c, cell in enumerate(row):
+            if cell is None:
+                continue
+            for gx in range(bisect.bisect_left(xs, cell[0]), bisect.bisect_left(xs, cell[2])):
+                for gy in range(bisect.bisect_left(ys, cell[1]), bisect.bisect_left(ys, cell[3])):
+                    owner[(gx, gy)] = (r, c)
+    found = {}
+    for w in words:
+        pos = owner.get((bisect.bisect_right(xs, (w[0] + w[2]) / 2) - 1,
+                         bisect.bisect_right(ys, (w[1] + w[3]) / 2) - 1))
+        if pos is not None:
+            found.setdefault(pos, []).append(w)
+    return [[_lines_text(found.get((r, c), ())) if cell else "" for c, cell in enumerate(row)]
+            for r, row in enumerate(cells)]
+
+
+class PyMuPDFBackend(TableBackend):
+    """
+    PyMuPDF (fitz, installed with pdf2docx): MuPDF reads the text and the
+    vector paths natively. Tables are found with page.find_tables(), which
+    follows pdfplumber's ruling-line method, and only on pages that draw
+    something, since a page without paths has no ruling lines. Text lines
+    can group slightly differently from pdfplumber's on complex layouts.
+    """
+    name = "pymupdf"
+
+    def open(self, pdf_path):
+        import fitz
+        return fitz.open(pdf_path)
+
+    def page_count(self, doc):
+        return len(doc)
+
+    def page_rows(self, doc, index):
+        page   = doc[index]
+        words  = page.get_text("words")
+        tables = page.find_tables().tables if page.get_cdrawings() else []
+        if not tables:
+            text = _lines_text(words)
+            return [[line] for line in text.split("\n")] if text else []
+        rows = []
+        for table in tables:
+            if page.rotation:  # the table is found on the unrotated page
+                cells = [[c if c else "" for c in row] for row in table.extract()]
+            else:
+                cells = _table_cells(table, words)
+            rows.extend(cells)
+        return rows
+
+
+TABLE_BACKENDS = {backend.name: backend for backend in (PdfplumberBackend(), PyMuPDFBackend())}
+
+
+def _choose_backend(pdf_path):
+    """
+    The automatic backend choice, from benchmarks/bench_pdf_tables.py.
+    PyMuPDF extracts text pages 4 to 45 times faster than pdfplumber, and
+    ruled tables a little faster, with the same rows. Its table finder
+    slows down faster with the amount of text in a table, though, and
+    from about AUTO_DENSE_WORDS words per ruled page pdfplumber is quicker.
+    A few pages spread over the document are sampled: pdfplumber is used
+    when the ones that draw lines are that dense on average, or when
+    PyMuPDF is not installed.
+    """
+    try:
+        import fitz
+    except ImportError:
+        return TABLE_BACKENDS["pdfplumber"]
+    with fitz.open(pdf_path) as doc:
+        n      = len(doc)
+        k      = min(n, AUTO_SAMPLE_PAGES)
+        ruled  = [len(doc[i].get_text("words"))
+                  for i in (j * n // k for j in range(k)) if doc[i].get_cdrawings()]
+    if ruled and sum(ruled) / len(ruled) > AUTO_DENSE_WORDS:
+        log.debug("%s: dense ruled pages (%.0f words), using pdfplumber",
+                  pdf_path, sum(ruled) / len(ruled))
+        return TABLE_BACKENDS["pdfplumber"]
+    return TABLE_BACKENDS["pymupdf"]
+
+
+# ── Page extraction ───────────────────────────────────────────────────────────
+
+def _extract_page_chunk(backend_name, pdf_path, indexes):
+    """Worker side of the page-parallel path: rows for the 0-based `indexes`."""
+    backend = TABLE_BACKENDS[backend_name]
+    chunk   = []
+    with backend.open(pdf_path) as doc:
+        for i in indexes:
+            if parallel._chunk_stop is not None and parallel._chunk_stop.is_set():
+                return None
+            chunk.append(backend.page_rows(doc, i))
+    return chunk
+
+
+def _parallel_page_rows(backend, pdf_path, indexes, workers, stop_event=None):
+    """
+    Splits the pages at `indexes` into chunks, extracts them in a process
+    pool and yields each page's rows in order.
+    """
+    size   = max(1, min(PAGES_PER_CHUNK, -(-len(indexes) // workers)))
+    chunks = [(backend.name, pdf_path, indexes[s:s + size])
+              for s in range(0, len(indexes), size)]
+    for chunk in _run_page_chunks(_extract_page_chunk, chunks, workers, stop_event):
+        yield from chunk
+
+
+def _serial_page_rows(backend, doc, indexes, stop_event=None):
+    for i in indexes:
+        if stop_event and stop_event.is_set():
+            raise InterruptedError("Cancelled by user.")
+        yield backend.page_rows(doc, i)
+
+
+def _stored_page_rows(backend, doc, todo, computed, keys, page_store):
+    """
+    Yields every page's rows in order: pages in `todo` from the `computed`
+    iterator (storing them), all others from `page_store`.
+    """
+    todo = set(todo)
+    for i, key in enumerate(keys):
+        rows = None if i in todo else page_store.get(key)
+        if rows is None:
+            # evicted since the lookup: extract it here
+            rows = next(computed) if i in todo else backend.page_rows(doc, i)
+            page_store.put(key, rows)
+            page_store.computed += 1
+        else:
+            page_store.reused += 1
+        yield rows
+
+
+def pdf_to_excel(pdf_path, out_path, stop_event=None, workers=None, streaming=None,
+                 page_store=None, progress=None, backend=None):
+    """
+    Extracts the tables of every page (or its text lines when a page has
+    no tables) into one worksheet. With `workers` > 1, documents of at
+    least PARALLEL_MIN_PAGES pages are extracted in parallel processes;
+    rows are still written in page order.
+
+    `backend` names the table extractor, a key of TABLE_BACKENDS
+    ("pdfplumber" or "pymupdf"); None or "auto" lets _choose_backend pick.
+
+    `streaming` writes rows through openpyxl's write-only workbook so peak
+    memory does not grow with the page count. None enables it for
+    documents of STREAMING_MIN_PAGES pages or more.
+
+    With a `page_store` (a PageStore), only pages whose content changed
+    since an earlier run are extracted; the rest come from the store.
+
+    `progress` is called as progress(pages_done, total_pages).
+    """
+    import openpyxl
+    if backend in (None, "auto"):
+        backend = _choose_backend(pdf_path)
+    elif backend in TABLE_BACKENDS:
+        backend = TABLE_BACKENDS[backend]
+    else:
+        raise ValueError(f"Unknown table backend: {backend}")
+    note(engine=backend.name)
+    with backend.open(pdf_path) as doc:
+        with span("load"):
+            n_pages = backend.page_count(doc)
+        tracker = Progress(progress, n_pages)
+        if streaming is None:
+            streaming = n_pages >= STREAMING_MIN_PAGES
+        if streaming:
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet()
+        else:
+            wb = openpyxl.Workbook()
+            ws = wb.active
+
+        todo = range(n_pages)
+        if page_store is not None:
+            with span("fingerprint"):
+                # the backends split pages into rows differently
+                keys = [f"{backend.name}-{key}" for key in page_store.page_keys(pdf_path)]
+                todo = [i for i in todo if keys[i] not in page_store]
+        if workers and workers > 1 and len(todo) >= PARALLEL_MIN_PAGES:
+            page_rows = _parallel_page_rows(backend, pdf_path, list(todo), workers, stop_event)
+        else:
+            page_rows = _serial_page_rows(backend, doc, todo, stop_event)
+        if page_store is not None:
+            page_rows = _stored_page_rows(backend, doc, todo, page_rows, keys, page_store)
+        with span("extract"):
+            for rows in page_rows:
+                for row in rows:
+                    ws.append(row)
+                tracker.advance()
+    with span("save"):
+        wb.save(out_path)
@@ -0,0 +1,337 @@
+"""
+PDF → Word: Word (COM), LibreOffice or pdf2docx, then spacing cleanup.
+"""
+import functools
+import logging
+import os
+import platform
+import subprocess
+
+from . import parallel
+from .parallel import _run_page_chunks
+from .progress import Progress
+from .timing import note, span
+
+log = logging.getLogger(__name__)
+
+LIBREOFFICE_PATHS = (
+    r"C:\Program Files\LibreOffice\program\soffice.exe",
+    r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _available_engines():
+    """
+    The PDF → Word engines installed here, best first: "word" when Word is
+    registered for COM and pywin32 is present, "libreoffice" when soffice
+    is at one of LIBREOFFICE_PATHS, and always "pdf2docx". Part of the
+    result cache's salt, so installing or removing one starts afresh.
+    """
+    import importlib.util
+    engines = []
+    if platform.system() == "Windows" and importlib.util.find_spec("win32com"):
+        import winreg
+        try:
+            winreg.CloseKey(winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, "Word.Application"))
+            engines.append("word")
+        except OSError:
+            pass
+    if any(os.path.exists(lo) for lo in LIBREOFFICE_PATHS):
+        engines.append("libreoffice")
+    return tuple(engines) + ("pdf2docx",)
+
+
+def _cleanup_docx_spacing(docx_path):
+    """
+    Post-process a converted DOCX to remove excessive blank space:
+    - Drops the 3rd and later paragraphs of every run of empty paragraphs
+    - Caps paragraph spaceBefore/spaceAfter values above 72 pt
+    - Removes isolated page-break elements near the top of the document
+
+    Works on word/document.xml directly in one pass over the body; every
+    other package part is copied through unchanged.
+    """
+    import zipfile
+    from lxml import etree
+
+    W          = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+    ns         = {"w": W[1:-1]}
+    texts      = etree.XPath("w:r/w:t/text() | w:hyperlink/w:r/w:t/text()", namespaces=ns)
+    hyphens    = etree.XPath("w:r/w:noBreakHyphen | w:hyperlink/w:r/w:noBreakHyphen",
+                             namespaces=ns)
+    page_brs   = etree.XPath("w:r//w:br[@w:type='page']", namespaces=ns)
+    spacing_of = etree.XPath("w:pPr/w:spacing", namespaces=ns)
+    caps       = ((W + "before", 1440, "360"),  # 72 pt → 18 pt, in twips
+                  (W + "after",  1440, "160"))  # 72 pt → 8 pt
+
+    member = "word/document.xml"
+    tmp    = docx_path + ".tmp"
+    try:
+        with zipfile.ZipFile(docx_path) as zin:
+            root = etree.fromstring(zin.read(member))
+            body = root.find(W + "body")
+            if body is None:
+                return
+
+            blank_run = 0
+            kept      = 0
+            for p in body.findall(W + "p"):
+                blank = not (any(t.strip() for t in texts(p)) or hyphens(p))
+                if blank:
+                    blank_run += 1
+                    if blank_run > 2:
+                        body.remove(p)
+                        continue
+                else:
+                    blank_run = 0
+
+                for spacing in spacing_of(p):
+                    for attr, limit, capped in caps:
+                        try:
+                            if int(spacing.get(attr, 0)) > limit:
+                                spacing.set(attr, capped)
+                        except ValueError:
+                            pass
+
+                if kept < 10 and blank:
+                    for br in page_brs(p):
+                        br.getparent().remove(br)
+                kept += 1
+
+            xml = etree.tostring(root, encoding="UTF-8", standalone=True)
+            with zipfile.ZipFile(tmp, "w") as zout:
+                for info in zin.infolist():
+                    if info.filename == member:
+                        zout.writestr(info, xml)
+                    else:
+                        zout.writestr(info, zin.read(info))
+        os.replace(tmp, docx_path)
+    except Exception as e:
+        log.debug("Spacing cleanup skipped for %s: %s", docx_path, e)
+        if os.path.exists(tmp):
+            try: os.remove(tmp)
+            except OSError: pass
+        # never let cleanup crash the whole conversion
+
+
+WORD_PARALLEL_MIN_PAGES = 8  # pdf2docx parses ~1 page/s, so pools pay off early
+WORD_PAGES_PER_CHUNK    = 8
+
+
+def _parse_page_spec(spec):
+    """
+    Parses a 1-based page selection such as "10-20", "1,3,5-7" or "15-"
+    (to the last page) into (first, last) ranges; `last` is None for an
+    open range. Raises ValueError on malformed input and inverted ranges
+    such as "5-3".
+    """
+    ranges = []
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        first, sep, last = part.partition("-")
+        try:
+            lo = int(first) if first else 1
+            hi = (int(last) if last else None) if sep else lo
+        except ValueError:
+            raise ValueError(f"Invalid page selection: {part!r}") from None
+        if hi is not None and lo > hi:
+            raise ValueError(f"Invalid page selection: {part!r}")
+        ranges.append((lo, hi))
+    if not ranges:
+        raise ValueError(f"Invalid page selection: {spec!r}")
+    return ranges
+
+
+def _page_indexes(pages, n_pages):
+    """
+    0-based page indexes for `pages`: a selection string (see
+    _parse_page_spec), an iterable of 1-based page numbers, or None for
+    every page. Pages past the end of the document are ignored.
+    """
+    if pages is None:
+        return list(range(n_pages))
+    if isinstance(pages, str):
+        selected = set()
+        for lo, hi in _parse_page_spec(pages):
+            hi = n_pages if hi is None else min(hi, n_pages)
+            selected.update(range(max(lo, 1) - 1, hi))
+    else:
+        selected = {int(p) - 1 for p in pages if 1 <= int(p) <= n_pages}
+    if not selected:
+        raise ValueError(f"No pages selected — the document has {n_pages} page(s).")
+    return sorted(selected)
+
+
+def _parse_word_chunk(pdf_path, indexes):
+    """Worker side of the parallel pdf2docx path: stored layouts for `indexes`."""
+    from pdf2docx import Converter
+    if parallel._chunk_stop is not None and parallel._chunk_stop.is_set():
+        return None
+    cv = Converter(pdf_path)
+    try:
+        settings = cv.default_settings
+        cv.load_pages(pages=indexes).parse_document(**settings).parse_pages(**settings)
+        return [page.store() for page in cv.pages if page.finalized]
+    finally:
+        cv.close()
+
+
+def _pdf2docx_convert(pdf_path, out_path, pages=None, workers=None,
+                      stop_event=None, page_store=None, progress=None):
+    """
+    Converts the selected pages with pdf2docx one page at a time, so
+    `stop_event` is honoured and `progress` advances between pages. With
+    `workers` > 1, selections of at least WORD_PARALLEL_MIN_PAGES pages are
+    parsed WORD_PAGES_PER_CHUNK pages at a time in a process pool and
+    assembled in page order. Unlike pdf2docx's own multi-processing this
+    works for page lists and writes no scratch files.
+
+    With a `page_store`, pages whose content is unchanged since an earlier
+    run are restored from their stored layouts and only the rest is parsed.
+    """
+    from pdf2docx import Converter
+    with span("load"):
+        cv = Converter(pdf_path)
+    try:
+        settings = cv.default_settings
+        indexes  = _page_indexes(pages, len(cv.fitz_doc))
+        reused   = {}
+        if page_store is not None:
+            with span("fingerprint"):
+                keys = dict(zip(indexes, page_store.page_keys(pdf_path, indexes)))
+                for i in indexes:
+                    layout = page_store.get(keys[i])
+                    if layout is not None:
+                        reused[i] = dict(layout, id=i)
+        todo    = [i for i in indexes if i not in reused]
+        tracker = Progress(progress, len(indexes))
+        tracker.update(len(reused))
+
+        with span("extract"):
+            cv.load_pages(pages=todo or indexes)
+        if todo:
+            if workers and workers > 1 and len(todo) >= WORD_PARALLEL_MIN_PAGES:
+                size   = max(1, min(WORD_PAGES_PER_CHUNK, -(-len(todo) // workers)))
+                chunks = [(pdf_path, todo[i:i + size])
+                          for i in range(0, len(todo), size)]
+                with span("parse"):
+                    parsed = _run_page_chunks(_parse_word_chunk, chunks, workers, stop_event)
+                    for args, stored in zip(chunks, parsed):
+                        cv.restore({"pages": stored})
+                        tracker.advance(len(args[1]))
+            else:
+                selected = [page for page in cv.pages if not page.skip_parsing]
+                if stop_event and stop_event.is_set():
+                    raise InterruptedError("Cancelled by user.")
+                with span("parse"):
+                    cv.parse_document(**settings)
+                    for current in selected:
+                        if stop_event and stop_event.is_set():
+                            raise InterruptedError("Cancelled by user.")
+                        for page in selected:
+                            page.skip_parsing = page is not current
+                        cv.parse_pages(**settings)
+                        tracker.advance()
+
+        if page_store is not None:
+            for i in todo:
+                if cv.pages[i].finalized:
+                    page_store.put(keys[i], cv.pages[i].store())
+            page_store.reused   += len(reused)
+            page_store.computed += len(todo)
+            cv.restore({"pages": list(reused.values())})
+        with span("build"):
+            cv.make_docx(out_path, **settings)
+    finally:
+        cv.close()
+
+
+def pdf_to_word(pdf_path, out_path, stop_event=None, pages=None, workers=None,
+                page_store=None, progress=None):
+    """
+    Converts PDF → DOCX using the best available engine:
+      1. Microsoft Word via COM (Windows, highest fidelity)
+      2. LibreOffice via subprocess (if installed)
+      3. pdf2docx (pure-Python fallback)
+    Then post-processes to collapse excessive blank space. When an engine
+    listed by _available_engines() fails and a lesser one takes over, the
+    conversion is noted as a fallback so its result is not cached.
+
+    `pages` converts only a selection such as "10-20" or "1,3,5" (1-based)
+    and always uses pdf2docx, since the other engines convert whole files.
+    `workers` parses large documents in that many pdf2docx processes.
+    `page_store` (a PageStore) reuses the layouts of pages that did not
+    change since an earlier run; it implies pdf2docx as well.
+    `progress` is called as progress(pages_done, total_pages) while
+    pdf2docx parses; Word and LibreOffice do not report progress.
+    """
+    import shutil
+    abs_pdf = os.path.abspath(pdf_path)
+    abs_out = os.path.abspath(out_path)
+    converted = None  # the engine that produced the output
+
+    # ── 1. Microsoft Word (COM) ───────────────────────────────────────────────
+    if not converted and pages is None and page_store is None:
+        with span("word-com"):
+            try:
+                import pythoncom, win32com.client
+                pythoncom.CoInitialize()
+                word = None
+                try:
+                    word = win32com.client.Dispatch("Word.Application")
+                    word.Visible = False
+                    word.DisplayAlerts = False
+                    doc = word.Documents.Open(abs_pdf)
+                    doc.SaveAs2(abs_out, FileFormat=16)
+                    doc.Close(False)
+                    converted = "word"
+                finally:
+                    try:
+                        if word: word.Quit()
+                    except Exception:
+                        pass
+                    pythoncom.CoUninitialize()
+            except Exception:
+                pass
+
+    # ── 2. LibreOffice ────────────────────────────────────────────────────────
+    if not converted and pages is None and page_store is None:
+        with span("libreoffice"):
+            for lo in LIBREOFFICE_PATHS:
+                if os.path.exists(lo):
+                    try:
+                        out_dir = os.path.dirname(abs_out)
+                        subprocess.run(
+                            [lo, "--headless", "--convert-to", "docx",
+                             "--outdir", out_dir, abs_pdf],
+                            timeout=120, check=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                        )
+                        lo_out = os.path.join(
+                            out_dir,
+                            os.path.splitext(os.path.basename(pdf_path))[0] + ".docx"
+                        )
+                        if os.path.exists(lo_out) and os.path.abspath(lo_out) != abs_out:
+                            shutil.move(lo_out, abs_out)
+                        converted = "libreoffice"
+                    except Exception:
+                        pass
+                    break
+
+    # ── 3. pdf2docx (fallback) ────────────────────────────────────────────────
+    if not converted:
+        converted = "pdf2docx"
+        _pdf2docx_convert(abs_pdf, abs_out, pages, workers, stop_event, page_store,
+                          progress)
+    note(engine=converted)
+    if pages is None and page_store is None:
+        ranked = ("word", "libreoffice", "pdf2docx")
+        best   = _available_engines()[0]
+        if ranked.index(converted) > ranked.index(best):
+            note(fallback=best)  # the best engine failed this time
+
+    # ── Post-process: collapse excessive blank space ───────────────────────────
+    with span("postprocess"):
+        _cleanup_docx_spacing(abs_out)
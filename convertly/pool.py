@@ -0,0 +1,344 @@
+"""
+Warm worker processes and the single-job entry point they run.
+"""
+import itertools
+import logging
+import os
+import threading
+import time
+
+from . import parallel
+from .cache import PageStore, ResultCache
+from .layout import _sample_styles
+from .modes import MODES, _mode_by_key
+from .parallel import _exit_with_parent, _init_page_worker
+from .timing import noted, recording, span
+
+log = logging.getLogger(__name__)
+
+_progress_queue = None  # multiprocessing.Queue a WarmPool relays progress over
+
+
+def _preload(mode_keys=None):
+    """Imports the libraries of `mode_keys` (default: every mode) ahead of use."""
+    import importlib
+    for mode in MODES:
+        if mode_keys is None or mode["key"] in mode_keys:
+            for name in mode["preload"]:
+                importlib.import_module(name)
+            if mode["key"] in ("word-pdf", "excel-pdf"):
+                _sample_styles()
+
+
+def _init_warm_worker(stop, progress_queue, log_level, mode_keys):
+    import signal
+    # A worker forked from an asyncio program (the HTTP service) inherits its
+    # SIGTERM handler and signal wake-up fd; without this, kill()'s SIGTERM
+    # would wake the parent's event loop instead of ending the worker.
+    signal.set_wakeup_fd(-1)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    global _progress_queue
+    _progress_queue = progress_queue
+    _init_cli_worker(log_level)
+    _init_page_worker(stop)
+    _preload(mode_keys)
+
+
+def _worker_ready():
+    return os.getpid()
+
+
+class WarmPool:
+    """
+    Persistent worker processes that import the conversion libraries once
+    at start-up and then serve _convert_job calls, so no job pays the
+    import cost. `stop` is a multiprocessing Event every job sees as its
+    stop_event; set it to cancel the running jobs, clear it before the next.
+
+    A job's progress callback runs in this process, on a relay thread that
+    reads the workers' updates from a queue; callers that drive a GUI must
+    hand the values over to their own event loop.
+
+    Jobs submitted with a `timeout` or `memory_mb` run isolated (see
+    run_isolated) in a child of the worker. kill() ends every running job
+    at once by terminating the workers themselves.
+    """
+
+    def __init__(self, workers=1, mode_keys=None, log_level=logging.WARNING):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        ctx             = multiprocessing.get_context()
+        self.workers    = workers
+        self.stop       = ctx.Event()
+        self._progress  = ctx.Queue()
+        self._listeners = {}  # job id → progress callback
+        self._job_ids   = itertools.count()
+        self._relay     = None
+        self._pool      = ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                              initializer=_init_warm_worker,
+                                              initargs=(self.stop, self._progress,
+                                                        log_level, mode_keys))
+        # start (and so warm) the workers now rather than on first use
+        self._ready  = [self._pool.submit(_worker_ready) for _ in range(workers)]
+
+    def wait_ready(self):
+        """Blocks until the workers have finished warming up."""
+        from concurrent.futures import wait
+        wait(self._ready)
+
+    def submit(self, key, src, out, options=None, use_cache=True, incremental=False,
+               progress=None, profile_dir=None, timeout=None, memory_mb=None):
+        """
+        Queues one conversion and returns its Future (of a _convert_job
+        status dict). `progress`, if given, is called as progress(done,
+        total) on the relay thread while the job runs.
+        """
+        job_id = None
+        if progress is not None:
+            job_id = next(self._job_ids)
+            self._listeners[job_id] = progress
+            if self._relay is None:
+                self._relay = threading.Thread(target=self._relay_progress, daemon=True)
+                self._relay.start()
+        if timeout or memory_mb:
+            fut = self._pool.submit(_isolated_job, key, src, out, options, use_cache,
+                                    incremental, job_id, profile_dir, timeout, memory_mb)
+        else:
+            fut = self._pool.submit(_convert_job, key, src, out, options,
+                                    use_cache, incremental, job_id, profile_dir)
+        if job_id is not None:
+            fut.add_done_callback(lambda _, j=job_id: self._listeners.pop(j, None))
+        return fut
+
+    def _relay_progress(self):
+        while True:
+            msg = self._progress.get()
+            if msg is None:
+                return
+            job_id, done, total = msg
+            callback = self._listeners.get(job_id)
+            if callback is None:
+                continue
+            try:
+                callback(done, total)
+            except Exception:
+                log.exception("Progress callback failed")
+
+    def shutdown(self, cancel=False):
+        if cancel:
+            self.stop.set()
+        self._pool.shutdown(wait=not cancel, cancel_futures=cancel)
+        if self._relay is not None:
+            self._progress.put(None)
+
+    def kill(self):
+        """
+        Terminates the workers mid-job and shuts the pool down; pending
+        Futures fail with BrokenProcessPool. Nothing is cleaned up on the
+        workers' side, so callers remove partial outputs themselves.
+        """
+        self.stop.set()
+        # Every worker process, not the pids _ready returned: those futures
+        # need not land on distinct workers, nor have run yet.
+        for process in list((self._pool._processes or {}).values()):
+            try:
+                process.terminate()
+            except OSError:
+                pass
+        self.shutdown(cancel=True)
+
+
+def _run_conversion(mode, src, out, stop_event=None, options=None, cache=None,
+                    progress=None):
+    """
+    Runs mode["fn"], serving and filling `cache` when one is given.
+    Returns True when the result came from the cache. A result the
+    converter noted as a fallback (its best engine failed) is not stored.
+    """
+    options = options or {}
+    with span("cache"):
+        key = cache.key(mode["key"], src, options) if cache else None
+        hit = bool(key) and cache.fetch(key, out)
+    if hit:
+        log.debug("Cache hit for %s (%s)", src, key[:12])
+        return True
+    if progress is not None:
+        options = dict(options, progress=progress)
+    mode["fn"](src, out, stop_event, **options)
+    if key and not (stop_event and stop_event.is_set()):
+        if noted("fallback"):
+            log.debug("Not caching %s: %s failed, fell back", src, noted("fallback"))
+            return False
+        with span("cache"):
+            page_store = options.get("page_store")
+            if page_store is not None and page_store.written:
+                cache.grow(page_store.written)  # before the result, so a walk counts them once
+                page_store.written = 0
+            cache.store(key, out)
+    return False
+
+
+def _convert_job(key, src, out, options=None, use_cache=True, incremental=False,
+                 job_id=None, profile_dir=None):
+    """
+    Runs a single conversion. This is the process-pool entry point, so it
+    never raises: failures are reported in the returned status dict and any
+    partial output is removed. In a WarmPool worker, progress for `job_id`
+    is sent back over the pool's queue.
+
+    The status dict carries the job's phase timings ("timings"). With a
+    `profile_dir`, the job also runs under cProfile and its stats are
+    written there as <output name>.prof ("profile").
+    """
+    start = time.perf_counter()
+    cache = ResultCache() if use_cache else None
+    store = PageStore(key) if incremental and use_cache else None  # it lives in the cache
+    if store:
+        options = dict(options or {}, page_store=store)
+    progress = None
+    if job_id is not None and _progress_queue is not None:
+        progress = lambda done, total: _progress_queue.put((job_id, done, total))  # noqa: E731
+    profiler = None
+    if profile_dir:
+        import cProfile
+        profiler = cProfile.Profile()
+    with recording() as timings:
+        try:
+            if profiler:
+                profiler.enable()
+            try:
+                cached = _run_conversion(_mode_by_key(key), src, out, parallel._chunk_stop,
+                                         options, cache, progress)
+            finally:
+                if profiler:
+                    profiler.disable()
+            status = {"ok": True, "cached": cached, "error": None}
+        except Exception as e:
+            if os.path.exists(out):
+                try: os.remove(out)
+                except OSError: pass
+            status = {"ok": False, "cached": False, "error": f"{type(e).__name__}: {e}"}
+    if store is not None and store.written:  # pages of a failed or uncached run
+        cache.grow(store.written)
+    pages   = {"reused": store.reused, "computed": store.computed} if store else None
+    profile = None
+    if profiler:
+        os.makedirs(profile_dir, exist_ok=True)
+        profile = os.path.join(profile_dir, os.path.basename(out) + ".prof")
+        profiler.dump_stats(profile)
+    return {"src": src, "out": out, **status, "pages": pages,
+            "seconds": time.perf_counter() - start,
+            "timings": timings.as_dict(), "profile": profile}
+
+
+def _limit_memory(memory_mb):
+    """Caps this process's address space at `memory_mb` MiB where the OS allows it."""
+    try:
+        import resource
+    except ImportError:
+        log.warning("Memory limits are not supported on this platform; ignoring it")
+        return
+    limit = memory_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError) as e:
+        log.warning("Could not limit memory to %d MiB: %s", memory_mb, e)
+
+
+def _isolated_child(conn, log_level, key, src, out, options, use_cache, incremental,
+                    profile_dir, memory_mb):
+    """Child side of run_isolated: progress and the status dict go back over `conn`."""
+    _init_cli_worker(log_level)
+    _exit_with_parent()
+    if memory_mb:
+        _limit_memory(memory_mb)
+    global _progress_queue
+    _progress_queue = _PipeProgress(conn)
+    conn.send(("done", _convert_job(key, src, out, options, use_cache, incremental,
+                                    0, profile_dir)))
+
+
+class _PipeProgress:
+    """Stands in for the progress queue in an isolated child."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def put(self, msg):
+        _, done, total = msg
+        self.conn.send(("progress", done, total))
+
+
+def run_isolated(key, src, out, options=None, use_cache=True, incremental=False,
+                 timeout=None, memory_mb=None, stop_event=None, progress=None,
+                 profile_dir=None):
+    """
+    Runs one conversion like _convert_job, but in a child process that is
+    terminated the moment `timeout` seconds pass or `stop_event` is set, so
+    a page that never finishes cannot hold up the caller. `memory_mb` caps
+    the child's address space (POSIX only; that includes memory mapped but
+    not used, so allow for the libraries, a few hundred MiB). A killed or
+    crashed job is reported as failed and its partial output removed.
+    """
+    import multiprocessing
+    ctx        = multiprocessing.get_context()
+    recv, send = ctx.Pipe(duplex=False)
+    child = ctx.Process(target=_isolated_child, name=f"convertly-{key}",
+                        args=(send, logging.getLogger().level, key, src, out, options,
+                              use_cache, incremental, profile_dir, memory_mb))
+    start    = time.perf_counter()
+    deadline = time.monotonic() + timeout if timeout else None
+    result = error = None
+    child.start()
+    send.close()
+    try:
+        while result is None and error is None:
+            if recv.poll(0.1):
+                try:
+                    msg = recv.recv()
+                except EOFError:
+                    child.join()
+                    error = (f"ChildProcessError: the conversion process exited unexpectedly "
+                             f"(exit code {child.exitcode})")
+                    break
+                if msg[0] == "progress":
+                    if progress is not None:
+                        progress(msg[1], msg[2])
+                else:
+                    result = msg[1]
+            elif stop_event is not None and stop_event.is_set():
+                error = "InterruptedError: Cancelled by user."
+            elif deadline is not None and time.monotonic() > deadline:
+                error = f"TimeoutError: no result after {timeout:g} s"
+    finally:
+        if child.is_alive():
+            child.terminate()
+            child.join(2)
+            if child.is_alive():
+                child.kill()
+                child.join()
+        recv.close()
+
+    if result is not None:
+        return result
+    for path in (out, out + ".tmp"):
+        if os.path.exists(path):
+            try: os.remove(path)
+            except OSError: pass
+    return {"src": src, "out": out, "ok": False, "cached": False, "error": error,
+            "pages": None, "seconds": time.perf_counter() - start,
+            "timings": None, "profile": None}
+
+
+def _isolated_job(key, src, out, options=None, use_cache=True, incremental=False,
+                  job_id=None, profile_dir=None, timeout=None, memory_mb=None):
+    """WarmPool entry point for isolated jobs: run_isolated with the pool's stop and queue."""
+    progress = None
+    if job_id is not None and _progress_queue is not None:
+        progress = lambda done, total: _progress_queue.put((job_id, done, total))  # noqa: E731
+    return run_isolated(key, src, out, options, use_cache, incremental, timeout, memory_mb,
+                        parallel._chunk_stop, progress, profile_dir)
+
+
+def _init_cli_worker(log_level):
+    logging.basicConfig(level=log_level, format="%(message)s")
@@ -0,0 +1,73 @@
+"""
+Progress reporting: the throttle converters report through and an ETA
+estimate for whoever displays it.
+"""
+import time
+
+PROGRESS_INTERVAL = 0.1  # seconds between forwarded updates
+
+
+class Progress:
+    """
+    Forwards (done, total) to a progress callback, dropping updates closer
+    than `interval` seconds to the previous one; the first update and the
+    one that reaches `total` always go through. `total` may be None when the
+    amount of work is not known up front. With a None callback every call
+    is a no-op, so converters can report unconditionally.
+    """
+
+    def __init__(self, callback, total=None, interval=PROGRESS_INTERVAL):
+        self.callback = callback
+        self.total    = total
+        self.done     = 0
+        self.interval = interval
+        self._last    = None  # (time, done) of the last forwarded update
+
+    def advance(self, n=1):
+        self.update(self.done + n)
+
+    def update(self, done):
+        self.done = done
+        if self.callback is None:
+            return
+        now      = time.monotonic()
+        finished = self.total is not None and done >= self.total
+        if self._last is not None:
+            last_at, last_done = self._last
+            if done == last_done or (now - last_at < self.interval and not finished):
+                return
+        self._last = (now, done)
+        self.callback(done, self.total)
+
+    def finish(self):
+        """Reports the work as complete (if it had a known total)."""
+        if self.total is not None:
+            self.update(self.total)
+
+
+class Eta:
+    """
+    Remaining-time estimate from observed throughput. Feed it every
+    (done, total) update; the rate is smoothed exponentially so one slow
+    page does not swing the estimate.
+    """
+
+    def __init__(self, smoothing=0.3):
+        self.smoothing = smoothing
+        self.rate      = None  # units per second
+        self._last     = None
+
+    def update(self, done, total, now=None):
+        """Returns the estimated seconds left, or None until a rate is known."""
+        now = time.monotonic() if now is None else now
+        if self._last is not None:
+            last_at, last_done = self._last
+            if done > last_done and now > last_at:
+                rate = (done - last_done) / (now - last_at)
+                self.rate = rate if self.rate is None else (
+                    self.smoothing * rate + (1 - self.smoothing) * self.rate)
+        if self._last is None or done != self._last[1]:
+            self._last = (now, done)
+        if not self.rate or total is None:
+            return None
+        return max(total - done, 0) / self.rate
@@ -0,0 +1,396 @@
+"""
+A local HTTP conversion service: upload a file, get a job id, poll or
+stream the job's progress and download the result. It uses only the
+standard library (asyncio), so it runs offline, and the conversions run
+on a JobQueue of warm workers.
+
+    POST   /jobs?mode=pdf-excel&name=a.pdf   body: the file   → 202, the job
+    GET    /jobs/<id>[?wait=SECONDS]         → the job (long-polls with wait)
+    GET    /jobs/<id>/events                 → one JSON line per change until it ends
+    GET    /jobs/<id>/result                 → the converted file
+    DELETE /jobs/<id>                        → cancel the job and drop its files
+    GET    /health                           → worker and queue counts
+
+When `max_queued` jobs are already waiting, POST /jobs answers 429 with
+a Retry-After header instead of queueing more work.
+"""
+import asyncio
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from urllib.parse import parse_qs, urlsplit
+
+from .jobs import EXT_MODES, JobQueue, QueueFull
+from .modes import MODES, _mode_by_key
+from .pdf_word import _parse_page_spec
+
+log = logging.getLogger(__name__)
+
+POLL_INTERVAL   = 0.05     # seconds between JobQueue.poll() calls
+HEADER_TIMEOUT  = 30       # seconds a client may take to send its request head
+BODY_TIMEOUT    = 30       # seconds an upload may stall between two reads
+MIN_UPLOAD_RATE = 1 << 16  # bytes/s an upload must average beyond BODY_TIMEOUT
+CHUNK           = 1 << 16
+
+CONTENT_TYPES = {
+    ".pdf":  "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 408: "Request Timeout", 409: "Conflict",
+           411: "Length Required",
+           413: "Payload Too Large", 422: "Unprocessable Entity",
+           429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status  = status
+        self.headers = headers or {}
+
+
+class ConversionServer:
+    """
+    Serves the converters over HTTP on a JobQueue of `workers` warm
+    processes. At most `max_queued` jobs wait for a worker; a job gets
+    `timeout` seconds once it starts (a request may ask for less), and
+    finished jobs and their files are dropped after `keep` seconds.
+    Uploads and results live in `work_dir`, a temporary folder by default.
+    """
+
+    def __init__(self, workers=None, max_queued=32, timeout=300.0, memory_mb=None,
+                 max_upload_mb=200, use_cache=True, work_dir=None, keep=3600.0,
+                 log_level=logging.WARNING):
+        self.timeout    = timeout
+        self.max_upload = max_upload_mb * 1024 * 1024
+        self.keep       = keep
+        self.queue      = JobQueue(workers, max_queued, use_cache, log_level,
+                                   {"memory_mb": memory_mb} if memory_mb else None)
+        self._own_dir   = work_dir is None
+        self.work_dir   = work_dir or tempfile.mkdtemp(prefix="convertly-server-")
+        self._dirs      = {}  # job id → its folder under work_dir
+        self._server    = None
+        self._poller    = None
+        os.makedirs(self.work_dir, exist_ok=True)
+
+    async def start(self, host="127.0.0.1", port=8750):
+        """Starts listening and warming the workers; returns the bound port."""
+        self.queue.warm_up()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self._poller = asyncio.create_task(self._poll())
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        """Stops listening, cancels unfinished jobs and removes the work folder."""
+        if self._poller is not None:
+            self._poller.cancel()
+        if self._server is not None:
+            self._server.close()
+        self.queue.shutdown()
+        if self._own_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    async def _poll(self):
+        while True:
+            self.queue.poll()
+            now = time.monotonic()
+            for job in list(self.queue.jobs.values()):
+                if job.finished is not None and now - job.finished > self.keep:
+                    self._drop(job.id)
+            await asyncio.sleep(POLL_INTERVAL)
+
+    def _drop(self, job_id):
+        self.queue.remove(job_id)
+        shutil.rmtree(self._dirs.pop(job_id, ""), ignore_errors=True)
+
+    # ── HTTP ─────────────────────────────────────────────────────────────────
+    async def _handle(self, reader, writer):
+        try:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), HEADER_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                    asyncio.TimeoutError):
+                return
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, _ = lines[0].split(" ", 2)
+            except ValueError:
+                await self._send_json(writer, 400, {"error": "Malformed request line"})
+                return
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            url   = urlsplit(target)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            try:
+                await self._route(method, url.path.rstrip("/"), query, headers,
+                                  reader, writer)
+            except HTTPError as e:
+                await self._send_json(writer, e.status, {"error": str(e)}, e.headers)
+            except Exception as e:
+                log.exception("Request %s %s failed", method, target)
+                await self._send_json(writer, 500, {"error": f"{type(e).__name__}: {e}"})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, query, headers, reader, writer):
+        parts = path.strip("/").split("/")
+        if parts == ["health"] and method == "GET":
+            await self._send_json(writer, 200, self._health())
+            return
+        if parts == ["jobs"]:
+            if method != "POST":
+                raise HTTPError(405, "Use POST to submit a file")
+            await self._submit(query, headers, reader, writer)
+            return
+        if parts[0] != "jobs" or len(parts) > 3:
+            raise HTTPError(404, f"No such resource: {path}")
+        try:
+            job = self.queue.jobs[int(parts[1])]
+        except (ValueError, KeyError):
+            raise HTTPError(404, f"No such job: {parts[1]}")
+        action = parts[2] if len(parts) == 3 else None
+
+        if method == "DELETE" and action is None:
+            self.queue.cancel(job.id)
+            payload = self._job(job)
+            self._drop(job.id)
+            await self._send_json(writer, 200, payload)
+        elif method != "GET":
+            raise HTTPError(405, f"{method} is not supported here")
+        elif action is None:
+            try:
+                wait = min(float(query.get("wait") or 0), 60.0)
+            except ValueError:
+                raise HTTPError(400, "wait must be a number of seconds")
+            deadline = time.monotonic() + wait
+            while job.finished is None and time.monotonic() < deadline:
+                await asyncio.sleep(POLL_INTERVAL)
+            await self._send_json(writer, 200, self._job(job))
+        elif action == "events":
+            await self._stream_events(job, writer)
+        elif action == "result":
+            await self._send_result(job, writer)
+        else:
+            raise HTTPError(404, f"No such resource: {path}")
+
+    async def _submit(self, query, headers, reader, writer):
+        if "content-length" not in headers:
+            raise HTTPError(411, "Send the file as the body, with a Content-Length")
+        try:
+            length = int(headers["content-length"])
+        except ValueError:
+            raise HTTPError(400, "Bad Content-Length")
+        if length > self.max_upload:
+            raise HTTPError(413, f"Uploads are limited to {self.max_upload >> 20} MB")
+        queue = self.queue
+        if queue.max_queued is not None and queue.waiting() >= queue.max_queued:
+            await self._discard(reader, length)  # so the client gets to read the answer
+            raise HTTPError(429, f"{queue.waiting()} job(s) are already waiting",
+                            {"Retry-After": "1"})
+
+        name = os.path.basename(query.get("name", "").replace("\\", "/")) or "upload"
+        key  = query.get("mode") or EXT_MODES.get(os.path.splitext(name)[1].lower())
+        try:
+            mode = _mode_by_key(key or "")
+        except KeyError:
+            await self._discard(reader, length)
+            raise HTTPError(400, "Pass mode=" + "|".join(m["key"] for m in MODES)
+                            + " or a name with a .pdf, .docx or .xlsx extension")
+        exts = tuple(pat.lstrip("*") for _, pat in mode["ft"])
+        if not name.lower().endswith(exts):
+            if os.path.splitext(name)[1].lower() in CONTENT_TYPES:
+                await self._discard(reader, length)
+                raise HTTPError(400, f"{mode['label']} takes {' or '.join(exts)} files")
+            name += exts[0]
+        options = {}
+        if query.get("pages"):
+            try:
+                if key != "pdf-word":
+                    raise ValueError("only pdf-word takes pages")
+                _parse_page_spec(query["pages"])
+            except ValueError as e:
+                await self._discard(reader, length)
+                raise HTTPError(400, f"pages: {e}")
+            options["pages"] = query["pages"]
+        if query.get("backend", "auto") != "auto":
+            if key != "pdf-excel" or query["backend"] not in ("pdfplumber", "pymupdf"):
+                await self._discard(reader, length)
+                raise HTTPError(400, "backend: pdf-excel takes auto, pdfplumber or pymupdf")
+            options["backend"] = query["backend"]
+        timeout = self.timeout
+        if query.get("timeout"):
+            try:
+                timeout = float(query["timeout"])
+            except ValueError:
+                timeout = 0
+            if timeout <= 0:
+                await self._discard(reader, length)
+                raise HTTPError(400, "timeout must be a positive number of seconds")
+            if self.timeout:
+                timeout = min(timeout, self.timeout)
+
+        folder = os.path.join(self.work_dir, uuid.uuid4().hex)
+        os.makedirs(folder)
+        src = os.path.join(folder, name)
+        try:
+            with open(src, "wb") as fh:
+                remaining = length
+                deadline  = self._body_deadline(length)
+                while remaining:
+                    try:
+                        data = await self._read_body(reader, min(CHUNK, remaining), deadline)
+                    except asyncio.TimeoutError:
+                        raise HTTPError(408, "The upload stalled or was too slow")
+                    if not data:
+                        raise HTTPError(400, "The upload ended early")
+                    fh.write(data)
+                    remaining -= len(data)
+            job = queue.add(src, key, options=options, timeout=timeout)
+        except QueueFull as e:
+            shutil.rmtree(folder, ignore_errors=True)
+            raise HTTPError(429, str(e), {"Retry-After": "1"})
+        except BaseException:
+            shutil.rmtree(folder, ignore_errors=True)
+            raise
+        self._dirs[job.id] = folder
+        queue.poll()  # start it now if a worker is free
+        await self._send_json(writer, 202, self._job(job),
+                              {"Location": f"/jobs/{job.id}"})
+
+    async def _stream_events(self, job, writer):
+        """Writes the job as a JSON line whenever it changes, until it ends."""
+        await self._send_head(writer, 200, {"Content-Type": "application/x-ndjson",
+                                            "Cache-Control": "no-cache"})
+        last = None
+        while True:
+            payload = self._job(job)
+            current = (payload["state"], payload["done"], payload["total"])
+            if current != last:
+                writer.write(json.dumps(payload).encode() + b"\n")
+                await writer.drain()
+                last = current
+            if job.finished is not None:
+                return
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def _send_result(self, job, writer):
+        if job.state in ("queued", "running"):
+            raise HTTPError(409, f"The job is {job.state}", {"Retry-After": "1"})
+        if job.state != "done":
+            await self._send_json(writer, 422, self._job(job))
+            return
+        size = os.path.getsize(job.out)
+        ext  = os.path.splitext(job.out)[1]
+        await self._send_head(writer, 200, {
+            "Content-Type": CONTENT_TYPES.get(ext, "application/octet-stream"),
+            "Content-Length": str(size),
+            "Content-Disposition": f'attachment; filename="{os.path.basename(job.out)}"',
+        })
+        with open(job.out, "rb") as fh:
+            while True:
+                data = fh.read(CHUNK)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+
+    @staticmethod
+    def _body_deadline(length):
+        return time.monotonic() + BODY_TIMEOUT + length / MIN_UPLOAD_RATE
+
+    @staticmethod
+    async def _read_body(reader, n, deadline):
+        """
+        reader.read(n), given up with asyncio.TimeoutError when the client
+        sends nothing for BODY_TIMEOUT seconds or the body's deadline passes,
+        so a stalled or trickling upload cannot hold its connection forever.
+        """
+        timeout = min(BODY_TIMEOUT, deadline - time.monotonic())
+        if timeout <= 0:
+            raise asyncio.TimeoutError
+        return await asyncio.wait_for(reader.read(n), timeout)
+
+    async def _discard(self, reader, length):
+        deadline = self._body_deadline(length)
+        while length > 0:
+            try:
+                data = await self._read_body(reader, min(CHUNK, length), deadline)
+            except asyncio.TimeoutError:
+                return
+            if not data:
+                return
+            length -= len(data)
+
+    async def _send_head(self, writer, status, headers):
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", "Connection: close",
+                 *(f"{k}: {v}" for k, v in headers.items())]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+    async def _send_json(self, writer, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        await self._send_head(writer, status, {"Content-Type": "application/json",
+                                               "Content-Length": str(len(body)),
+                                               **(headers or {})})
+        writer.write(body)
+        await writer.drain()
+
+    # ── Payloads ─────────────────────────────────────────────────────────────
+    def _job(self, job):
+        """The job as the client sees it: no server paths, just names."""
+        payload = job.as_dict()
+        payload.update(src=os.path.basename(job.src), out=os.path.basename(job.out),
+                       timeout=job.timeout)
+        if job.result and job.result.get("timings"):
+            payload["timings"] = job.result["timings"]
+        return payload
+
+    def _health(self):
+        queue = self.queue
+        return {"workers": queue.workers, "running": queue.active(),
+                "queued": queue.waiting(), "max_queued": queue.max_queued,
+                "jobs": len(queue.jobs)}
+
+
+def run_server(host="127.0.0.1", port=8750, **options):
+    """
+    Runs a ConversionServer until interrupted; `options` go to its
+    constructor. Prints the address it listens on once it is ready.
+    """
+    async def main():
+        import signal
+        try:  # stop cleanly on SIGTERM too, removing the work folder
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM, asyncio.current_task().cancel)
+        except (NotImplementedError, AttributeError):
+            pass
+        server = ConversionServer(**options)
+        try:
+            bound = await server.start(host, port)
+            print(f"Convertly service listening on http://{host}:{bound} "
+                  f"({server.queue.workers} worker(s), up to "
+                  f"{server.queue.max_queued} queued)", flush=True)
+            await server.serve_forever()
+        finally:
+            server.close()
+
+    try:
+        asyncio.run(main())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
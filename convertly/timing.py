@@ -0,0 +1,68 @@
+"""
+Per-phase timing: converters mark their phases with span() and note(),
+and whoever runs a conversion inside recording() gets the totals.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+
+_active = contextvars.ContextVar("convertly_timings", default=None)
+
+
+class Timings:
+    """
+    Phase totals of one conversion. A span nested in another is named
+    after its parent ("extract.styles") and its time is included in the
+    parent's; a phase entered several times (once per sheet, say) adds up.
+    """
+
+    def __init__(self):
+        self.phases = {}  # name → seconds, in the order phases were entered
+        self.notes  = {}  # e.g. {"engine": "pdf2docx"}
+        self._stack = []
+
+    def as_dict(self):
+        return {"phases": {name: round(sec, 6) for name, sec in self.phases.items()},
+                **self.notes}
+
+
+@contextmanager
+def recording():
+    """Collects the spans of everything run in the block into a Timings."""
+    timings = Timings()
+    token   = _active.set(timings)
+    try:
+        yield timings
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def span(name):
+    """Times the block as phase `name`; free when nothing is recording."""
+    timings = _active.get()
+    if timings is None:
+        yield
+        return
+    timings._stack.append(name)
+    full = ".".join(timings._stack)
+    timings.phases.setdefault(full, 0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.phases[full] += time.perf_counter() - start
+        timings._stack.pop()
+
+
+def note(**attrs):
+    """Attaches facts such as the engine used to the current recording."""
+    timings = _active.get()
+    if timings is not None:
+        timings.notes.update(attrs)
+
+
+def noted(name):
+    """What note() recorded as `name` in the current recording, or None."""
+    timings = _active.get()
+    return timings.notes.get(name) if timings is not None else None
@@ -0,0 +1,521 @@
+"""
+Word → PDF: streaming lxml reading of the DOCX package, reportlab layout.
+"""
+import copy
+import io
+import logging
+import posixpath
+import zipfile
+
+from . import layout
+from .layout import _LazyStory, _long_table_type, _sample_styles
+from .progress import Progress
+from .timing import span
+
+log = logging.getLogger(__name__)
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+_RUN_TEXT = {_W + "tab": "\t", _W + "ptab": "\t", _W + "cr": "\n",
+             _W + "noBreakHyphen": "-"}
+_OFF = {"0", "false", "off"}  # ST_OnOff values that switch a property off
+# style names stored in lower case that python-docx (and Word) show capitalised
+_STYLE_UI_NAMES = {f"heading {n}": f"Heading {n}" for n in range(1, 10)}
+
+
+def _run_text(r):
+    """A <w:r>'s text as python-docx's Run.text gives it, read off the XML."""
+    parts = []
+    for e in r.iterchildren(_W + "t", _W + "br", *_RUN_TEXT):
+        if e.tag == _W + "t":
+            parts.append(e.text or "")
+        elif e.tag == _W + "br":
+            if e.get(_W + "type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            parts.append(_RUN_TEXT[e.tag])
+    return "".join(parts)
+
+
+def _paragraph_text(p):
+    """A <w:p>'s text as python-docx's Paragraph.text gives it, read off the XML."""
+    parts = []
+    for child in p.iterchildren(_W + "r", _W + "hyperlink"):
+        runs = (child,) if child.tag == _W + "r" else child.iterchildren(_W + "r")
+        parts.extend(_run_text(r) for r in runs)
+    return "".join(parts)
+
+
+def _run_format(r_pr):
+    """
+    The markup a run's <w:rPr> puts around its text, as (open, close,
+    size_pt): text colour, size, bold, italic and underline, from the
+    run's direct formatting only, as python-docx's Run.font reported it.
+    """
+    rt, size = "\0", None
+    if r_pr is None:
+        return "", "", None
+    color = r_pr.find(_W + "color")
+    if color is not None:
+        val = color.get(_W + "val", "")
+        try:
+            if len(val) == 6 and int(val, 16) >= 0:
+                rt = f'<font color="#{val.upper()}">{rt}</font>'
+        except ValueError:
+            pass
+    sz = r_pr.find(_W + "sz")
+    if sz is not None:
+        try:
+            size = int(sz.get(_W + "val")) / 2
+        except (TypeError, ValueError):
+            pass
+        if size:
+            rt = f'<font size="{size:.1f}">{rt}</font>'
+        else:
+            size = None
+
+    def on(tag):
+        el = r_pr.find(_W + tag)
+        return el is not None and el.get(_W + "val", "true") not in _OFF
+
+    bold, italic = on("b"), on("i")
+    if bold and italic:
+        rt = f"<b><i>{rt}</i></b>"
+    elif bold:
+        rt = f"<b>{rt}</b>"
+    elif italic:
+        rt = f"<i>{rt}</i>"
+    u = r_pr.find(_W + "u")
+    if u is not None and u.get(_W + "val") not in (None, "none"):
+        rt = f"<u>{rt}</u>"
+    open_, close = rt.split("\0")
+    return open_, close, size
+
+
+def _read_docx_table(tbl):
+    """
+    Reads a <w:tbl> in one pass over its <w:tr>/<w:tc> elements, without
+    python-docx's Table objects: their row.cells works out every row's
+    grid spans again on each call, which made long tables crawl.
+
+    Returns (data, fills, spans): `data` holds the cell texts on the
+    table's grid, `fills` maps (row, col) to a cell's <w:shd> fill as
+    "RRGGBB", and `spans` lists the (c1, r1, c2, r2) areas that gridSpan
+    and vMerge join into one cell. A joined cell's text and fill sit at
+    its top-left position; the other positions are left empty.
+    """
+    data, fills, spans = [], {}, []
+    open_v = {}  # grid column → index in spans of the vertical merge above
+    for r, tr in enumerate(tbl.iterchildren(_W + "tr")):
+        row, col, still_open = [], 0, {}
+        tr_pr = tr.find(_W + "trPr")
+        before = tr_pr.find(_W + "gridBefore") if tr_pr is not None else None
+        if before is not None:
+            try:
+                col = max(0, int(before.get(_W + "val", 0)))
+            except (TypeError, ValueError):
+                col = 0
+            row += [""] * col
+        for tc in tr.iterchildren(_W + "tc"):
+            width, vmerge, fill = 1, None, None
+            tc_pr = tc.find(_W + "tcPr")
+            if tc_pr is not None:
+                for prop in tc_pr:
+                    if prop.tag == _W + "gridSpan":
+                        try:
+                            width = max(1, int(prop.get(_W + "val", 1)))
+                        except (TypeError, ValueError):
+                            width = 1
+                    elif prop.tag == _W + "vMerge":
+                        vmerge = prop.get(_W + "val", "continue")
+                    elif prop.tag == _W + "shd":
+                        fill = prop.get(_W + "fill")
+            if vmerge == "continue" and col in open_v:
+                c1, r1, c2, _ = spans[open_v[col]]
+                spans[open_v[col]] = (c1, r1, c2, r)
+                still_open[col] = open_v[col]
+                row += [""] * width
+            else:
+                row.append("\n".join(_paragraph_text(p)
+                                     for p in tc.iterchildren(_W + "p")))
+                row += [""] * (width - 1)
+                if fill and fill != "auto" and len(fill) == 6:
+                    fills[(r, col)] = fill
+                if vmerge == "restart" or width > 1:
+                    spans.append((col, r, col + width - 1, r))
+                    if vmerge == "restart":
+                        still_open[col] = len(spans) - 1
+            col += width
+        open_v = still_open
+        data.append(row)
+    return data, fills, [s for s in spans if s[0] != s[2] or s[1] != s[3]]
+
+
+def _part_rels(zf, part):
+    """
+    The internal relationships of package part `part` (e.g.
+    "word/document.xml") as {rId: (type, member name in the zip)}.
+    """
+    from lxml import etree
+    folder, name = posixpath.split(part)
+    try:
+        root = etree.fromstring(zf.read(posixpath.join(folder, "_rels", name + ".rels")))
+    except KeyError:
+        return {}
+    rels = {}
+    for rel in root.iterchildren(_REL):
+        target = rel.get("Target", "")
+        if rel.get("TargetMode") == "External" or not target:
+            continue
+        target = (target.lstrip("/") if target.startswith("/")
+                  else posixpath.normpath(posixpath.join(folder, target)))
+        rels[rel.get("Id")] = (rel.get("Type", ""), target)
+    return rels
+
+
+def _paragraph_style_names(zf, styles_part):
+    """
+    Maps paragraph style ids to their names, plus None to the default
+    paragraph style's name, the way python-docx resolves paragraph.style.
+    """
+    from lxml import etree
+    names = {None: "Normal"}
+    if styles_part is None:
+        return names
+    default = None
+    for style in etree.fromstring(zf.read(styles_part)).iterchildren(_W + "style"):
+        if style.get(_W + "type", "paragraph") != "paragraph":
+            continue
+        name = style.find(_W + "name")
+        name = name.get(_W + "val", "") if name is not None else ""
+        name = _STYLE_UI_NAMES.get(name, name)
+        names[style.get(_W + "styleId")] = name
+        if style.get(_W + "default", "false") not in _OFF:
+            default = name
+    if default is not None:
+        names[None] = default
+    return names
+
+
+def _iter_body(source):
+    """
+    Yields the <w:p> and <w:tbl> children of <w:body> from a
+    word/document.xml stream as each one finishes parsing. Once the
+    caller moves on, the element is cleared and dropped from the tree
+    with everything before it, so memory holds about one of them.
+    """
+    from lxml import etree
+    for _, elem in etree.iterparse(source, events=("end",), tag=(_W + "p", _W + "tbl"),
+                                   resolve_entities=False, huge_tree=True):
+        parent = elem.getparent()
+        if parent is None or parent.tag != _W + "body":
+            continue  # a paragraph in a table cell or a content control
+        yield elem
+        elem.clear()
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+def word_to_pdf(docx_path, out_path, stop_event=None, progress=None):
+    """
+    Converts DOCX to PDF with lxml + reportlab.
+    Preserves: document element order, inline images, text alignment,
+    text colors, font sizes, bold/italic/underline, list bullets,
+    and table cell background colors and merged cells from the original DOCX.
+
+    word/document.xml is read with iterparse, one paragraph or table at a
+    time, and each one is cleared once its flowables exist. The flowables
+    go to reportlab through a _LazyStory as layout reaches them, so memory
+    follows the page being laid out rather than the document's length.
+    Run markup is worked out once per distinct <w:rPr>.
+
+    `progress` is called as progress(kb_read, total_kb) over the
+    uncompressed word/document.xml.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
+    from reportlab.platypus import (SimpleDocTemplate, Paragraph, Spacer,
+                                    Table, TableStyle,
+                                    Image as RLImage)
+    from lxml import etree
+
+    A_NS  = "http://schemas.openxmlformats.org/drawingml/2006/main"
+    R_NS  = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    WP_NS = "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+
+    with zipfile.ZipFile(docx_path) as zf:
+        with span("load"):
+            main_part = next((target for kind, target in _part_rels(zf, "").values()
+                              if kind.endswith("/officeDocument")), "word/document.xml")
+            rels = _part_rels(zf, main_part)
+            style_names = _paragraph_style_names(zf, next(
+                (target for kind, target in rels.values() if kind.endswith("/styles")), None))
+            total_kb = -(-zf.getinfo(main_part).file_size // 1024)
+        pdf = SimpleDocTemplate(
+            out_path, pagesize=A4,
+            leftMargin=2.5*cm, rightMargin=2.5*cm,
+            topMargin=2.5*cm,  bottomMargin=2.5*cm,
+        )
+
+        base_styles = _sample_styles()
+        image_cache = {}  # r:embed → decoded RLImage (None if undecodable)
+        image_hits  = [0]
+        max_w      = A4[0] - 5 * cm
+        _sc        = [0]  # style name counter for uniqueness
+        _style_cache = {}  # effective attributes → shared ParagraphStyle
+        _style_hits  = [0]
+        run_formats  = {}  # serialized <w:rPr> → _run_format() of it
+
+        ALIGN_MAP = {
+            "left":  TA_LEFT,  "start": TA_LEFT,
+            "center": TA_CENTER,
+            "right": TA_RIGHT, "end":   TA_RIGHT,
+            "both":  TA_JUSTIFY,
+        }
+
+        def esc(t):
+            return t.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+        def run_format(r):
+            r_pr = r.find(_W + "rPr")
+            key  = etree.tostring(r_pr) if r_pr is not None else None
+            if key not in run_formats:
+                run_formats[key] = _run_format(r_pr)
+            return run_formats[key]
+
+        def make_style(style_name, alignment, base_size=11):
+            # Paragraphs with the same effective attributes share one style.
+            al = ALIGN_MAP.get(alignment, TA_LEFT)
+            if "Heading 1" in style_name:
+                key = ("Heading1", al)
+            elif "Heading 2" in style_name:
+                key = ("Heading2", al)
+            elif "Heading 3" in style_name:
+                key = ("Heading3", al)
+            else:
+                key = ("Normal", al, base_size, "List" in style_name)
+            if key in _style_cache:
+                _style_hits[0] += 1
+                return _style_cache[key]
+
+            with span("styles"):
+                _sc[0] += 1
+                sn = f"_S{_sc[0]}"
+                leading = max(base_size * 1.45, 14)
+                if key[0] == "Heading1":
+                    style = ParagraphStyle(sn, parent=base_styles["Heading1"],
+                        fontSize=18, leading=22, spaceBefore=12, spaceAfter=6, alignment=al)
+                elif key[0] == "Heading2":
+                    style = ParagraphStyle(sn, parent=base_styles["Heading2"],
+                        fontSize=14, leading=18, spaceBefore=10, spaceAfter=4, alignment=al)
+                elif key[0] == "Heading3":
+                    style = ParagraphStyle(sn, parent=base_styles["Heading3"],
+                        fontSize=12, leading=16, spaceBefore=8, spaceAfter=3, alignment=al)
+                else:
+                    style = ParagraphStyle(sn, parent=base_styles["Normal"],
+                        fontSize=base_size, leading=leading, spaceAfter=4,
+                        leftIndent=(18 if "List" in style_name else 0),
+                        alignment=al)
+            _style_cache[key] = style
+            return style
+
+        def extract_images(para_elem):
+            imgs = []
+            blips = para_elem.findall(f'.//{{{A_NS}}}blip')
+            for blip in blips:
+                r_embed = blip.get(f'{{{R_NS}}}embed')
+                if not r_embed or r_embed not in rels:
+                    continue
+                try:
+                    # Decode each embedded image once, straight from the part's
+                    # bytes. Every occurrence is a copy sharing the same
+                    # ImageReader, so reportlab embeds it in the PDF only once.
+                    if r_embed not in image_cache:
+                        image_cache[r_embed] = None
+                        with span("images"):
+                            blob = zf.read(rels[r_embed][1])
+                            image_cache[r_embed] = RLImage(io.BytesIO(blob))
+                    else:
+                        image_hits[0] += 1
+                    base = image_cache[r_embed]
+                    if base is None:
+                        continue
+                    img = copy.copy(base)
+                    # Get dimensions from EMU → pt
+                    extents = para_elem.findall(f'.//{{{WP_NS}}}extent')
+                    if extents:
+                        cx = int(extents[0].get('cx', 0))
+                        cy = int(extents[0].get('cy', 0))
+                        w = cx / 914400 * 72
+                        h = cy / 914400 * 72
+                        if w > max_w:
+                            h = h * max_w / w
+                            w = max_w
+                        img.drawWidth, img.drawHeight = w, h
+                    else:
+                        img.drawWidth, img.drawHeight = min(300, max_w), base.imageHeight
+                    imgs.append(img)
+                except Exception:
+                    pass
+            return imgs
+
+        hex_colors = {}  # "RRGGBB" → HexColor, shared by every cell with that fill
+
+        def cell_bg(fill):
+            if fill not in hex_colors:
+                try:
+                    hex_colors[fill] = colors.HexColor(f"#{fill}")
+                except Exception:
+                    hex_colors[fill] = None
+            return hex_colors[fill]
+
+        def paragraph(elem):
+            story = []
+            # Embed any inline images first
+            for img in extract_images(elem):
+                story.append(img)
+                story.append(Spacer(1, 4))
+
+            text = _paragraph_text(elem).strip()
+            if not text:
+                story.append(Spacer(1, 6))
+                return story
+
+            p_pr  = elem.find(_W + "pPr")
+            props = {} if p_pr is None else {
+                prop.tag: prop.get(_W + "val")
+                for prop in p_pr.iterchildren(_W + "pStyle", _W + "jc")}
+            style_name = style_names.get(props.get(_W + "pStyle"), style_names[None])
+
+            # Detect base font size from the first sized run; build the markup
+            base_size, parts = None, []
+            for r in elem.iterchildren(_W + "r"):
+                open_, close, size = run_format(r)
+                if base_size is None and size:
+                    base_size = size
+                rt = esc(_run_text(r))
+                if rt:
+                    parts.append(open_ + rt + close)
+
+            p_style = make_style(style_name, props.get(_W + "jc"), base_size or 11)
+
+            rich_text = "".join(parts) or esc(text)
+
+            if "List Bullet" in style_name:
+                rich_text = "• " + rich_text
+
+            story.append(Paragraph(rich_text, p_style))
+            return story
+
+        def table(elem):
+            story = []
+            data, fills, spans = _read_docx_table(elem)
+            bg_map = {}  # (row_idx, col_idx) → HexColor
+            for pos, fill in fills.items():
+                bg = cell_bg(fill)
+                if bg:
+                    bg_map[pos] = bg
+
+            if not data:
+                return story
+
+            num_cols = max(len(r) for r in data)
+            col_w    = max_w / max(num_cols, 1)
+            data     = [r + [""] * (num_cols - len(r)) for r in data]
+
+            ts = [
+                ("FONTSIZE",       (0, 0), (-1, -1), 9),
+                ("GRID",           (0, 0), (-1, -1), 0.4, colors.HexColor("#CCCCCC")),
+                ("TOPPADDING",     (0, 0), (-1, -1), 4),
+                ("BOTTOMPADDING",  (0, 0), (-1, -1), 4),
+                ("LEFTPADDING",    (0, 0), (-1, -1), 6),
+                ("VALIGN",         (0, 0), (-1, -1), "MIDDLE"),
+            ]
+
+            # Long tables are laid out a page at a time, with the default
+            # header row repeated on every page.
+            if len(data) > layout.LONG_TABLE_ROWS:
+                row_cmds = [[] for _ in data]
+                for (r, c), bg in bg_map.items():
+                    row_cmds[r].append(("BACKGROUND", c, c, bg))
+                rows, header, zebra = zip(data, row_cmds), None, None
+                body_spans = spans
+                if (0, 0) not in bg_map:
+                    # the header row repeats on every page, so merges
+                    # reaching down from it keep only their first row
+                    body_spans = []
+                    for c1, r1, c2, r2 in spans:
+                        if r1 == 0:
+                            row_cmds[0].append(("SPAN", c1, c2))
+                            r1 = 1
+                        if r2 >= r1 and (c1, r1) != (c2, r2):
+                            body_spans.append((c1, r1 - 1, c2, r2 - 1))
+                    header = (data[0], row_cmds[0] + [
+                        ("BACKGROUND", 0, -1, colors.HexColor("#4361EE")),
+                        ("TEXTCOLOR",  0, -1, colors.white),
+                        ("FONTNAME",   0, -1, "Helvetica-Bold"),
+                    ])
+                    rows  = zip(data[1:], row_cmds[1:])
+                    zebra = [colors.white, colors.HexColor("#F5F7FF")]
+                story.append(Spacer(1, 6))
+                story.append(_long_table_type()(rows, [col_w] * num_cols, style=ts,
+                                                header=header, spans=body_spans,
+                                                zebra=zebra))
+                story.append(Spacer(1, 6))
+                return story
+
+            for (r, c), bg in bg_map.items():
+                ts.append(("BACKGROUND", (c, r), (c, r), bg))
+            for c1, r1, c2, r2 in spans:
+                ts.append(("SPAN", (c1, r1), (c2, r2)))
+
+            # Default header row only when the first cell has no custom color
+            if (0, 0) not in bg_map:
+                ts += [
+                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#4361EE")),
+                    ("TEXTCOLOR",  (0, 0), (-1, 0), colors.white),
+                    ("FONTNAME",   (0, 0), (-1, 0), "Helvetica-Bold"),
+                    ("ROWBACKGROUNDS", (0, 1), (-1, -1),
+                     [colors.white, colors.HexColor("#F5F7FF")]),
+                ]
+
+            rl_tbl = Table(data, colWidths=[col_w] * num_cols)
+            rl_tbl.setStyle(TableStyle(ts))
+            story.append(Spacer(1, 6))
+            story.append(rl_tbl)
+            story.append(Spacer(1, 6))
+            return story
+
+        tracker = Progress(progress, total_kb)
+
+        def flowables(source):
+            # Runs inside pdf.build(): each body element is read, turned into
+            # flowables and freed just before layout reaches it.
+            produced = False
+            for elem in _iter_body(source):
+                tracker.update(source.tell() // 1024)
+                if stop_event and stop_event.is_set():
+                    raise InterruptedError("Cancelled by user.")
+                with span("extract"):
+                    story = paragraph(elem) if elem.tag == _W + "p" else table(elem)
+                produced = produced or bool(story)
+                yield from story
+
+            if not produced:
+                yield Paragraph("(Empty document)",
+                    ParagraphStyle("_empty", parent=base_styles["Normal"], fontSize=11))
+
+        with zf.open(main_part) as source, span("build"):
+            pdf.build(_LazyStory(flowables(source)))
+    tracker.finish()
+
+    used = len(_style_cache) + _style_hits[0]
+    log.debug("word_to_pdf: %d paragraph style(s) for %d paragraph(s), "
+              "%.1f%% served from cache", len(_style_cache), used,
+              100.0 * _style_hits[0] / used if used else 0.0)
+    log.debug("word_to_pdf: %d run format(s) for the document's runs", len(run_formats))
+    log.debug("word_to_pdf: %d image(s) decoded, %d repeat(s) reused",
+              len(image_cache), image_hits[0])